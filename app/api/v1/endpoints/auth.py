@@ -1,8 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 import secrets
 from app.core.config import settings
+from app.middlewares.auth import dev_token_enabled, jwt
+from app.services.token_cache import verified_token_cache
 
 router = APIRouter(tags=["auth"])
 
@@ -12,4 +14,18 @@ class TokenResponse(BaseModel):
 @router.post("/token", response_model=TokenResponse)
 def issue_token() -> TokenResponse:
     # TODO(나중): 로그인/권한 확인 + 짧은 토큰 발급 로직으로 교체
-    return TokenResponse(token=settings.DEV_AUTH_TOKEN)
\ No newline at end of file
+    # 공개 경로이므로 DEV 토큰은 local / test 환경에서만 내려줌
+    if not dev_token_enabled():
+        raise HTTPException(status_code=404, detail="Token issuance is not available in this environment")
+    return TokenResponse(token=settings.DEV_AUTH_TOKEN)
+
+
+@router.get("/auth/stats")
+def get_auth_stats():
+    """
+    인증 방식과 검증된 토큰 캐시 현황 (hit / miss, 만료 / LRU로 버린 수)
+    """
+    return {
+        "mode": "jwt" if settings.JWT_SECRET and jwt is not None else ("dev" if dev_token_enabled() else "disabled"),
+        "tokenCache": verified_token_cache.stats(),
+    }
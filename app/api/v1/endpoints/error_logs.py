@@ -1,15 +1,33 @@
-from typing import Optional
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from datetime import datetime
-import os
-import json
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
 from pathlib import Path
 
+from app.core.config import settings
+from app.mock_data import get_topology
+from app.middlewares.auth import websocket_authorized
+from app.services.broadcaster import error_log_broadcaster, pump_websocket, sse_events
+from app.services.error_log_writer import (
+    ErrorLogQueueFull,
+    ErrorLogWriteError,
+    error_log_writer,
+    log_filename_for,
+)
+from app.services.error_log_index import StaleCursor, decode_cursor, query_logs
+from app.services.error_log_reader import read_latest_raw
+from app.services.error_log_rollup import error_log_rollup
+from app.services.json_codec import dumps
+from app.services.json_stream import InvalidJsonBody, iter_json_array, iter_ndjson
+from app.services.log_retention import log_retention
+from app.services.profiling import profile_phase
+from app.services.topology import TopologyRegistry
+
 router = APIRouter(tags=["error_logs"])
 
 # 로그 저장 디렉토리
-LOG_DIR = Path(__file__).resolve().parent.parent.parent.parent.parent / "logs" / "mediamtx_errors"
+LOG_DIR = Path(settings.ERROR_LOG_DIR)
 
 class MediaMTXErrorLog(BaseModel):
     """MediaMTX 서버 오류 로그 모델"""
@@ -27,44 +45,78 @@ class ErrorLogResponse(BaseModel):
     logFile: str
     message: str
 
+class ErrorLogQueryResponse(BaseModel):
+    logs: List[dict]
+    count: int
+    nextCursor: Optional[str] = None
+
+class StatsBucket(BaseModel):
+    start: str  # ISO string (bucket 시작 시각, UTC)
+    count: int
+
+class StatsSeries(BaseModel):
+    key: str
+    name: Optional[str] = None
+    total: int
+    buckets: List[StatsBucket]
+
+class ErrorLogStatsResponse(BaseModel):
+    since: str
+    until: str
+    bucketSeconds: int
+    groupBy: str
+    total: int
+    series: List[StatsSeries]
+
+class BulkRecordResult(BaseModel):
+    index: int
+    accepted: bool
+    error: Optional[str] = None
+
+class BulkErrorLogResponse(BaseModel):
+    success: bool
+    accepted: int
+    rejected: int
+    results: List[BulkRecordResult]
+
+def _build_log_entry(log_data: MediaMTXErrorLog) -> dict:
+    return {
+        "timestamp": log_data.timestamp,
+        "streamId": log_data.streamId,
+        "errorType": log_data.errorType,
+        "errorMessage": log_data.errorMessage,
+        "statusCode": log_data.statusCode,
+        "whepUrl": log_data.whepUrl,
+        "userAgent": log_data.userAgent,
+        "clientInfo": log_data.clientInfo,
+    }
+
 @router.post("/error-logs/mediamtx", response_model=ErrorLogResponse)
-def log_mediamtx_error(log_data: MediaMTXErrorLog) -> ErrorLogResponse:
+async def log_mediamtx_error(log_data: MediaMTXErrorLog) -> ErrorLogResponse:
     """
     MediaMTX 서버 다운 또는 연결 오류 발생 시 로그를 파일에 저장
     
     로그 파일 형식: logs/mediamtx_errors/YYYY-MM-DD.jsonl
     각 라인은 JSON 객체 (JSON Lines 형식)
+
+    레코드는 writer queue에 넣고 바로 반환하며, 실제 파일 기록은
+    백그라운드 writer가 배치 단위로 처리합니다.
     """
     try:
-        # 로그 디렉토리 생성 (없으면)
-        LOG_DIR.mkdir(parents=True, exist_ok=True)
-        
         # 날짜별 로그 파일명 생성
-        log_date = datetime.fromisoformat(log_data.timestamp.replace('Z', '+00:00'))
-        log_filename = f"{log_date.strftime('%Y-%m-%d')}.jsonl"
-        log_filepath = LOG_DIR / log_filename
-        
-        # 로그 데이터 준비
-        log_entry = {
-            "timestamp": log_data.timestamp,
-            "streamId": log_data.streamId,
-            "errorType": log_data.errorType,
-            "errorMessage": log_data.errorMessage,
-            "statusCode": log_data.statusCode,
-            "whepUrl": log_data.whepUrl,
-            "userAgent": log_data.userAgent,
-            "clientInfo": log_data.clientInfo,
-        }
-        
-        # JSON Lines 형식으로 추가 (한 줄에 하나의 JSON)
-        with open(log_filepath, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        log_filename = log_filename_for(log_data.timestamp)
+        entry = _build_log_entry(log_data)
+        log_filepath = await error_log_writer.submit(log_filename, entry)
+        error_log_broadcaster.publish(entry)
         
         return ErrorLogResponse(
             success=True,
             logFile=str(log_filepath),
-            message=f"Error logged successfully to {log_filename}"
+            message=f"Error queued for {log_filename}"
         )
+
+    except ErrorLogQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
         
     except Exception as e:
         raise HTTPException(
@@ -72,37 +124,352 @@ def log_mediamtx_error(log_data: MediaMTXErrorLog) -> ErrorLogResponse:
             detail=f"Failed to write error log: {str(e)}"
         )
 
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'record'}: {err['msg']}"
+        for err in e.errors()
+    )
+
+@router.post("/error-logs/mediamtx/bulk", response_model=BulkErrorLogResponse)
+async def log_mediamtx_errors_bulk(request: Request) -> BulkErrorLogResponse:
+    """
+    MediaMTX 오류 로그 일괄 저장
+
+    - Content-Type: application/x-ndjson → 한 줄에 하나의 레코드
+    - 그 외 (application/json) → 레코드 JSON array
+
+    body를 chunk 단위로 읽으면서 레코드마다 검증 후 바로 writer queue에 넣으므로
+    body 크기와 관계없이 메모리 사용량이 일정합니다.
+    레코드별 수락/거부 결과를 index 순서대로 반환합니다.
+
+    - ERROR_LOG_BULK_MAX_RECORDS 를 넘는 레코드는 기록하지 않고 거부로 표시
+    - Content-Length 가 레코드 수 × 크기 제한으로도 담을 수 없을 만큼 크면 읽기 전에 413
+    - body가 JSON array가 아니면 400
+    """
+    content_type = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    max_records = settings.ERROR_LOG_BULK_MAX_RECORDS
+    max_item_bytes = settings.ERROR_LOG_BULK_MAX_RECORD_BYTES
+    content_length = request.headers.get("content-length", "")
+    # 레코드 사이 구분자(개행 / 쉼표)와 array 괄호 여유 포함
+    if content_length.isdigit() and int(content_length) > max_records * (max_item_bytes + 1) + 2:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Request body too large (max {max_records} records of {max_item_bytes} bytes)"
+        )
+    if content_type in NDJSON_CONTENT_TYPES:
+        items = iter_ndjson(request.stream(), max_item_bytes)
+    else:
+        items = iter_json_array(request.stream(), max_item_bytes)
+
+    results: List[BulkRecordResult] = []
+    accepted = 0
+
+    try:
+        async for obj, error in items:
+            index = len(results)
+            if index >= max_records:
+                # 이미 기록된 앞 레코드가 있으므로 요청 전체를 실패시키지 않고 레코드 단위로 거부
+                error = f"Too many records (max {max_records} per request)"
+            elif error is None:
+                try:
+                    log_data = MediaMTXErrorLog.model_validate(obj)
+                    log_filename = log_filename_for(log_data.timestamp)
+                    entry = _build_log_entry(log_data)
+                    await error_log_writer.submit(log_filename, entry)
+                    error_log_broadcaster.publish(entry)
+                except ValidationError as e:
+                    error = _format_validation_error(e)
+                except (ErrorLogQueueFull, ErrorLogWriteError) as e:
+                    error = str(e)
+                except ValueError as e:
+                    error = f"Invalid timestamp: {e}"
+
+            if error is None:
+                accepted += 1
+                results.append(BulkRecordResult(index=index, accepted=True))
+            else:
+                results.append(BulkRecordResult(index=index, accepted=False, error=error))
+    except InvalidJsonBody as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BulkErrorLogResponse(
+        success=accepted == len(results),
+        accepted=accepted,
+        rejected=len(results) - accepted,
+        results=results,
+    )
+
+@router.get("/error-logs/mediamtx/writer")
+def get_writer_stats():
+    """
+    오류 로그 writer 상태 조회 (queue depth, fsync 정책, 처리량 등)
+    """
+    return error_log_writer.stats()
+
+@router.get("/error-logs/mediamtx/retention")
+def get_retention_stats():
+    """
+    로그 보관 기간 / 용량 관리 상태 조회 (마지막 실행 시각, 회수한 용량 등)
+    """
+    return log_retention.stats()
+
 @router.get("/error-logs/mediamtx/latest")
 def get_latest_logs(limit: int = 50):
     """
     최근 MediaMTX 오류 로그 조회 (디버깅용)
+
+    최신 날짜 파일의 끝에서부터 거꾸로 읽으므로 최신 로그가 먼저 반환되며,
+    비용은 파일 크기가 아니라 limit에 비례합니다.
+    저장된 라인(JSON)을 다시 인코딩하지 않고 그대로 응답 body에 넣습니다.
     """
     try:
         if not LOG_DIR.exists():
             return {"logs": [], "message": "No log directory found"}
         
-        # 최신 로그 파일부터 읽기
-        log_files = sorted(LOG_DIR.glob("*.jsonl"), reverse=True)
-        
-        logs = []
-        for log_file in log_files:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        logs.append(json.loads(line))
-                        if len(logs) >= limit:
-                            break
-            if len(logs) >= limit:
-                break
-        
-        return {
-            "logs": logs[:limit],
-            "count": len(logs),
-            "message": f"Retrieved {len(logs)} most recent error logs"
-        }
+        lines = read_latest_raw(LOG_DIR, limit)
+        message = f"Retrieved {len(lines)} most recent error logs"
+        body = b"".join((
+            b'{"logs":[', b",".join(lines), b'],"count":', str(len(lines)).encode(),
+            b',"message":', dumps(message), b"}",
+        ))
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to read error logs: {str(e)}"
         )
+
+@router.get("/error-logs/mediamtx/query", response_model=ErrorLogQueryResponse)
+def query_error_logs(
+    streamId: Optional[str] = None,
+    errorType: Optional[str] = None,
+    statusCode: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+) -> ErrorLogQueryResponse:
+    """
+    조건별 MediaMTX 오류 로그 조회 (오래된 로그 먼저, cursor 기반 pagination)
+
+    날짜별 sidecar index로 대상 레코드를 고른 뒤 해당 라인만 읽습니다.
+    다음 페이지는 응답의 nextCursor를 cursor로 넘겨 조회합니다.
+    """
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        with profile_phase("io"):
+            logs, next_cursor = query_logs(
+                LOG_DIR,
+                stream_id=streamId,
+                error_type=errorType,
+                status_code=statusCode,
+                since=since,
+                until=until,
+                limit=limit,
+                cursor=cursor,
+            )
+    except StaleCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to query error logs: {str(e)}"
+        )
+
+    return ErrorLogQueryResponse(logs=logs, count=len(logs), nextCursor=next_cursor)
+
+STATS_GROUP_BY = ("none", "stream", "gate", "station", "errorType")
+STATS_MAX_BUCKETS = 10000
+UNKNOWN_KEY = "unknown"
+
+def _stats_group_of(
+    topology: TopologyRegistry,
+    stream_id: str,
+    error_type: str,
+    group_by: str,
+) -> Tuple[str, Optional[str]]:
+    """rollup key → (그룹 key, 표시 이름) - 스트림/게이트/역 계층은 현재 토폴로지 기준"""
+    if group_by == "none":
+        return "all", None
+    if group_by == "errorType":
+        return error_type, None
+
+    stream = topology.stream(stream_id)
+    if group_by == "stream":
+        return stream_id, stream.name if stream else None
+    gate = topology.gate(stream.gate_id) if stream else None
+    if group_by == "gate":
+        return (gate.gate_id, gate.name) if gate else (UNKNOWN_KEY, None)
+    station = topology.station(gate.station_id) if gate else None
+    return (station.station_id, station.name) if station else (UNKNOWN_KEY, None)
+
+def _resolve_stream_filter(
+    topology: TopologyRegistry,
+    stream_id: Optional[str],
+    gate_id: Optional[str],
+    station_id: Optional[str],
+) -> Optional[set]:
+    """역/게이트/스트림 필터 → 대상 스트림 ID 집합 (필터가 없으면 None)"""
+    stream_ids: Optional[set] = None
+    if stream_id is not None:
+        stream_ids = {stream_id}
+    if gate_id is not None or station_id is not None:
+        gate_ids = [gate_id] if gate_id is not None else [g.gate_id for g in topology.gates_of(station_id)]
+        if station_id is not None and gate_id is not None:
+            gate = topology.gate(gate_id)
+            gate_ids = gate_ids if gate and gate.station_id == station_id else []
+        topology_streams = {s.stream_id for gid in gate_ids for s in topology.streams_of(gid)}
+        stream_ids = topology_streams if stream_ids is None else stream_ids & topology_streams
+    return stream_ids
+
+@router.get("/error-logs/mediamtx/stats", response_model=ErrorLogStatsResponse)
+def get_error_log_stats(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    bucket: int = Query(60, ge=60, description="bucket 크기 (초, 60의 배수)"),
+    groupBy: str = "none",
+    streamId: Optional[str] = None,
+    gateId: Optional[str] = None,
+    stationId: Optional[str] = None,
+    errorType: Optional[str] = None,
+) -> ErrorLogStatsResponse:
+    """
+    시간 구간별 MediaMTX 오류 건수 (기본: 최근 1시간, 1분 단위)
+
+    ingest 시점에 누적한 분 단위 rollup만 조회하므로 원본 로그 양과 관계없이 응답 시간이 일정합니다.
+    groupBy=stream/gate/station 이면 역/게이트 계층으로 묶어서 반환하며, 0건인 bucket은 생략합니다.
+    """
+    if bucket % 60 != 0:
+        raise HTTPException(status_code=400, detail="bucket must be a multiple of 60 seconds")
+    if groupBy not in STATS_GROUP_BY:
+        raise HTTPException(status_code=400, detail=f"groupBy must be one of {', '.join(STATS_GROUP_BY)}")
+
+    until = until or datetime.now(timezone.utc)
+    since = since or until - timedelta(hours=1)
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if since > until:
+        raise HTTPException(status_code=400, detail="since must be earlier than until")
+    if (until - since).total_seconds() / bucket > STATS_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Too many buckets (max {STATS_MAX_BUCKETS})")
+
+    topology = get_topology()
+    counts = error_log_rollup.query(
+        int(since.timestamp() * 1000),
+        int(until.timestamp() * 1000),
+        stream_ids=_resolve_stream_filter(topology, streamId, gateId, stationId),
+        error_type=errorType,
+    )
+
+    bucket_minutes = bucket // 60
+    series: Dict[str, dict] = {}
+    group_cache: Dict[Tuple[str, str], Tuple[str, Optional[str]]] = {}
+    for (minute, stream_id, error_type), count in counts.items():
+        group = group_cache.get((stream_id, error_type))
+        if group is None:
+            group = group_cache[(stream_id, error_type)] = _stats_group_of(topology, stream_id, error_type, groupBy)
+        key, name = group
+        entry = series.setdefault(key, {"name": name, "total": 0, "buckets": {}})
+        bucket_start = minute - minute % bucket_minutes
+        entry["buckets"][bucket_start] = entry["buckets"].get(bucket_start, 0) + count
+        entry["total"] += count
+
+    return ErrorLogStatsResponse(
+        since=since.isoformat(),
+        until=until.isoformat(),
+        bucketSeconds=bucket,
+        groupBy=groupBy,
+        total=sum(entry["total"] for entry in series.values()),
+        series=[
+            StatsSeries(
+                key=key,
+                name=entry["name"],
+                total=entry["total"],
+                buckets=[
+                    StatsBucket(
+                        start=datetime.fromtimestamp(start * 60, timezone.utc).isoformat().replace("+00:00", "Z"),
+                        count=count,
+                    )
+                    for start, count in sorted(entry["buckets"].items())
+                ],
+            )
+            for key, entry in sorted(series.items())
+        ],
+    )
+
+def _live_filter(
+    stream_id: Optional[str],
+    gate_id: Optional[str],
+    station_id: Optional[str],
+    error_type: Optional[str],
+):
+    stream_ids = _resolve_stream_filter(get_topology(), stream_id, gate_id, station_id)
+    if stream_ids is None and error_type is None:
+        return None
+
+    def predicate(entry: dict) -> bool:
+        if stream_ids is not None and entry.get("streamId") not in stream_ids:
+            return False
+        return error_type is None or entry.get("errorType") == error_type
+    return predicate
+
+@router.get("/error-logs/mediamtx/events")
+async def stream_error_logs_sse(
+    streamId: Optional[str] = None,
+    gateId: Optional[str] = None,
+    stationId: Optional[str] = None,
+    errorType: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    새로 수신된 MediaMTX 오류 로그를 Server-Sent Events로 실시간 전송
+
+    파일을 다시 읽지 않고 ingest 시점에 broadcaster가 구독자별 queue로 fan-out 합니다.
+    역/게이트/스트림/errorType 필터는 구독 시점에 서버에서 적용됩니다.
+    (중복 합치기 전의 원본 레코드 단위로 전송)
+    """
+    subscription = error_log_broadcaster.subscribe(_live_filter(streamId, gateId, stationId, errorType))
+    return StreamingResponse(
+        sse_events(subscription, settings.LIVE_STREAM_HEARTBEAT),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.websocket("/error-logs/mediamtx/ws")
+async def stream_error_logs_ws(
+    websocket: WebSocket,
+    streamId: Optional[str] = None,
+    gateId: Optional[str] = None,
+    stationId: Optional[str] = None,
+    errorType: Optional[str] = None,
+):
+    """
+    새로 수신된 MediaMTX 오류 로그를 WebSocket으로 실시간 전송 (레코드 1건 = text frame 1개)
+
+    느린 구독자는 LIVE_STREAM_SLOW_CONSUMER_POLICY에 따라 오래된 메시지가 버려지거나
+    close code 1013으로 연결이 끊깁니다.
+
+    인증: Authorization 헤더 또는 ?token= (없거나 틀리면 close code 1008)
+    """
+    if not websocket_authorized(websocket):
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    subscription = error_log_broadcaster.subscribe(_live_filter(streamId, gateId, stationId, errorType))
+    await pump_websocket(websocket, subscription)
+
+@router.get("/error-logs/mediamtx/subscribers")
+def get_subscriber_stats():
+    """
+    실시간 push 구독 현황 (구독자 수, 전송/버린 메시지 수 등)
+    """
+    return error_log_broadcaster.stats()
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel
+
+from app.services.json_codec import loads
+from app.services.play_ticket import mediamtx_authorizer, play_ticket_signer, revocation_log, ticket_revocations
+
+router = APIRouter(tags=["mediamtx-auth"])
+
+
+@router.post("/mediamtx/auth", include_in_schema=False)
+async def mediamtx_auth(request: Request) -> Response:
+    """
+    MediaMTX 외부 인증 hook (authMethod: http, authHTTPAddress)
+
+    모든 WHEP / RTSP 연결마다 호출되므로 body를 직접 파싱하고 서명 / 만료 / path / 폐기 여부만
+    메모리에서 확인합니다. 허용이면 200, 거부면 401 (MediaMTX는 2xx 외에는 연결을 거부).
+    """
+    try:
+        body = loads(await request.body())
+    except ValueError:
+        return Response(status_code=400)
+    if not isinstance(body, dict):
+        return Response(status_code=400)
+
+    reason = mediamtx_authorizer.authorize(body)
+    if reason is None:
+        return Response(status_code=200)
+    return Response(status_code=401, headers={"X-Auth-Denied": reason})
+
+
+class RevokeTicketRequest(BaseModel):
+    playTicket: str
+
+
+@router.post("/play-tickets/revoke")
+def revoke_play_ticket(req: RevokeTicketRequest):
+    """
+    재생 티켓 폐기 (이후 MediaMTX 연결 시 거부)
+
+    이 worker에는 바로 반영되고, 다른 worker에는 PLAY_TICKET_REVOCATION_DIR을 통해
+    PLAY_TICKET_REVOCATION_SYNC_INTERVAL 안에 반영됩니다.
+    """
+    claims = play_ticket_signer.decode(req.playTicket)
+    if claims is None:
+        raise HTTPException(status_code=400, detail="Invalid play ticket")
+    ticket_revocations.revoke(claims.jti, claims.exp)
+    revocation_log.publish(claims.jti, claims.exp)
+    return {"revoked": True, **claims.to_dict()}
+
+
+@router.get("/mediamtx/auth/stats")
+def get_mediamtx_auth_stats():
+    """
+    외부 인증 hook 판정 통계 (허용 / 거부 사유별 건수, 폐기 목록 크기)
+    """
+    return {**mediamtx_authorizer.stats(), "revocationSync": revocation_log.stats()}
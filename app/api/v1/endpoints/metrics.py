@@ -0,0 +1,69 @@
+from typing import Iterator
+
+from fastapi import APIRouter, Response
+
+from app.mock_data import get_topology
+from app.services.broadcaster import error_log_broadcaster, stream_status_broadcaster
+from app.services.error_log_writer import error_log_writer
+from app.services.log_retention import log_retention
+from app.services.metrics import Sample, metrics
+from app.services.response_cache import topology_response_cache
+from app.services.stream_health import stream_health_poller
+from app.services.token_cache import verified_token_cache
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _collect_services() -> Iterator[Sample]:
+    """scrape 시점에 각 서비스의 stats() 값을 읽어서 내보냄 (요청 경로에는 비용 없음)"""
+    writer = error_log_writer.stats()
+    yield "error_log_records_accepted_total", "counter", "Error log records accepted into the write queue", [
+        ({}, writer["acceptedTotal"])
+    ]
+    yield "error_log_records_rejected_total", "counter", "Error log records rejected (queue full)", [
+        ({}, writer["rejectedTotal"])
+    ]
+    yield "error_log_records_written_total", "counter", "Error log records written to files", [
+        ({}, writer["writtenTotal"])
+    ]
+    yield "error_log_records_write_failed_total", "counter", "Error log record writes that failed (retried later)", [
+        ({}, writer["writeFailedTotal"])
+    ]
+    yield "error_log_records_dropped_total", "counter", "Error log records dropped after failed writes", [
+        ({}, writer["droppedTotal"])
+    ]
+    yield "error_log_write_queue_depth", "gauge", "Records waiting in the write queue", [({}, writer["queueDepth"])]
+    yield "error_log_dir_bytes", "gauge", "Size of the error log directory (last retention run)", [
+        ({}, log_retention.total_bytes)
+    ]
+
+    yield "live_stream_subscribers", "gauge", "WebSocket / SSE subscribers", [
+        ({"channel": b.name}, b.stats()["subscribers"]) for b in (error_log_broadcaster, stream_status_broadcaster)
+    ]
+
+    topology = get_topology()
+    yield "topology_streams", "gauge", "Streams in the current topology snapshot", [({}, len(topology.streams))]
+    cache = topology_response_cache.stats()
+    yield "topology_response_cache_hits_total", "counter", "Topology response cache hits", [({}, cache["hits"])]
+    yield "topology_response_cache_misses_total", "counter", "Topology response cache misses", [({}, cache["misses"])]
+
+    yield "stream_status", "gauge", "Streams by last checked MediaMTX status", [
+        ({"status": status}, count) for status, count in sorted(stream_health_poller.table.counts().items())
+    ]
+
+    tokens = verified_token_cache.stats()
+    yield "auth_token_cache_hits_total", "counter", "Verified token cache hits", [({}, tokens["hits"])]
+    yield "auth_token_cache_misses_total", "counter", "Verified token cache misses", [({}, tokens["misses"])]
+
+
+metrics.add_collector(_collect_services)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Prometheus text format metrics (프로세스별 값)
+    """
+    return Response(content=metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
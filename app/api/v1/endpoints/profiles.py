@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from app.services.profiling import profile_store
+
+router = APIRouter(tags=["profiles"])
+
+
+def _require_admin(request: Request) -> None:
+    """인증 미들웨어가 남긴 claims의 role이 ADMIN인 경우만 허용"""
+    claims = getattr(request.state, "user", None) or {}
+    if claims.get("role") != "ADMIN":
+        raise HTTPException(status_code=403, detail="Admin role required")
+
+
+@router.get("/admin/profiles")
+def list_profiles(request: Request, limit: int = Query(50, ge=1, le=1000)):
+    """
+    최근 profiling 된 요청 목록 (최신순, 구간별 시간만) + profiling 설정 / 통계
+    """
+    _require_admin(request)
+    return {"profiles": profile_store.list(limit), "stats": profile_store.stats()}
+
+
+@router.get("/admin/profiles/{profileId}")
+def get_profile(profileId: str, request: Request):
+    """
+    profile 하나 (구간별 시간 + 누적 시간 상위 함수 목록)
+    - profileId: 응답의 X-Profile-Id header 값
+    """
+    _require_admin(request)
+    profile = profile_store.get(profileId)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@router.delete("/admin/profiles")
+def clear_profiles(request: Request):
+    _require_admin(request)
+    profile_store.clear()
+    return {"cleared": True}
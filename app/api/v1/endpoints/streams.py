@@ -1,21 +1,67 @@
-from typing import List
-from fastapi import APIRouter, HTTPException
+from typing import AsyncIterator, Callable, List, Optional, Sequence
+from fastapi import APIRouter, HTTPException, Query, Request, Response, WebSocket
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from datetime import datetime, timedelta
-import secrets
+from datetime import datetime, timezone
+import asyncio
+import time
+import zlib
 
 from app.mock_data import (
-    get_all_stations,
-    get_station_by_id,
-    get_gates_by_station,
-    get_gate_by_id,
-    get_streams_by_gate,
+    get_topology,
     get_stream_by_id,
+    topology_store,
 )
 from app.core.config import settings
+from app.middlewares.auth import websocket_authorized
+from app.services.broadcaster import pump_websocket, sse_events
+from app.services.json_codec import dumps
+from app.services.play_ticket import SCOPE_READ, play_ticket_signer
+from app.services.response_cache import etag_for, etag_matches, topology_response_cache
+from app.services.stream_health import stream_health_poller, stream_status_table
+from app.services.stream_status_events import stream_status_events
+from app.services.topology import Station, TopologyRegistry, station_document
 
 router = APIRouter(tags=["stations"])
 
+# ============================================
+# Cached topology responses
+# ============================================
+
+def _response_version(topology: TopologyRegistry, with_status: bool) -> str:
+    """Topology version, plus the live stream status version for responses that include status"""
+    return f"{topology.version}.{stream_status_table.version_tag}" if with_status else topology.version
+
+def _cached_topology_response(
+    request: Request,
+    key: str,
+    build: Callable[[TopologyRegistry], BaseModel],
+    with_status: bool = False,
+    exists: Optional[Callable[[TopologyRegistry], None]] = None,
+) -> Response:
+    """
+    Serve a topology response encoded once per topology (and stream status) version.
+
+    The ETag depends only on (version, key), so If-None-Match is answered with
+    304 before any model building. `exists` (raising 404) runs first, so
+    `If-None-Match: *` never matches a resource that does not exist.
+    """
+    # 한 요청 안에서는 같은 snapshot 사용 (reload 중에도 일관된 결과)
+    topology = get_topology()
+    if exists is not None:
+        exists(topology)
+    version = _response_version(topology, with_status)
+    etag = etag_for(version, key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        topology_response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    body, _ = topology_response_cache.get(
+        version, key, lambda: build(topology).model_dump_json().encode()
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
+
 # ============================================
 # Stations API
 # ============================================
@@ -27,17 +73,19 @@ class StationResponse(BaseModel):
 class StationListResponse(BaseModel):
     stations: List[StationResponse]
 
-@router.get("/stations", response_model=StationListResponse)
-def get_stations() -> StationListResponse:
-    """Get all stations"""
-    stations = get_all_stations()
+def _build_stations(topology: TopologyRegistry) -> StationListResponse:
     return StationListResponse(
         stations=[
             StationResponse(stationId=s.station_id, name=s.name)
-            for s in stations
+            for s in topology.stations
         ]
     )
 
+@router.get("/stations", response_model=StationListResponse)
+async def get_stations(request: Request) -> Response:
+    """Get all stations"""
+    return _cached_topology_response(request, "stations", _build_stations)
+
 # ============================================
 # Gates API
 # ============================================
@@ -51,20 +99,22 @@ class GateListResponse(BaseModel):
     gates: List[GateResponse]
 
 @router.get("/stations/{stationId}/gates", response_model=GateListResponse)
-def get_station_gates(stationId: str) -> GateListResponse:
+async def get_station_gates(stationId: str, request: Request) -> Response:
     """Get all gates for a specific station"""
-    # Verify station exists
-    station = get_station_by_id(stationId)
-    if not station:
-        raise HTTPException(status_code=404, detail=f"Station {stationId} not found")
-    
-    gates = get_gates_by_station(stationId)
-    return GateListResponse(
-        gates=[
-            GateResponse(gateId=g.gate_id, stationId=g.station_id, name=g.name)
-            for g in gates
-        ]
-    )
+    def exists(topology: TopologyRegistry) -> None:
+        if not topology.station(stationId):
+            raise HTTPException(status_code=404, detail=f"Station {stationId} not found")
+
+    def build(topology: TopologyRegistry) -> GateListResponse:
+        gates = topology.gates_of(stationId)
+        return GateListResponse(
+            gates=[
+                GateResponse(gateId=g.gate_id, stationId=g.station_id, name=g.name)
+                for g in gates
+            ]
+        )
+
+    return _cached_topology_response(request, f"stations/{stationId}/gates", build, exists=exists)
 
 # ============================================
 # Streams API
@@ -80,26 +130,233 @@ class StreamListResponse(BaseModel):
     streams: List[StreamResponse]
 
 @router.get("/gates/{gateId}/streams", response_model=StreamListResponse)
-def get_gate_streams(gateId: str) -> StreamListResponse:
+async def get_gate_streams(gateId: str, request: Request) -> Response:
     """Get all streams for a specific gate"""
-    # Verify gate exists
-    gate = get_gate_by_id(gateId)
-    if not gate:
-        raise HTTPException(status_code=404, detail=f"Gate {gateId} not found")
-    
-    streams = get_streams_by_gate(gateId)
-    return StreamListResponse(
-        streams=[
-            StreamResponse(
-                streamId=s.stream_id,
-                gateId=s.gate_id,
-                name=s.name,
-                status=s.status
-            )
-            for s in streams
-        ]
+    def exists(topology: TopologyRegistry) -> None:
+        if not topology.gate(gateId):
+            raise HTTPException(status_code=404, detail=f"Gate {gateId} not found")
+
+    def build(topology: TopologyRegistry) -> StreamListResponse:
+        streams = topology.streams_of(gateId)
+        return StreamListResponse(
+            streams=[
+                StreamResponse(
+                    streamId=s.stream_id,
+                    gateId=s.gate_id,
+                    name=s.name,
+                    status=stream_status_table.status_of(s)
+                )
+                for s in streams
+            ]
+        )
+
+    return _cached_topology_response(request, f"gates/{gateId}/streams", build, with_status=True, exists=exists)
+
+# ============================================
+# Topology tree API
+# ============================================
+
+# 이 크기만큼 모이면 전송 (역 단위로 인코딩하므로 메모리 사용량은 역 하나 + 이 버퍼 정도)
+TREE_CHUNK_BYTES = 64 * 1024
+
+
+def _qvalue(params: str) -> float:
+    """q value of one Accept-Encoding entry (1 if absent, 0 if malformed or outside 0..1)"""
+    for param in params.split(";"):
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "q":
+            try:
+                q = float(value.strip())
+            except ValueError:
+                return 0.0
+            return q if 0.0 <= q <= 1.0 else 0.0
+    return 1.0
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """An explicit gzip entry decides; otherwise a * entry does. q=0 means not acceptable."""
+    gzip_q: Optional[float] = None
+    any_q: Optional[float] = None
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if name == "gzip":
+            gzip_q = max(gzip_q or 0.0, _qvalue(params))
+        elif name == "*":
+            any_q = max(any_q or 0.0, _qvalue(params))
+    q = gzip_q if gzip_q is not None else any_q
+    return q is not None and q > 0
+
+
+async def _encode_tree(topology: TopologyRegistry, stations: Sequence[Station], use_gzip: bool) -> AsyncIterator[bytes]:
+    """Encode the tree one station at a time, yielding ~TREE_CHUNK_BYTES chunks (gzip-compressed if requested)"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if use_gzip else None
+    pending: List[bytes] = [b'{"version":' + dumps(topology.version) + b',"stations":[']
+    pending_size = 0
+
+    for i, station in enumerate(stations):
+        document = station_document(topology, station, stream_status_table.status_of)
+        data = dumps(document)
+        pending.append(b"," + data if i else data)
+        pending_size += len(data)
+        if pending_size >= TREE_CHUNK_BYTES:
+            chunk = b"".join(pending)
+            pending, pending_size = [], 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+            # 큰 트리를 인코딩하는 동안 다른 요청도 처리되도록 양보
+            await asyncio.sleep(0)
+
+    pending.append(b"]}")
+    chunk = b"".join(pending)
+    yield compressor.compress(chunk) + compressor.flush() if compressor else chunk
+
+@router.get("/topology/tree")
+async def get_topology_tree(
+    request: Request,
+    stationIds: Optional[List[str]] = Query(None, description="조회할 역 ID (반복 또는 쉼표 구분, 생략 시 전체)"),
+) -> Response:
+    """
+    Whole station → gate → stream hierarchy in one response (or the subtree of the given stations)
+
+    The body is streamed station by station, so memory stays flat regardless of
+    network size. Compressed with gzip when the client sends `Accept-Encoding: gzip`.
+    Supports ETag / If-None-Match like the list endpoints.
+    """
+    topology = get_topology()
+
+    if stationIds:
+        station_ids = list(dict.fromkeys(sid.strip() for value in stationIds for sid in value.split(",") if sid.strip()))
+        unknown = [sid for sid in station_ids if topology.station(sid) is None]
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Station {', '.join(unknown)} not found")
+        stations: Sequence[Station] = [topology.station(sid) for sid in station_ids]
+        key = "topology/tree?" + ",".join(station_ids)
+    else:
+        stations = topology.stations
+        key = "topology/tree"
+
+    use_gzip = _accepts_gzip(request.headers.get("accept-encoding"))
+    etag = etag_for(_response_version(topology, with_status=True), key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        topology_response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(_encode_tree(topology, stations, use_gzip), media_type="application/json", headers=headers)
+
+# ============================================
+# Stream health
+# ============================================
+
+@router.get("/streams/health")
+def get_stream_health():
+    """MediaMTX health poller status (cycle time, status counts, error totals) and status event stats"""
+    return {**stream_health_poller.stats(), "statusEvents": stream_status_events.stats()}
+
+@router.get("/streams/{streamId}/health")
+def get_stream_health_detail(streamId: str):
+    """Latest health check result for one stream"""
+    stream = get_topology().stream(streamId)
+    if not stream:
+        raise HTTPException(status_code=404, detail=f"Stream {streamId} not found")
+    entry = stream_status_table.get(streamId)
+    return {
+        "streamId": streamId,
+        "path": stream_health_poller.path_name(streamId),
+        **(entry.to_dict() if entry else {"status": None}),
+        "effectiveStatus": stream_status_table.status_of(stream),
+    }
+
+# ============================================
+# Stream status events
+# ============================================
+
+def _status_event_filter(
+    stream_id: Optional[str],
+    gate_id: Optional[str],
+    station_id: Optional[str],
+) -> Optional[Callable[[dict], bool]]:
+    """
+    Subscription predicate for status events (None when unfiltered).
+
+    Events carry their gateId and stationId, so matching is a field comparison.
+    Raises 404 for ids that are not in the current topology.
+    """
+    topology = get_topology()
+    for value, lookup, label in (
+        (station_id, topology.station, "Station"),
+        (gate_id, topology.gate, "Gate"),
+        (stream_id, topology.stream, "Stream"),
+    ):
+        if value is not None and lookup(value) is None:
+            raise HTTPException(status_code=404, detail=f"{label} {value} not found")
+
+    filters = [(k, v) for k, v in (("streamId", stream_id), ("gateId", gate_id), ("stationId", station_id)) if v is not None]
+    if not filters:
+        return None
+    return lambda event: all(event.get(k) == v for k, v in filters)
+
+@router.get("/streams/status/events")
+async def stream_status_events_sse(
+    streamId: Optional[str] = None,
+    gateId: Optional[str] = None,
+    stationId: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Stream status changes as Server-Sent Events.
+
+    Each event is {streamId, gateId, stationId, old, new, timestamp, transitions}.
+    Changes of one stream are coalesced to at most one event per
+    STREAM_STATUS_EVENT_WINDOW seconds; fetch the current state from
+    /gates/{gateId}/streams first and apply events on top of it.
+
+    Browsers' EventSource cannot send headers, so this path also accepts the
+    token as ?token= (see QUERY_TOKEN_PATHS in app.middlewares.auth).
+    """
+    subscription = stream_status_events.broadcaster.subscribe(_status_event_filter(streamId, gateId, stationId))
+    return StreamingResponse(
+        sse_events(subscription, settings.LIVE_STREAM_HEARTBEAT),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
+@router.websocket("/streams/status/ws")
+async def stream_status_events_ws(
+    websocket: WebSocket,
+    streamId: Optional[str] = None,
+    gateId: Optional[str] = None,
+    stationId: Optional[str] = None,
+):
+    """
+    Stream status changes over WebSocket (one event per text frame).
+
+    Authenticate with an Authorization header or ?token=. Unknown filter ids
+    close the connection with 1008.
+    """
+    if not websocket_authorized(websocket):
+        await websocket.close(code=1008)
+        return
+    try:
+        predicate = _status_event_filter(streamId, gateId, stationId)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=e.detail)
+        return
+    await websocket.accept()
+    await pump_websocket(websocket, stream_status_events.broadcaster.subscribe(predicate))
+
+# ============================================
+# Topology status
+# ============================================
+
+@router.get("/topology/status")
+def get_topology_status():
+    """Current topology snapshot (version, record counts, last reload result) and response cache stats"""
+    return {**topology_store.stats(), "responseCache": topology_response_cache.stats()}
+
 # ============================================
 # Play Ticket API (kept for backward compatibility)
 # ============================================
@@ -110,31 +367,70 @@ class PlayTicketResponse(BaseModel):
     expiresAt: str  # ISO string
     whepUrl: str
 
-@router.post("/streams/{streamId}/play-ticket", response_model=PlayTicketResponse)
-def issue_play_ticket(streamId: str) -> PlayTicketResponse:
-    """Issue a play ticket for a stream"""
-    # Verify stream exists
-    stream = get_stream_by_id(streamId)
-    if not stream:
-        raise HTTPException(status_code=404, detail=f"Stream {streamId} not found")
-    
-    # 티켓 발급 (30분 유효)
-    expiresAt = (datetime.utcnow() + timedelta(minutes=30)).isoformat() + "Z"
-    playTicket = secrets.token_urlsafe(32)
-    
+def _play_ticket(streamId: str, now: float) -> PlayTicketResponse:
+    playTicket, claims = play_ticket_signer.issue(streamId, SCOPE_READ, now=now)
+    expiresAt = datetime.fromtimestamp(claims.exp, timezone.utc).isoformat().replace("+00:00", "Z")
+
     # MediaMTX WHEP URL 구성
     # 형식: http://{host}:{port}/{path_prefix}/{streamId}/whep
-    path_prefix = settings.MEDIAMTX_PATH
-    if path_prefix:
-        whep_path = f"{path_prefix}/whep" # TODO streamId를 적용해야함
-    else:
-        whep_path = f"/whep"
-    
+    whep_path = f"{stream_health_poller.path_name(streamId)}/whep"
     whepUrl = f"http://{settings.MEDIAMTX_HOST}:{settings.MEDIAMTX_WEBRTC_PORT}/{whep_path}"
-    
+
     return PlayTicketResponse(
         streamId=streamId,
         playTicket=playTicket,
         expiresAt=expiresAt,
         whepUrl=whepUrl
-    )
\ No newline at end of file
+    )
+
+@router.post("/streams/{streamId}/play-ticket", response_model=PlayTicketResponse)
+def issue_play_ticket(streamId: str) -> PlayTicketResponse:
+    """
+    Issue a signed play ticket for a stream.
+
+    The ticket carries the stream, scope and expiry and is checked by the
+    MediaMTX auth hook (/mediamtx/auth) on connect; send it as
+    `Authorization: Bearer <playTicket>` on the WHEP request.
+    """
+    # Verify stream exists
+    stream = get_stream_by_id(streamId)
+    if not stream:
+        raise HTTPException(status_code=404, detail=f"Stream {streamId} not found")
+    return _play_ticket(streamId, time.time())
+
+class PlayTicketBatchRequest(BaseModel):
+    streamIds: List[str]
+
+class PlayTicketError(BaseModel):
+    streamId: str
+    detail: str
+
+class PlayTicketBatchResponse(BaseModel):
+    tickets: List[PlayTicketResponse]
+    errors: List[PlayTicketError]
+
+@router.post("/streams/play-tickets", response_model=PlayTicketBatchResponse)
+def issue_play_tickets(req: PlayTicketBatchRequest) -> PlayTicketBatchResponse:
+    """
+    Issue play tickets for several streams in one request (e.g. a video wall).
+
+    Tickets are returned in request order; unknown stream ids are reported in
+    `errors` instead of failing the whole request. All tickets share one
+    expiry.
+    """
+    if len(req.streamIds) > settings.PLAY_TICKET_BATCH_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many streams (max {settings.PLAY_TICKET_BATCH_MAX} per request)"
+        )
+
+    topology = get_topology()
+    now = time.time()
+    tickets: List[PlayTicketResponse] = []
+    errors: List[PlayTicketError] = []
+    for streamId in req.streamIds:
+        if topology.stream(streamId) is None:
+            errors.append(PlayTicketError(streamId=streamId, detail=f"Stream {streamId} not found"))
+        else:
+            tickets.append(_play_ticket(streamId, now))
+    return PlayTicketBatchResponse(tickets=tickets, errors=errors)
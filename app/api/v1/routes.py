@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import ping, streams, auth, error_logs
+from app.api.v1.endpoints import ping, streams, auth, error_logs, mediamtx_auth, metrics, profiles
 
 api_router = APIRouter()
 
@@ -12,5 +12,14 @@ api_router.include_router(auth.router)
 # 스트리밍 관리
 api_router.include_router(streams.router)
 
+# MediaMTX 외부 인증 hook / 재생 티켓 폐기
+api_router.include_router(mediamtx_auth.router)
+
 # 오류 로그
-api_router.include_router(error_logs.router)
\ No newline at end of file
+api_router.include_router(error_logs.router)
+
+# 운영 지표 (Prometheus)
+api_router.include_router(metrics.router)
+
+# 요청 profiling 결과 조회 (ADMIN)
+api_router.include_router(profiles.router)
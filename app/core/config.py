@@ -1,6 +1,9 @@
 import os
+from pathlib import Path
 from pydantic_settings import BaseSettings
 
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
 class Settings(BaseSettings):
     APP_NAME: str = "tmoney_control_center_backend"
     API_V1_PREFIX: str = "/api/v1"
@@ -11,9 +14,89 @@ class Settings(BaseSettings):
     MEDIAMTX_RTSP_PORT: int = 8554
     MEDIAMTX_HLS_PORT: int = 8888
     MEDIAMTX_PATH: str = "stitched"  # 예: "live" -> /live/{streamId}/whep
+    MEDIAMTX_API_PORT: int = 9997  # MediaMTX Control API (스트림 상태 확인용)
+    MEDIAMTX_AUTH_OPEN_ACTIONS: str = ""  # 외부 인증 hook에서 티켓 없이 허용할 action (쉼표 구분, 기본 없음 / 예: 내부망 publisher용 "publish")
+
+    # 재생 티켓 설정
+    PLAY_TICKET_SECRET: str = ""  # HMAC 서명 키 (비어 있으면 프로세스별 임의 키, worker가 여러 개면 필수)
+    PLAY_TICKET_TTL: int = 1800  # 티켓 유효 시간 (초)
+    PLAY_TICKET_REVOCATION_MAX: int = 100000  # 폐기된 티켓 ID 최대 보관 개수
+    PLAY_TICKET_REVOCATION_DIR: str = ""  # worker 사이 폐기 목록 공유 디렉토리 (비어 있으면 프로세스 메모리만, app.server가 worker 여러 개면 자동 지정)
+    PLAY_TICKET_REVOCATION_SYNC_INTERVAL: float = 1.0  # 다른 worker의 폐기를 반영하는 주기 (초)
+    PLAY_TICKET_BATCH_MAX: int = 100  # 일괄 발급 요청 1건당 최대 스트림 수 (6x6 비디오월 = 36)
 
     APP_ENV: str = "local"
-    DEV_AUTH_TOKEN: str = "" # TODO 삭제 예정
+    JSON_BACKEND: str = "auto"  # "auto" (orjson이 설치되어 있으면 사용) | "orjson" | "json" (로그 기록 / 파싱, API 응답 인코딩)
+
+    # 운영 서버 실행 (python -m app.server)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # worker 프로세스 수 (0이면 사용 가능한 CPU 수, 컨테이너 CPU 제한 반영)
+    SERVER_BACKLOG: int = 2048  # listen backlog (worker가 모두 바쁠 때 대기할 수 있는 연결 수)
+    SERVER_KEEP_ALIVE: int = 20  # idle keep-alive 연결 유지 시간 (초, 앞단 proxy의 idle timeout보다 길게)
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # 종료 시 처리 중인 요청 / 스트림 연결을 기다리는 최대 시간 (초)
+    SERVER_MAX_REQUESTS: int = 0  # worker가 이만큼 요청을 처리하면 새 worker로 교체 (0이면 교체하지 않음)
+    SERVER_MAX_REQUESTS_JITTER: int = 0  # worker별로 0 ~ jitter 만큼 더해서 동시에 교체되지 않게 함
+    SERVER_ACCESS_LOG: bool = False  # uvicorn 요청별 access log (요청 지표는 /api/v1/metrics)
+    METRICS_ENABLED: bool = True  # 요청 수 / 처리 시간 지표 수집 (/api/v1/metrics)
+
+    # 요청 profiling (PROFILING_TOKEN 또는 PROFILING_SAMPLE_RATE 를 설정해야 활성화)
+    PROFILING_TOKEN: str = ""  # X-Profile header 값이 일치하는 요청을 profiling (비어 있으면 header로 요청 불가)
+    PROFILING_SAMPLE_RATE: float = 0.0  # 무작위로 profiling 할 요청 비율 (0.0 ~ 1.0)
+    PROFILING_MAX_PROFILES: int = 50  # 메모리에 보관할 최근 profile 수
+    PROFILING_TOP_CALLS: int = 40  # profile 하나에 보관할 함수 수 (누적 시간 상위)
+    DEV_AUTH_TOKEN: str = ""  # 개발용 고정 토큰 (APP_ENV가 local / test일 때만 허용, TODO 삭제 예정)
+
+    # 인증 (JWT) 설정
+    JWT_SECRET: str = ""  # 설정하면 Bearer 토큰을 JWT로 서명 검증 (비어 있으면 DEV_AUTH_TOKEN 일치 확인)
+    JWT_ALG: str = "HS256"  # JWT 서명 알고리즘
+    JWT_AUDIENCE: str = ""  # 설정하면 aud claim 확인
+    JWT_ISSUER: str = ""  # 설정하면 iss claim 확인
+    AUTH_TOKEN_CACHE_SIZE: int = 10000  # 검증된 토큰 캐시 최대 개수 (0이면 캐시 안 함)
+    AUTH_TOKEN_CACHE_TTL: float = 300.0  # 캐시 유지 시간 (초, 토큰 exp가 더 빠르면 exp까지)
+
+    # MediaMTX 오류 로그 설정
+    ERROR_LOG_DIR: str = str(BASE_DIR / "logs" / "mediamtx_errors")
+    ERROR_LOG_QUEUE_SIZE: int = 10000  # 대기 가능한 최대 레코드 수 (초과 시 503)
+    ERROR_LOG_BATCH_SIZE: int = 500  # 한 번에 기록할 최대 레코드 수
+    ERROR_LOG_FLUSH_INTERVAL: float = 0.2  # 배치 최대 대기 시간 (초)
+    ERROR_LOG_FSYNC: str = "batch"  # "none" | "batch"
+    ERROR_LOG_MAX_OPEN_FILES: int = 4  # 동시에 열어둘 날짜별 파일 핸들 수
+    ERROR_LOG_WRITE_MODE: str = "single"  # "single" (worker 1개) | "sharded" (worker별 shard 파일, 모든 worker가 같은 값이어야 함)
+    ERROR_LOG_COMPACT_INTERVAL: float = 3600.0  # 지난 날짜 shard 합치기 주기 (초, sharded 모드)
+    ERROR_LOG_BULK_MAX_RECORDS: int = 5000  # bulk 요청 1건당 최대 레코드 수
+    ERROR_LOG_BULK_MAX_RECORD_BYTES: int = 65536  # bulk 레코드 1건의 최대 크기
+    ERROR_LOG_DEDUP_WINDOW: float = 10.0  # 첫 레코드 이후 같은 fingerprint의 반복을 합치는 window (초, 0이면 비활성화)
+    ERROR_LOG_DEDUP_MAX_ENTRIES: int = 10000  # window가 열려 있는 fingerprint 최대 개수
+    ERROR_LOG_ROLLUP_DIR: str = str(BASE_DIR / "logs" / "mediamtx_rollups")
+    ERROR_LOG_ROLLUP_SNAPSHOT_INTERVAL: float = 60.0  # 분 단위 카운터 snapshot 저장 주기 (초)
+    ERROR_LOG_ARCHIVE_ENABLED: bool = True  # 지난 날짜 로그 압축 보관
+    ERROR_LOG_ARCHIVE_AFTER_DAYS: int = 2  # 며칠 지난 날짜부터 압축 보관할지
+    ERROR_LOG_ARCHIVE_INTERVAL: float = 3600.0  # 압축 보관 작업 주기 (초)
+    ERROR_LOG_RETENTION_DAYS: int = 365  # 로그 보관 기간 (일)
+    ERROR_LOG_MAX_BYTES: int = 10 * 1024 ** 3  # 로그 디렉토리 최대 용량 (초과 시 오래된 파일부터 삭제)
+    ERROR_LOG_RETENTION_INTERVAL: float = 60.0  # 보관 기간 / 용량 점검 주기 (초)
+
+    # 토폴로지 (역 / 게이트 / 스트림) 설정
+    TOPOLOGY_FILE: str = ""  # YAML/JSON 토폴로지 파일 경로 (비어 있으면 내장 mock 데이터 사용)
+    TOPOLOGY_RELOAD_DEBOUNCE: float = 0.5  # 파일 변경 감지 후 reload 까지 대기 시간 (초)
+    TOPOLOGY_RELOAD_ISOLATED: bool = True  # reload 시 파일 파싱을 별도 프로세스에서 수행 (event loop 지연 방지)
+    TOPOLOGY_RESPONSE_CACHE_SIZE: int = 20000  # 토폴로지 버전별로 캐시할 응답 body 최대 개수
+
+    # 스트림 상태 확인 (MediaMTX API polling) 설정
+    STREAM_HEALTH_ENABLED: bool = True  # 비활성화하면 토폴로지의 정적 status 사용
+    STREAM_HEALTH_MODE: str = "list"  # "list" (/v3/paths/list 일괄 조회) | "path" (스트림별 /v3/paths/get)
+    STREAM_HEALTH_INTERVAL: float = 5.0  # 정상 스트림 확인 주기 (초)
+    STREAM_HEALTH_CONCURRENCY: int = 8  # 동시에 보내는 최대 요청 수 (= 연결 pool 크기)
+    STREAM_HEALTH_PAGE_SIZE: int = 1000  # list 모드의 페이지당 path 수
+    STREAM_HEALTH_TIMEOUT: float = 2.0  # 요청 1건 timeout (초)
+    STREAM_HEALTH_MAX_BACKOFF: float = 60.0  # 비정상 스트림의 최대 확인 간격 (초)
+    STREAM_STATUS_EVENT_WINDOW: float = 1.0  # 스트림별 상태 변경 이벤트 최소 간격 (초, 그 사이 변경은 합쳐서 전송)
+
+    # 실시간 push (WebSocket / SSE) 설정
+    LIVE_STREAM_QUEUE_SIZE: int = 256  # 구독자별 최대 대기 메시지 수
+    LIVE_STREAM_SLOW_CONSUMER_POLICY: str = "drop"  # "drop" (오래된 메시지 버림) | "disconnect" (구독 종료)
+    LIVE_STREAM_HEARTBEAT: float = 15.0  # SSE keep-alive comment 전송 주기 (초)
 
     class Config:
         # ENV 환경변수에 따라 다른 파일 로드
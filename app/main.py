@@ -1,12 +1,73 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.routes import api_router
 from app.middlewares.auth import ApiV1AuthMiddleware
+from app.middlewares.metrics import MetricsMiddleware
+from app.middlewares.profiling import ProfilingMiddleware
+from app.mock_data import topology_store
+from app.services.error_log_archive import error_log_archiver
+from app.services.error_log_rollup import error_log_rollup
+from app.services.error_log_shards import error_log_compactor
+from app.services.error_log_writer import error_log_writer
+from app.services.json_codec import FastJSONResponse
+from app.services.log_retention import log_retention
+from app.services.play_ticket import revocation_log
+from app.services.profiling import instrument_routes, profiling_enabled
+from app.services.stream_health import stream_health_poller, stream_status_table
+from app.services.stream_status_events import stream_status_events
 
 print(f"ENV = {settings.APP_ENV}")
 
-app = FastAPI(title=settings.APP_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 토폴로지 파일 감시 (변경 시 worker thread에서 다시 읽고 snapshot 교체)
+    await topology_store.start()
+
+    # MediaMTX 스트림 상태 polling (스트림 API의 status에 반영, 상태 변경은 구독자에게 push)
+    stream_status_table.add_listener(stream_status_events.on_transition)
+    if settings.STREAM_HEALTH_ENABLED:
+        await stream_health_poller.start()
+
+    # 오류 로그 rollup 복원 → writer 기동 / 종료 시 남은 로그 flush 후 rollup snapshot 저장
+    # (sharded 모드에서는 rollup이 모든 worker의 shard를 직접 따라감)
+    await error_log_rollup.start()
+    if not error_log_rollup.follow_files:
+        error_log_writer.add_listener(error_log_rollup.on_written)
+    await error_log_writer.start()
+
+    # worker별 shard 중 지난 날짜를 하나로 합침 (압축 보관 전 단계)
+    if settings.ERROR_LOG_WRITE_MODE == "sharded":
+        await error_log_compactor.start()
+
+    # 지난 날짜 로그 압축 보관 (writer가 쓰는 중인 파일과 겹치지 않도록 writer lock 사용)
+    if settings.ERROR_LOG_ARCHIVE_ENABLED:
+        error_log_archiver.commit_lock = error_log_writer.detach
+        error_log_archiver.on_archived = lambda old, new: error_log_rollup.rename(old.name, new.name)
+        await error_log_archiver.start()
+
+    # 다른 worker에서 폐기한 재생 티켓 반영 (PLAY_TICKET_REVOCATION_DIR 지정 시)
+    await revocation_log.start()
+
+    # 보관 기간 / 용량 초과 로그 정리 (index, rollup 도 함께 정리)
+    log_retention.commit_lock = error_log_writer.detach
+    log_retention.on_evicted = lambda path: error_log_rollup.drop(path.name)
+    await log_retention.start()
+    try:
+        yield
+    finally:
+        await log_retention.stop()
+        await revocation_log.stop()
+        await error_log_archiver.stop()
+        await error_log_compactor.stop()
+        await error_log_writer.stop()
+        await error_log_rollup.stop()
+        await stream_health_poller.stop()
+        stream_status_events.close()
+        await topology_store.stop()
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # 인증 미들웨어 추가
 app.add_middleware(ApiV1AuthMiddleware)
@@ -20,8 +81,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 profiling (설정했을 때만 설치, 인증 구간까지 재도록 인증 미들웨어 바깥에 둠)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+
+# 요청 수 / 처리 시간 지표 (가장 바깥에서 측정 → 인증 / CORS 포함)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
+if profiling_enabled():
+    instrument_routes(app)
+
 @app.get("/")
 def root():
     return {"name": settings.APP_NAME, "status": "running"}
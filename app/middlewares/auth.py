@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Optional
-from fastapi import Request
+from typing import Iterable, Optional, Tuple
+from urllib.parse import parse_qs
+from fastapi import Request, WebSocket
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 try:
     # 선택: JWT 서명 검증 모드
@@ -13,6 +14,11 @@ except Exception:  # pragma: no cover
     JWTError = Exception
 
 from app.core.config import settings
+from app.services.profiling import profile_phase
+from app.services.token_cache import token_digest, verified_token_cache
+
+# DEV_AUTH_TOKEN 일치 확인을 허용하는 APP_ENV (그 외 환경에서는 JWT만)
+DEV_AUTH_ENVS = {"local", "test"}
 
 PUBLIC_PATHS = {
     "/api/v1/ping",
@@ -21,7 +27,15 @@ PUBLIC_PATHS = {
     "/docs",
     "/redoc",
     "/api/v1/error-logs/mediamtx",  # MediaMTX 오류 로그 (인증 불필요)
+    "/api/v1/error-logs/mediamtx/bulk",  # MediaMTX 오류 로그 일괄 저장
     "/api/v1/error-logs/mediamtx/latest",  # 최근 오류 로그 조회
+    "/api/v1/error-logs/mediamtx/events",  # 실시간 오류 로그 (EventSource는 헤더를 보낼 수 없음)
+    "/api/v1/mediamtx/auth",  # MediaMTX 외부 인증 hook (재생 티켓 서명으로 판정)
+}
+# "/api/v1/xxx/*" 처럼 끝이 "*"인 항목은 prefix로 비교 (하위 경로 전체 공개)
+
+QUERY_TOKEN_PATHS = {
+    "/api/v1/streams/status/events",  # 스트림 상태 SSE (EventSource는 헤더를 보낼 수 없으므로 ?token= 허용)
 }
 
 
@@ -38,56 +52,144 @@ def _get_bearer_token(request: Request) -> Optional[str]:
     return token
 
 
-class ApiV1AuthMiddleware(BaseHTTPMiddleware):
+def dev_token_enabled() -> bool:
+    """DEV_AUTH_TOKEN이 설정되어 있고 APP_ENV가 DEV_AUTH_ENVS 중 하나일 때만 True"""
+    return bool(settings.DEV_AUTH_TOKEN) and settings.APP_ENV in DEV_AUTH_ENVS
+
+
+def authenticate_token(token: Optional[str]) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Bearer 토큰 확인 → (claims, None) 또는 (None, 401 응답의 detail)
+    - JWT_SECRET이 설정되어 있고 python-jose 사용 가능하면 서명 검증 (검증된 토큰은 캐시)
+    - 아니면 DEV_AUTH_TOKEN과 문자열 완전 일치로 검증 (APP_ENV가 local / test일 때만)
+    """
+    if not token:
+        return None, "Missing Authorization Bearer token"
+
+    # (A) JWT 서명 검증 모드
+    jwt_secret = settings.JWT_SECRET
+    if jwt_secret and jwt is not None:
+        digest = token_digest(token)
+        claims = verified_token_cache.get(digest)
+        if claims is not None:
+            return claims, None
+        try:
+            claims = jwt.decode(
+                token,
+                jwt_secret,
+                algorithms=[settings.JWT_ALG],
+                audience=settings.JWT_AUDIENCE or None,
+                issuer=settings.JWT_ISSUER or None,
+                options={"verify_aud": bool(settings.JWT_AUDIENCE)},
+            )
+        except JWTError:
+            return None, "Invalid or expired token"
+        verified_token_cache.put(digest, claims)
+        return claims, None
+
+    # (B) DEV_JWT 완전 일치 모드 (로컬 개발 / 테스트 전용)
+    if dev_token_enabled() and token == settings.DEV_AUTH_TOKEN:
+        return {"sub": "dev-user", "role": "ADMIN"}, None
+
+    return None, "Invalid token"
+
+
+def websocket_authorized(websocket: WebSocket) -> bool:
+    """
+    WebSocket 연결 인증 (인증 미들웨어는 WebSocket 요청을 확인하지 않음)
+    - Authorization: Bearer <token> 헤더 또는 ?token=<token> (브라우저 WebSocket은 헤더를 보낼 수 없음)
+    - 통과하면 claims를 websocket.state.user 에 저장
+    """
+    token = _get_bearer_token(websocket) or websocket.query_params.get("token")
+    claims, detail = authenticate_token(token)
+    if detail is not None:
+        return False
+    websocket.state.user = claims
+    return True
+
+
+class PathMatcher:
+    """
+    공개 경로 판정 (미들웨어 생성 시 한 번만 구성)
+    - 일반 항목: 완전 일치 (frozenset)
+    - "*"로 끝나는 항목: prefix 일치 (str.startswith(tuple) 한 번으로 비교)
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        paths = list(paths)
+        self.exact = frozenset(p for p in paths if not p.endswith("*"))
+        self.prefixes = tuple(sorted({p[:-1] for p in paths if p.endswith("*")}))
+
+    def __call__(self, path: str) -> bool:
+        return path in self.exact or (bool(self.prefixes) and path.startswith(self.prefixes))
+
+
+def _bearer_token_from_scope(scope: Scope) -> Optional[str]:
+    """ASGI scope의 raw header에서 Bearer 토큰 추출 (Request 객체를 만들지 않음)"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            token = token.strip()
+            if scheme.lower() != "bearer" or not token:
+                return None
+            return token
+    return None
+
+
+def _query_token_from_scope(scope: Scope) -> Optional[str]:
+    """query string의 token= 값"""
+    values = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("token")
+    return values[0] if values else None
+
+
+class ApiV1AuthMiddleware:
     """
     - /api/v1/ping, /api/v1/token 등 PUBLIC_PATHS는 통과
     - 그 외 /api/v1/** 는 Authorization: Bearer <token> 필수
-    - 검증 방식:
-        1) JWT_SECRET이 설정되어 있고 python-jose 사용 가능하면 서명 검증
-        2) 아니면 DEV_JWT와 문자열 완전 일치로 검증
+    - 검증 방식 (authenticate_token):
+        1) JWT_SECRET이 설정되어 있고 python-jose 사용 가능하면 서명 검증 (검증된 토큰은 exp까지 캐시)
+        2) 아니면 DEV_JWT와 문자열 완전 일치로 검증 (APP_ENV가 local / test일 때만)
+    - QUERY_TOKEN_PATHS(브라우저 EventSource용)는 헤더가 없으면 ?token= 으로도 인증
+    - 통과한 요청의 claims는 request.state.user
+
+    순수 ASGI 미들웨어: scope(path, header)만 보고 판정하고, 통과한 요청은 receive/send를
+    감싸지 않고 그대로 넘김 (StreamingResponse / SSE도 추가 task 없이 전달됨).
+    WebSocket 연결은 그대로 통과시키고 endpoint에서 websocket_authorized()로 확인합니다.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-
+    def __init__(
+        self,
+        app: ASGIApp,
+        prefix: str = "/api/v1",
+        public_paths: Iterable[str] = PUBLIC_PATHS,
+        query_token_paths: Iterable[str] = QUERY_TOKEN_PATHS,
+    ):
+        self.app = app
+        self.prefix = prefix
+        self.is_public = PathMatcher(public_paths)
+        self.allows_query_token = PathMatcher(query_token_paths)
+        if settings.JWT_SECRET and jwt is None:
+            print("[auth] JWT_SECRET is set but python-jose is not installed, falling back to DEV_AUTH_TOKEN")
+        if settings.DEV_AUTH_TOKEN and not dev_token_enabled():
+            print(f"[auth] DEV_AUTH_TOKEN is ignored for APP_ENV={settings.APP_ENV!r} (allowed: {sorted(DEV_AUTH_ENVS)})")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"]
         # /api/v1 경로가 아니면 무시 (필요에 따라 전체 보호로 바꿔도 됨)
-        if not path.startswith("/api/v1"):
-            return await call_next(request)
-
-        # Public allowlist
-        if path in PUBLIC_PATHS:
-            return await call_next(request)
-
-        token = _get_bearer_token(request)
-        if not token:
-            return JSONResponse(
-                status_code=401,
-                content={"detail": "Missing Authorization Bearer token"},
-            )
-
-        dev_jwt = settings.DEV_AUTH_TOKEN
-        # jwt_secret = os.getenv("JWT_SECRET", "").strip()
-        # jwt_alg = os.getenv("JWT_ALG", "HS256")
-
-        # (A) JWT 서명 검증 모드
-        # if jwt_secret and jwt is not None:
-        #     try:
-        #         payload = jwt.decode(token, jwt_secret, algorithms=[jwt_alg])
-        #         # 필요하면 여기서 payload의 role/user_id 등을 request.state에 저장
-        #         request.state.user = payload
-        #     except JWTError:
-        #         return JSONResponse(
-        #             status_code=401,
-        #             content={"detail": "Invalid or expired token"},
-        #         )
-        #     return await call_next(request)
-
-        # (B) DEV_JWT 완전 일치 모드 (프로토타입 추천)
-        if dev_jwt and token == dev_jwt:
-            # request.state.user = {"sub": "dev-user", "role": "ADMIN"}
-            return await call_next(request)
-
-        return JSONResponse(
-            status_code=401,
-            content={"detail": "Invalid token"},
-        )
+        if not path.startswith(self.prefix) or self.is_public(path):
+            return await self.app(scope, receive, send)
+
+        with profile_phase("auth"):
+            token = _bearer_token_from_scope(scope)
+            if token is None and self.allows_query_token(path):
+                token = _query_token_from_scope(scope)
+            claims, detail = authenticate_token(token)
+        if detail is None:
+            # request.state.user 로 조회 가능
+            scope.setdefault("state", {})["user"] = claims
+            return await self.app(scope, receive, send)
+        response = JSONResponse(status_code=401, content={"detail": detail})
+        await response(scope, receive, send)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import http_request_duration_seconds, http_requests_total
+
+# 라우팅 전에 끝난 요청 (인증 실패, 404 등)의 route label
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    HTTP 요청 수 / 처리 시간 기록 (순수 ASGI)
+
+    - route label은 실제 경로가 아니라 route template (/api/v1/gates/{gateId}/streams)이라
+      series 개수가 route 수로 제한됨 (FastAPI가 라우팅 후 scope["route"]에 남기는 값 사용)
+    - 처리 시간은 응답 body 전송이 끝날 때까지 (StreamingResponse / SSE는 연결 유지 시간)
+    - WebSocket은 기록하지 않음
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            http_requests_total.inc(method, template, status)
+            http_request_duration_seconds.observe(time.perf_counter() - started, method, template)
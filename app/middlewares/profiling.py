@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hmac
+import random
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.services.profiling import ProfileStore, profile_store
+
+PROFILE_HEADER = b"x-profile"
+
+
+class ProfilingMiddleware:
+    """
+    요청 단위 profiling 선택 + Server-Timing header (순수 ASGI)
+
+    - X-Profile: <PROFILING_TOKEN> header가 일치하거나 PROFILING_SAMPLE_RATE 확률로 선택된 요청만 기록
+    - 선택된 요청의 응답에는 Server-Timing / X-Profile-Id header를 붙이고,
+      응답이 끝나면 profile을 ProfileStore에 보관 (/api/v1/admin/profiles/{id} 로 조회)
+    - 선택되지 않은 요청은 receive/send를 감싸지 않고 그대로 넘김
+    - WebSocket은 기록하지 않음
+
+    인증 구간까지 재려면 인증 미들웨어보다 바깥에 둬야 합니다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore = profile_store,
+        token: Optional[str] = None,
+        sample_rate: Optional[float] = None,
+    ):
+        self.app = app
+        self.store = store
+        token = settings.PROFILING_TOKEN if token is None else token
+        self.token = token.encode() if token else None
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    def _requested(self, scope: Scope) -> bool:
+        if self.token is None:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.token)
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if self._requested(scope):
+            sampled = False
+        elif self.sample_rate > 0 and random.random() < self.sample_rate:
+            sampled = True
+        else:
+            return await self.app(scope, receive, send)
+
+        profile = self.store.begin(scope["method"], scope["path"], sampled)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.mark("response_start")
+                profile.status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                headers.append((b"x-profile-id", profile.id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = scope.get("route")
+            profile.route = getattr(route, "path", None)
+            self.store.finish(profile)
@@ -3,25 +3,14 @@ Mock data for stations, gates, and streams
 Based on frontend SamplePage3.tsx mock data
 """
 
-from typing import Dict, List
+from typing import Sequence
 
-class MockStation:
-    def __init__(self, station_id: str, name: str):
-        self.station_id = station_id
-        self.name = name
+from app.services.topology import Gate, Station, Stream, TopologyRegistry, TopologyStore
 
-class MockGate:
-    def __init__(self, gate_id: str, station_id: str, name: str):
-        self.gate_id = gate_id
-        self.station_id = station_id
-        self.name = name
-
-class MockStream:
-    def __init__(self, stream_id: str, gate_id: str, name: str, status: str = "unknown"):
-        self.stream_id = stream_id
-        self.gate_id = gate_id
-        self.name = name
-        self.status = status
+# 기존 이름 유지 (records는 immutable __slots__ 객체)
+MockStation = Station
+MockGate = Gate
+MockStream = Stream
 
 # Mock stations
 MOCK_STATIONS = [
@@ -70,28 +59,34 @@ MOCK_STREAMS = [
     MockStream(stream_id="stream-013", gate_id="gate-013", name="3번 게이트 카메라", status="active"),
 ]
 
+# 현재 토폴로지 snapshot (TOPOLOGY_FILE이 설정되어 있으면 파일에서 읽고 변경 시 교체)
+topology_store = TopologyStore.from_settings(default=TopologyRegistry(MOCK_STATIONS, MOCK_GATES, MOCK_STREAMS))
+
+def get_topology() -> TopologyRegistry:
+    """Get the current topology snapshot (use one snapshot per request for consistent lookups)"""
+    return topology_store.current
+
 # Helper functions to query mock data
-def get_all_stations() -> List[MockStation]:
+def get_all_stations() -> Sequence[MockStation]:
     """Get all stations"""
-    return MOCK_STATIONS
+    return topology_store.current.stations
 
 def get_station_by_id(station_id: str) -> MockStation | None:
     """Get station by ID"""
-    return next((s for s in MOCK_STATIONS if s.station_id == station_id), None)
+    return topology_store.current.station(station_id)
 
-def get_gates_by_station(station_id: str) -> List[MockGate]:
+def get_gates_by_station(station_id: str) -> Sequence[MockGate]:
     """Get all gates for a station"""
-    return [g for g in MOCK_GATES if g.station_id == station_id]
+    return topology_store.current.gates_of(station_id)
 
 def get_gate_by_id(gate_id: str) -> MockGate | None:
     """Get gate by ID"""
-    return next((g for g in MOCK_GATES if g.gate_id == gate_id), None)
+    return topology_store.current.gate(gate_id)
 
-def get_streams_by_gate(gate_id: str) -> List[MockStream]:
+def get_streams_by_gate(gate_id: str) -> Sequence[MockStream]:
     """Get all streams for a gate"""
-    return [s for s in MOCK_STREAMS if s.gate_id == gate_id]
+    return topology_store.current.streams_of(gate_id)
 
 def get_stream_by_id(stream_id: str) -> MockStream | None:
     """Get stream by ID"""
-    return next((s for s in MOCK_STREAMS if s.stream_id == stream_id), None)
-
+    return topology_store.current.stream(stream_id)
@@ -0,0 +1,297 @@
+"""
+운영 서버 실행 (uvicorn worker 프로세스 여러 개)
+
+    python -m app.server
+
+- worker 수: SERVER_WORKERS (0이면 사용 가능한 CPU 수 - CPU affinity / 컨테이너 CPU 제한 반영)
+- event loop / HTTP parser: uvloop / httptools (설치되어 있지 않으면 asyncio / h11 로 기동하고 경고)
+- keep-alive (SERVER_KEEP_ALIVE), listen backlog (SERVER_BACKLOG)
+- SIGTERM / SIGINT: 새 연결을 받지 않고 처리 중인 요청을 SERVER_GRACEFUL_TIMEOUT 까지 기다린 뒤
+  worker별 lifespan 종료 (오류 로그 queue / dedup window 기록, rollup snapshot 저장) 후 종료
+- SIGHUP: worker를 하나씩 교체 - 새 worker가 요청을 받을 준비가 된 뒤 기존 worker를 종료
+  (listening socket은 supervisor가 계속 열고 있으므로 교체 중에도 연결이 거부되지 않음)
+- SERVER_MAX_REQUESTS: worker가 요청을 이만큼 처리하면 종료하고 새 worker로 교체
+- 기동 전에 app.main:app 을 별도 프로세스에서 import 해서 확인
+  (실패하면 worker를 띄우지 않고 바로 종료 - worker마다 같은 오류로 재시작을 반복하지 않도록)
+
+worker가 여러 개면 프로세스 간에 같아야 하는 설정을 맞춥니다.
+- ERROR_LOG_WRITE_MODE: 지정하지 않았으면 sharded (single 로 지정했으면 기동 거부)
+- PLAY_TICKET_SECRET: 지정하지 않았으면 임의 키를 하나 만들어 모든 worker에 전달
+  (worker 교체 후에도 유지되지만 서버를 다시 시작하면 기존 티켓은 무효)
+- PLAY_TICKET_REVOCATION_DIR: 지정하지 않았으면 ERROR_LOG_DIR/.revocations
+  (한 worker에서 폐기한 티켓을 다른 worker의 MediaMTX 인증 hook도 거부하도록 공유)
+
+worker 관리는 uvicorn의 Multiprocess / Process (공개 API가 아님)를 확장하므로 requirements.txt에 고정한
+uvicorn 버전(SUPPORTED_UVICORN)이 아니면 기동하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import math
+import multiprocessing
+import os
+import random
+import secrets
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import uvicorn
+from uvicorn.supervisors.multiprocess import Multiprocess, Process
+
+from app.core.config import settings
+
+APP = "app.main:app"
+
+# Supervisor가 확장하는 uvicorn 내부 구현을 확인한 버전 (requirements.txt와 같이 올릴 것)
+SUPPORTED_UVICORN = "0.40."
+
+# SIGHUP 교체 시 새 worker가 준비될 때까지 기다리는 최대 시간 (초)
+WORKER_READY_TIMEOUT = 120.0
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """컨테이너 CPU 제한 (docker --cpus 등) - cgroup v2 cpu.max / v1 cfs quota, 제한이 없으면 None"""
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+    return quota / period if quota > 0 and period > 0 else None
+
+
+def available_cpus() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - macOS / Windows
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(cpus, 1)
+
+
+def worker_count() -> int:
+    return settings.SERVER_WORKERS if settings.SERVER_WORKERS > 0 else available_cpus()
+
+
+def _pick(module: str, fallback: str) -> str:
+    """설치되어 있으면 module (uvicorn의 loop / http 이름과 같음), 아니면 fallback"""
+    if importlib.util.find_spec(module) is not None:
+        return module
+    print(f"[server] {module} is not installed, falling back to {fallback}")
+    return fallback
+
+
+def check_app_import(app_path: str = APP) -> None:
+    """
+    app을 별도 프로세스에서 import 해보고, 이 패키지의 app.main 인지 확인
+
+    실행 위치 / PYTHONPATH 때문에 다른 `app` 패키지가 잡히거나 import가 실패하면 SystemExit.
+    (같은 프로세스에서 import 하면 supervisor도 토폴로지 등을 메모리에 올리게 되므로 별도 프로세스)
+    """
+    module, _, attr = app_path.partition(":")
+    code = (
+        "import importlib, sys\n"
+        f"module = importlib.import_module({module!r})\n"
+        f"if not callable(getattr(module, {attr!r}, None)):\n"
+        f"    sys.exit('{app_path} is not an ASGI application')\n"
+        "print(module.__file__)\n"
+    )
+    # 현재 디렉토리 / PYTHONPATH 를 그대로 물려받으므로 worker와 같은 경로로 import 됨
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"[server] Cannot import {app_path}:\n{result.stderr.strip()}")
+
+    imported = Path(result.stdout.strip().splitlines()[-1]).resolve()
+    expected = Path(__file__).resolve().with_name("main.py")
+    if imported != expected:
+        raise SystemExit(f"[server] {app_path} resolved to {imported}, expected {expected} (check working directory / PYTHONPATH)")
+
+
+def check_uvicorn_version(version: str = uvicorn.__version__) -> None:
+    if not version.startswith(SUPPORTED_UVICORN):
+        raise SystemExit(
+            f"[server] uvicorn {version} is not supported (expected {SUPPORTED_UVICORN}x, see requirements.txt): "
+            "app.server relies on uvicorn's multiprocess supervisor internals"
+        )
+
+
+def prepare_worker_env(workers: int) -> None:
+    """worker 여러 개가 같은 값을 써야 하는 설정을 환경 변수로 맞춤 (spawn 된 worker가 그대로 읽음)"""
+    if workers <= 1:
+        return
+    if settings.ERROR_LOG_WRITE_MODE != "sharded":
+        if "ERROR_LOG_WRITE_MODE" in settings.model_fields_set:
+            raise SystemExit(
+                f"[server] ERROR_LOG_WRITE_MODE={settings.ERROR_LOG_WRITE_MODE} cannot be used with {workers} workers "
+                "(use sharded or SERVER_WORKERS=1)"
+            )
+        os.environ["ERROR_LOG_WRITE_MODE"] = "sharded"
+    if not settings.PLAY_TICKET_SECRET:
+        print("[server] PLAY_TICKET_SECRET is not set, using a random secret shared by all workers")
+        os.environ["PLAY_TICKET_SECRET"] = secrets.token_urlsafe(32)
+    if not settings.PLAY_TICKET_REVOCATION_DIR:
+        os.environ["PLAY_TICKET_REVOCATION_DIR"] = str(Path(settings.ERROR_LOG_DIR) / ".revocations")
+
+
+class _Server(uvicorn.Server):
+    """기동(lifespan startup + listen)이 끝나면 ready event를 set 하는 uvicorn Server"""
+
+    def __init__(self, config: uvicorn.Config, ready=None):
+        super().__init__(config)
+        self.ready = ready
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        if self.started and self.ready is not None:
+            self.ready.set()
+
+
+class _Worker:
+    """worker 프로세스에서 실행할 target (spawn 시 pickle 되어 전달)"""
+
+    def __init__(self, config: uvicorn.Config, max_requests_jitter: int = 0, ready=None):
+        self.config = config
+        self.max_requests_jitter = max_requests_jitter
+        self.ready = ready
+
+    def __call__(self, sockets=None) -> None:
+        if self.config.limit_max_requests and self.max_requests_jitter:
+            self.config.limit_max_requests += random.randint(0, self.max_requests_jitter)
+        _Server(self.config, self.ready).run(sockets=sockets)
+
+
+class Supervisor(Multiprocess):
+    """
+    uvicorn Multiprocess + 무중단 worker 교체
+
+    - 죽은 worker(SERVER_MAX_REQUESTS 도달 포함)는 uvicorn과 동일하게 다시 띄움
+    - SIGHUP: 새 worker를 먼저 띄워 준비될 때까지 기다린 뒤 기존 worker에 SIGTERM (하나씩)
+
+    교체는 supervisor loop(0.5초 주기)에서 한 단계씩 진행하므로 교체 중에도 SIGTERM / SIGINT를 바로 처리합니다.
+    """
+
+    def __init__(self, config: uvicorn.Config, sockets: list, max_requests_jitter: int = 0):
+        self.max_requests_jitter = max_requests_jitter
+        self._context = multiprocessing.get_context("spawn")
+        super().__init__(config, target=_Worker(config, max_requests_jitter), sockets=sockets)
+        # 교체할 worker 순번 / 준비 중인 새 worker (process, ready event, 시작 시각) / 종료를 기다리는 기존 worker
+        self._restart_queue: List[int] = []
+        self._replacement: Optional[Tuple[Process, object, float]] = None
+        self._retiring: List[Process] = []
+
+    def restart_all(self) -> None:
+        """SIGHUP: 교체 예약 (진행 중이면 처음부터 다시)"""
+        self._restart_queue = list(range(len(self.processes)))
+
+    def keep_subprocess_alive(self) -> None:
+        self._step_restart()
+        self._reap_retiring()
+        super().keep_subprocess_alive()
+
+    def _step_restart(self) -> None:
+        if self.should_exit.is_set() or (not self._restart_queue and self._replacement is None):
+            return
+        if self._replacement is None:
+            ready = self._context.Event()
+            new = Process(self.config, _Worker(self.config, self.max_requests_jitter, ready), self.sockets)
+            new.start()
+            self._replacement = (new, ready, time.monotonic())
+            return
+
+        new, ready, started = self._replacement
+        idx = self._restart_queue[0]
+        if not ready.is_set():
+            if new.process.is_alive() and time.monotonic() - started < WORKER_READY_TIMEOUT:
+                return
+            old = self.processes[idx]
+            logger.error(f"Replacement worker [{new.pid}] did not become ready, keeping [{old.pid}]")
+            new.terminate()
+            new.kill()
+            new.join()
+            self._replacement = None
+            self._restart_queue = []
+            return
+
+        old = self.processes[idx]
+        self.processes[idx] = new
+        old.terminate()
+        # graceful shutdown을 기다리는 동안 loop를 막지 않도록 종료 확인은 다음 주기에
+        self._retiring.append(old)
+        self._replacement = None
+        self._restart_queue.pop(0)
+        if not self._restart_queue:
+            logger.info(f"Replaced {len(self.processes)} worker(s)")
+
+    def _reap_retiring(self) -> None:
+        for process in [p for p in self._retiring if p.process.exitcode is not None]:
+            process.join()
+            self._retiring.remove(process)
+
+    def terminate_all(self) -> None:
+        if self._replacement is not None:
+            self._replacement[0].terminate()
+        super().terminate_all()
+
+    def join_all(self) -> None:
+        if self._replacement is not None:
+            self._replacement[0].join()
+            self._replacement = None
+        for process in self._retiring:
+            process.join()
+        self._retiring = []
+        super().join_all()
+
+
+def build_config(workers: int) -> uvicorn.Config:
+    max_requests = settings.SERVER_MAX_REQUESTS or None
+    return uvicorn.Config(
+        APP,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=_pick("uvloop", "asyncio"),
+        http=_pick("httptools", "h11"),
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        limit_max_requests=max_requests,
+        access_log=settings.SERVER_ACCESS_LOG,
+        lifespan="on",
+    )
+
+
+def main() -> None:
+    check_uvicorn_version()
+    workers = worker_count()
+    check_app_import()
+    prepare_worker_env(workers)
+
+    config = build_config(workers)
+    print(
+        f"[server] {workers} worker(s) on {config.host}:{config.port} "
+        f"(loop={config.loop}, http={config.http}, keep-alive={config.timeout_keep_alive}s, "
+        f"backlog={config.backlog}, graceful-timeout={config.timeout_graceful_shutdown}s, "
+        f"max-requests={config.limit_max_requests or 'off'})"
+    )
+    sock = config.bind_socket()
+    try:
+        Supervisor(config, sockets=[sock], max_requests_jitter=settings.SERVER_MAX_REQUESTS_JITTER).run()
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+In-memory fan-out broadcaster (WebSocket / SSE 실시간 push 용)
+
+publish 한 번에 메시지를 한 번만 JSON으로 인코딩하고, 구독자별 bounded queue에 넣습니다.
+구독자가 느려서 queue가 가득 차면 정책에 따라
+- "drop": 가장 오래된 메시지를 버리고 새 메시지를 넣음 (dropped 카운트 증가)
+- "disconnect": 해당 구독을 끊음
+으로 처리하므로, 느린 구독자 하나가 publisher나 다른 구독자를 막지 않습니다.
+
+publish / subscribe 는 event loop 스레드에서만 호출해야 합니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, Callable, Optional, Set, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.core.config import settings
+from app.services.json_codec import dumps
+
+SLOW_CONSUMER_POLICIES = ("drop", "disconnect")
+
+# (원본 payload, 인코딩된 JSON 문자열)
+Message = Tuple[dict, str]
+Predicate = Callable[[dict], bool]
+
+
+class Subscription:
+    def __init__(self, broadcaster: "Broadcaster", queue_size: int, predicate: Optional[Predicate]):
+        self._broadcaster = broadcaster
+        self.queue: "asyncio.Queue[Optional[Message]]" = asyncio.Queue(maxsize=queue_size)
+        self.predicate = predicate
+        self.dropped = 0
+        self.closed = False
+
+    def close(self) -> None:
+        """구독 종료 (대기 중인 get()은 None을 받음)"""
+        if self.closed:
+            return
+        self.closed = True
+        self._broadcaster._subscribers.discard(self)
+        # 대기 중인 소비자를 깨우기 위해 queue를 비우고 sentinel을 넣음
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self) -> Optional[Message]:
+        """다음 메시지 (구독이 끊기면 None)"""
+        if self.closed and self.queue.empty():
+            return None
+        return await self.queue.get()
+
+
+class Broadcaster:
+    def __init__(self, name: str, queue_size: int = 256, slow_consumer_policy: str = "drop"):
+        if slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(
+                f"Unknown slow consumer policy: {slow_consumer_policy} (expected one of {SLOW_CONSUMER_POLICIES})"
+            )
+        self.name = name
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self._subscribers: Set[Subscription] = set()
+
+        # 통계
+        self.published_total = 0
+        self.delivered_total = 0
+        self.dropped_total = 0
+        self.disconnected_total = 0
+
+    @classmethod
+    def from_settings(cls, name: str) -> "Broadcaster":
+        return cls(
+            name=name,
+            queue_size=settings.LIVE_STREAM_QUEUE_SIZE,
+            slow_consumer_policy=settings.LIVE_STREAM_SLOW_CONSUMER_POLICY,
+        )
+
+    def subscribe(self, predicate: Optional[Predicate] = None) -> Subscription:
+        subscription = Subscription(self, self.queue_size, predicate)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def publish(self, payload: dict) -> None:
+        if not self._subscribers:
+            return
+        self.published_total += 1
+
+        message: Optional[Message] = None
+        for subscription in list(self._subscribers):
+            if subscription.predicate is not None and not subscription.predicate(payload):
+                continue
+            if message is None:
+                # 구독자 수와 관계없이 인코딩은 한 번만
+                message = (payload, dumps(payload).decode())
+
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                if self.slow_consumer_policy == "disconnect":
+                    self.disconnected_total += 1
+                    subscription.close()
+                    continue
+                subscription.queue.get_nowait()
+                subscription.queue.put_nowait(message)
+                subscription.dropped += 1
+                self.dropped_total += 1
+            self.delivered_total += 1
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "subscribers": len(self._subscribers),
+            "queueSize": self.queue_size,
+            "slowConsumerPolicy": self.slow_consumer_policy,
+            "publishedTotal": self.published_total,
+            "deliveredTotal": self.delivered_total,
+            "droppedTotal": self.dropped_total,
+            "disconnectedTotal": self.disconnected_total,
+        }
+
+
+# ============================================
+# 전송 helper
+# ============================================
+
+async def sse_events(subscription: Subscription, heartbeat: float) -> AsyncIterator[str]:
+    """구독 메시지를 Server-Sent Events 형식으로 변환 (heartbeat 주기마다 comment 전송)"""
+    try:
+        yield ": connected\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if message is None:
+                return
+            yield f"data: {message[1]}\n\n"
+    finally:
+        subscription.close()
+
+
+async def pump_websocket(websocket: WebSocket, subscription: Subscription) -> None:
+    """구독 메시지를 WebSocket text frame으로 전송 (클라이언트가 끊으면 구독 종료)"""
+    client_gone = False
+
+    async def watch_disconnect() -> None:
+        nonlocal client_gone
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+            client_gone = True
+        finally:
+            subscription.close()
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        while True:
+            message = await subscription.get()
+            if message is None:
+                break
+            await websocket.send_text(message[1])
+    except (WebSocketDisconnect, RuntimeError):
+        client_gone = True
+    finally:
+        watcher.cancel()
+        subscription.close()
+
+    # 느린 구독자로 끊긴 경우 (클라이언트는 아직 연결 상태) - 1013: Try Again Later
+    if not client_gone:
+        try:
+            await websocket.close(code=1013)
+        except RuntimeError:
+            pass
+
+
+error_log_broadcaster = Broadcaster.from_settings("error_logs")
+stream_status_broadcaster = Broadcaster.from_settings("stream_status")
@@ -0,0 +1,340 @@
+"""
+MediaMTX 오류 로그 압축 보관 (archive tier)
+
+지난 날짜의 .jsonl 파일을 독립적으로 압축 해제할 수 있는 블록들로 나눠 .jsonl.gz 로 보관합니다.
+
+- 각 블록은 완성된 라인 단위로 잘라 gzip member 하나로 압축 (파일 전체는 `zcat`으로도 읽힘)
+- `<파일명>.blocks` 에 블록 index [원본 offset, 원본 길이, 압축 offset, 압축 길이] 저장
+- offset은 압축 전 .jsonl 기준이므로 기존 sidecar index(.idx)를 그대로 사용
+- 조회 시에는 필요한 블록만 읽어서 압축 해제
+
+사용법 (서버 외부에서 수동 실행):
+    python -m app.services.error_log_archive
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, ContextManager, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.error_log_index import catch_up_index_file, forget_day_index, index_path_for
+from app.services.error_log_reader import ARCHIVE_SUFFIX, LOG_SUFFIX, log_day_of
+from app.services.error_log_shards import is_shard_file, maintenance_lock
+
+ARCHIVE_BLOCK_SIZE = 256 * 1024
+BLOCKS_SUFFIX = ".blocks"
+
+# 마지막 수정 후 이 시간(초)이 지나야 닫힌 파일로 간주
+ARCHIVE_MIN_IDLE = 3600
+
+# (원본 offset, 원본 길이, 압축 offset, 압축 길이)
+Block = Tuple[int, int, int, int]
+
+
+def blocks_path_for(archive_path: Path) -> Path:
+    return archive_path.with_name(archive_path.name + BLOCKS_SUFFIX)
+
+
+def _gzip_block(raw: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(raw) + compressor.flush()
+
+
+def _gunzip_block(data: bytes) -> bytes:
+    return zlib.decompress(data, 31)
+
+
+class ArchivedLogSource:
+    """압축 보관된 .jsonl.gz 파일 (error_log_reader의 source 인터페이스)"""
+
+    # 같은 블록을 반복해서 압축 해제하지 않도록 최근 블록 몇 개를 보관
+    _BLOCK_CACHE_SIZE = 4
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._whole: Optional[bytes] = None
+        self._blocks = self._load_blocks()
+        self._starts = [block[0] for block in self._blocks]
+        # DayIndex.source로 공유되어 여러 요청 thread에서 동시에 읽으므로 cache 갱신은 lock 안에서
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _load_blocks(self) -> List[Block]:
+        blocks_path = blocks_path_for(self.path)
+        if blocks_path.exists():
+            with open(blocks_path, 'r', encoding='utf-8') as f:
+                return [tuple(block) for block in json.load(f)["blocks"]]
+
+        # 블록 index가 없으면 (수동으로 gzip 한 파일 등) 파일 전체를 하나의 블록으로 취급
+        raw = _gunzip_whole(self.path.read_bytes())
+        self._whole = raw
+        return [(0, len(raw), 0, self.path.stat().st_size)] if raw else []
+
+    def size(self) -> int:
+        if not self._blocks:
+            return 0
+        raw_offset, raw_length, _, _ = self._blocks[-1]
+        return raw_offset + raw_length
+
+    def _read_block(self, i: int, f: Optional[BinaryIO] = None) -> bytes:
+        """블록 i 압축 해제 (f: 이미 열어둔 .jsonl.gz 핸들, 없으면 새로 엶)"""
+        with self._cache_lock:
+            cached = self._cache.get(i)
+            if cached is not None:
+                self._cache.move_to_end(i)
+                return cached
+
+        if self._whole is not None:
+            raw = self._whole
+        else:
+            _, _, comp_offset, comp_length = self._blocks[i]
+            with nullcontext(f) if f is not None else open(self.path, 'rb') as fh:
+                fh.seek(comp_offset)
+                raw = _gunzip_block(fh.read(comp_length))
+
+        # 압축 해제는 lock 밖에서 (같은 블록을 동시에 풀어도 결과는 같음)
+        with self._cache_lock:
+            self._cache[i] = raw
+            self._cache.move_to_end(i)
+            while len(self._cache) > self._BLOCK_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return raw
+
+    def _block_of(self, offset: int) -> int:
+        return bisect.bisect_right(self._starts, offset) - 1
+
+    def read_range(self, offset: int, length: int, f: Optional[BinaryIO] = None) -> bytes:
+        parts = []
+        i = max(self._block_of(offset), 0)
+        end = offset + length
+        while i < len(self._blocks) and self._blocks[i][0] < end:
+            raw_offset = self._blocks[i][0]
+            raw = self._read_block(i, f)
+            parts.append(raw[max(offset - raw_offset, 0):end - raw_offset])
+            i += 1
+        return b"".join(parts)
+
+    def read_ranges(self, ranges: Iterable[Tuple[int, int]]) -> List[bytes]:
+        with open(self.path, 'rb') as f:
+            return [self.read_range(offset, length, f) for offset, length in ranges]
+
+    def iter_lines(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        """[start, end) 구간의 완성된 라인(개행 포함)을 offset과 함께 yield"""
+        i = max(self._block_of(start), 0)
+        while i < len(self._blocks):
+            raw_offset = self._blocks[i][0]
+            if end is not None and raw_offset >= end:
+                return
+            offset = raw_offset
+            for line in self._read_block(i).splitlines(keepends=True):
+                if end is not None and offset >= end:
+                    return
+                if offset >= start and line.endswith(b"\n"):
+                    yield offset, line
+                offset += len(line)
+            i += 1
+
+    def iter_lines_reversed(self) -> Iterator[bytes]:
+        for i in range(len(self._blocks) - 1, -1, -1):
+            for line in reversed(self._read_block(i).split(b"\n")):
+                if line.strip():
+                    yield line
+
+
+def _gunzip_whole(data: bytes) -> bytes:
+    """여러 gzip member가 이어진 파일 전체 압축 해제"""
+    parts = []
+    while data:
+        d = zlib.decompressobj(31)
+        parts.append(d.decompress(data))
+        data = d.unused_data
+    return b"".join(parts)
+
+
+def _archive_target(log_path: Path) -> Path:
+    """보관 파일 경로 - 이미 보관된 날짜에 늦게 들어온 로그는 .partN 으로 따로 보관"""
+    stem = log_path.name[:-len(LOG_SUFFIX)]
+    target = log_path.with_name(stem + ARCHIVE_SUFFIX)
+    n = 1
+    while target.exists():
+        target = log_path.with_name(f"{stem}.part{n}{ARCHIVE_SUFFIX}")
+        n += 1
+    return target
+
+
+def archive_log_file(
+    log_path: Path,
+    block_size: int = ARCHIVE_BLOCK_SIZE,
+    rollup_dir: Optional[Path] = None,
+    commit_lock: Optional[Callable[[str], ContextManager]] = None,
+) -> Optional[Path]:
+    """
+    .jsonl 파일을 블록 단위 .jsonl.gz 로 보관하고 원본을 삭제
+
+    commit_lock: 로그 파일명을 받아 writer가 해당 파일에 쓰지 못하게 막는 context manager.
+    압축하는 동안 파일이 커졌으면 보관하지 않고 None을 반환합니다 (다음 실행 때 다시 시도).
+    """
+    target = _archive_target(log_path)
+    tmp_path = target.with_name(target.name + ".tmp")
+
+    # 보관 전에 sidecar index를 끝까지 채워두고 그대로 옮김 (offset이 같으므로)
+    catch_up_index_file(log_path)
+
+    blocks: List[Block] = []
+    raw_offset = 0
+    comp_offset = 0
+    with open(log_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+        pending: List[bytes] = []
+        pending_size = 0
+        for line in src:
+            pending.append(line)
+            pending_size += len(line)
+            if pending_size >= block_size:
+                comp_offset = _write_block(dst, b"".join(pending), raw_offset, comp_offset, blocks)
+                raw_offset += pending_size
+                pending, pending_size = [], 0
+        if pending:
+            comp_offset = _write_block(dst, b"".join(pending), raw_offset, comp_offset, blocks)
+            raw_offset += pending_size
+        dst.flush()
+        os.fsync(dst.fileno())
+
+    with open(blocks_path_for(target), 'w', encoding='utf-8') as f:
+        json.dump({"codec": "gzip", "size": raw_offset, "blocks": blocks}, f, separators=(",", ":"))
+
+    idx_path = index_path_for(log_path)
+    with (commit_lock(log_path.name) if commit_lock else nullcontext()):
+        if log_path.stat().st_size != raw_offset:
+            tmp_path.unlink(missing_ok=True)
+            blocks_path_for(target).unlink(missing_ok=True)
+            return None
+
+        # sidecar index / rollup snapshot 을 보관 파일 이름으로 옮긴 뒤 보관 파일을 확정
+        catch_up_index_file(log_path)
+        if idx_path.exists():
+            os.replace(idx_path, index_path_for(target))
+        if rollup_dir is not None:
+            snapshot = rollup_dir / f"{log_path.name}.json"
+            if snapshot.exists():
+                os.replace(snapshot, rollup_dir / f"{target.name}.json")
+        os.replace(tmp_path, target)
+        log_path.unlink()
+
+    forget_day_index(log_path)
+    return target
+
+
+def _write_block(dst, raw: bytes, raw_offset: int, comp_offset: int, blocks: List[Block]) -> int:
+    data = _gzip_block(raw)
+    dst.write(data)
+    blocks.append((raw_offset, len(raw), comp_offset, len(data)))
+    return comp_offset + len(data)
+
+
+def closed_log_files(log_dir: Path, after_days: int, now: Optional[float] = None) -> List[Path]:
+    """
+    보관 대상: after_days일 이상 지난 날짜이면서 한동안 수정되지 않은 .jsonl 파일
+
+    worker별 shard 파일은 먼저 compaction 으로 합쳐진 뒤에 보관합니다 (error_log_shards 참고).
+    """
+    now = time.time() if now is None else now
+    last_day = (datetime.fromtimestamp(now, timezone.utc) - timedelta(days=after_days)).date().isoformat()
+    return [
+        log_path
+        for log_path in sorted(log_dir.glob("*" + LOG_SUFFIX))
+        if not is_shard_file(log_path)
+        and log_day_of(log_path) <= last_day
+        and now - log_path.stat().st_mtime >= ARCHIVE_MIN_IDLE
+    ]
+
+
+class ErrorLogArchiver:
+    """주기적으로 지난 날짜 로그를 보관하는 background task"""
+
+    def __init__(
+        self,
+        log_dir: Path,
+        rollup_dir: Path,
+        after_days: int = 2,
+        interval: float = 3600.0,
+        block_size: int = ARCHIVE_BLOCK_SIZE,
+    ):
+        self.log_dir = log_dir
+        self.rollup_dir = rollup_dir
+        self.after_days = after_days
+        self.interval = interval
+        self.block_size = block_size
+
+        self.commit_lock: Optional[Callable[[str], ContextManager]] = None
+        self.on_archived: Optional[Callable[[Path, Path], None]] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.archived_total = 0
+        self.last_run_at: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls) -> "ErrorLogArchiver":
+        return cls(
+            log_dir=Path(settings.ERROR_LOG_DIR),
+            rollup_dir=Path(settings.ERROR_LOG_ROLLUP_DIR),
+            after_days=settings.ERROR_LOG_ARCHIVE_AFTER_DAYS,
+            interval=settings.ERROR_LOG_ARCHIVE_INTERVAL,
+        )
+
+    def run_once(self) -> List[Path]:
+        archived = []
+        if not self.log_dir.exists():
+            return archived
+        # 여러 worker가 같은 파일을 동시에 보관하지 않도록 (compaction 과도 겹치지 않게)
+        with maintenance_lock(self.log_dir) as acquired:
+            if not acquired:
+                return archived
+            for log_path in closed_log_files(self.log_dir, self.after_days):
+                target = archive_log_file(log_path, self.block_size, self.rollup_dir, self.commit_lock)
+                if target is None:
+                    continue
+                archived.append(target)
+                if self.on_archived is not None:
+                    self.on_archived(log_path, target)
+        self.archived_total += len(archived)
+        self.last_run_at = time.time()
+        return archived
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="error-log-archiver")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:  # pragma: no cover - 디스크 오류 등
+                print(f"[error-log-archiver] Failed to archive logs: {e}")
+            await asyncio.sleep(self.interval)
+
+
+error_log_archiver = ErrorLogArchiver.from_settings()
+
+
+if __name__ == "__main__":
+    for path in error_log_archiver.run_once():
+        print(f"Archived {path}")
@@ -0,0 +1,130 @@
+"""
+서버 측 오류 로그 중복 제거 (fingerprint coalescing)
+
+여러 콘솔이 같은 MediaMTX 장애를 동시에 보고하면 같은 내용의 로그가 클라이언트 수만큼 들어옵니다.
+streamId + errorType + statusCode + whepUrl host 로 fingerprint를 만들고,
+첫 레코드는 바로 기록한 뒤 window 동안 들어온 같은 fingerprint의 반복 레코드만
+하나로 합쳐 firstSeen/lastSeen/count(반복 횟수)와 함께 window가 끝날 때 기록합니다.
+
+- window는 첫 레코드가 들어온 시점부터 고정 (장애가 계속되면 window마다 최대 2건 기록)
+- 반복이 없었던 window는 끝나도 추가로 기록하지 않음
+- fingerprint 테이블은 메모리에만 두고, window가 끝난 항목은 TTL로 제거하면서 반복 레코드를 기록 대상으로 반환
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# (로그 파일명, 로그 엔트리) - error_log_writer.QueuedRecord 와 동일한 형태
+QueuedRecord = Tuple[str, dict]
+Fingerprint = Tuple[str, str, Optional[int], str]
+
+
+def fingerprint_of(log_entry: dict) -> Fingerprint:
+    whep_url = log_entry.get("whepUrl") or ""
+    host = urlsplit(whep_url).netloc.lower() if whep_url else ""
+    return (
+        log_entry.get("streamId", ""),
+        log_entry.get("errorType", ""),
+        log_entry.get("statusCode"),
+        host,
+    )
+
+
+class _Pending:
+    __slots__ = ("log_filename", "repeat", "opened_at")
+
+    def __init__(self, log_filename: str, opened_at: float):
+        self.log_filename = log_filename
+        # window 안에서 반복된 레코드를 합친 엔트리 (반복이 없으면 None)
+        self.repeat: Optional[dict] = None
+        self.opened_at = opened_at
+
+    def record(self) -> List[QueuedRecord]:
+        if self.repeat is None:
+            return []
+        return [(self.log_filename, self.repeat)]
+
+
+class ErrorFingerprintTable:
+    def __init__(self, window: float, max_entries: int = 10000):
+        self.window = window
+        self.max_entries = max_entries
+
+        # window 시작 순서 = 만료 순서 이므로 앞에서부터 꺼내면 됨
+        self._pending: "OrderedDict[Fingerprint, _Pending]" = OrderedDict()
+
+        self.coalesced_total = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, log_filename: str, log_entry: dict, now: float) -> List[QueuedRecord]:
+        """
+        레코드를 테이블에 반영하고, 바로 기록해야 할 레코드 목록을 반환
+
+        window의 첫 레코드와 비활성화 상태의 레코드는 그대로 반환하고,
+        테이블이 가득 찼으면 가장 오래된 항목의 반복 레코드도 함께 반환합니다.
+        """
+        if not self.enabled:
+            return [(log_filename, log_entry)]
+
+        key = fingerprint_of(log_entry)
+        pending = self._pending.get(key)
+        if pending is not None:
+            timestamp = log_entry.get("timestamp")
+            if pending.repeat is None:
+                repeat = dict(log_entry)
+                repeat["firstSeen"] = timestamp
+                repeat["lastSeen"] = timestamp
+                repeat["count"] = 1
+                pending.repeat = repeat
+            else:
+                pending.repeat["lastSeen"] = timestamp
+                pending.repeat["count"] += 1
+            self.coalesced_total += 1
+            return []
+
+        self._pending[key] = _Pending(log_filename, now)
+
+        flushed: List[QueuedRecord] = [(log_filename, log_entry)]
+        while len(self._pending) > self.max_entries:
+            _, oldest = self._pending.popitem(last=False)
+            flushed.extend(oldest.record())
+        return flushed
+
+    def expire(self, now: float) -> List[QueuedRecord]:
+        """window가 끝난 항목을 테이블에서 제거하고 반복 레코드를 기록 대상으로 반환"""
+        expired: List[QueuedRecord] = []
+        while self._pending:
+            pending = next(iter(self._pending.values()))
+            if pending.opened_at + self.window > now:
+                break
+            self._pending.popitem(last=False)
+            expired.extend(pending.record())
+        return expired
+
+    def next_expiry(self) -> Optional[float]:
+        if not self._pending:
+            return None
+        return next(iter(self._pending.values())).opened_at + self.window
+
+    def drain(self) -> List[QueuedRecord]:
+        """남은 항목의 반복 레코드를 전부 반환 (종료 시)"""
+        drained = [record for p in self._pending.values() for record in p.record()]
+        self._pending.clear()
+        return drained
+
+    def stats(self) -> dict:
+        return {
+            "window": self.window,
+            "pending": len(self._pending),
+            "maxEntries": self.max_entries,
+            "coalescedTotal": self.coalesced_total,
+        }
@@ -0,0 +1,528 @@
+"""
+MediaMTX 오류 로그 sidecar index
+
+날짜별 로그 파일(.jsonl / 압축 보관된 .jsonl.gz)마다 `<파일명>.idx` 를 두고, 레코드 하나당 한 줄씩
+[offset, length, timestamp(ms), count, streamId, errorType, statusCode] 를 기록합니다.
+
+- writer가 .jsonl에 append 할 때 같은 배치의 index 라인도 함께 append (incremental)
+- index가 없거나 .jsonl보다 뒤처진 파일은 조회 시점에 부족한 구간만 .jsonl에서 읽어 보충 (lazy rebuild)
+- 조회는 index만 보고 대상 레코드를 고른 뒤, 해당 offset만 seek 해서 읽음
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import heapq
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.services.error_log_reader import (
+    ARCHIVE_SUFFIX,
+    PlainLogSource,
+    group_by_day,
+    iter_lines_reversed,
+    list_log_files,
+    log_day_of,
+    open_log_source,
+    parse_timestamp_ms,
+)
+from app.services.json_codec import dumps, dumps_line, loads
+
+INDEX_SUFFIX = ".idx"
+
+# index가 아예 없는 파일은 이 시간(초) 이상 수정되지 않았을 때만 index 파일로 저장
+# (writer가 아직 쓰고 있을 수 있는 파일은 메모리에서만 index를 보충)
+INDEX_PERSIST_MIN_AGE = 600
+
+# (offset, length, timestamp_ms, count, streamId, errorType, statusCode)
+IndexEntry = Tuple[int, int, Optional[int], int, Optional[str], Optional[str], Optional[int]]
+
+
+def index_path_for(log_path: Path) -> Path:
+    return log_path.with_name(log_path.name + INDEX_SUFFIX)
+
+
+def make_index_entry(offset: int, length: int, log_entry: dict) -> IndexEntry:
+    return (
+        offset,
+        length,
+        parse_timestamp_ms(log_entry.get("timestamp")),
+        log_entry.get("count") or 1,
+        log_entry.get("streamId"),
+        log_entry.get("errorType"),
+        log_entry.get("statusCode"),
+    )
+
+
+def encode_index_entry(entry: IndexEntry) -> bytes:
+    return dumps_line(entry)
+
+
+def _decode_index_line(line: bytes) -> Optional[IndexEntry]:
+    try:
+        entry = loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, list) or len(entry) != 7:
+        return None
+    return tuple(entry)  # type: ignore[return-value]
+
+
+def scan_log_entries(source, start: int, end: Optional[int]) -> Iterator[IndexEntry]:
+    """
+    로그 source의 [start, end) 구간을 읽어 index 엔트리를 만듦
+
+    개행으로 끝나지 않은 마지막 조각(기록 중인 라인)과 파싱할 수 없는 라인은 건너뜁니다.
+    """
+    for offset, line in source.iter_lines(start, end):
+        if not line.strip():
+            continue
+        try:
+            log_entry = loads(line)
+        except ValueError:
+            continue
+        if isinstance(log_entry, dict):
+            yield make_index_entry(offset, len(line), log_entry)
+
+
+def _covered_size(idx_path: Path) -> int:
+    """index 파일이 커버하는 .jsonl 크기 (마지막 엔트리의 offset + length)"""
+    if not idx_path.exists():
+        return 0
+    for line in iter_lines_reversed(idx_path):
+        entry = _decode_index_line(line)
+        if entry is not None:
+            return entry[0] + entry[1]
+    return 0
+
+
+def catch_up_index_file(log_path: Path) -> None:
+    """
+    index 파일이 .jsonl보다 뒤처져 있으면 부족한 구간을 index 파일에 append
+
+    writer가 파일 핸들을 열 때 호출하므로, 이후 writer가 append 하는 index와 이어집니다.
+    """
+    if not log_path.exists():
+        return
+    idx_path = index_path_for(log_path)
+    size = log_path.stat().st_size
+    covered = _covered_size(idx_path)
+    if covered > size:
+        # .jsonl이 교체/잘린 경우 index를 처음부터 다시 만듦
+        idx_path.unlink(missing_ok=True)
+        covered = 0
+    if covered >= size:
+        return
+
+    with open(idx_path, 'ab') as idx:
+        idx.write(b"".join(encode_index_entry(e) for e in scan_log_entries(PlainLogSource(log_path), covered, size)))
+
+
+# ============================================
+# 조회용 in-memory index
+# ============================================
+
+class DayIndex:
+    """하나의 로그 파일에 대한 메모리 index (key → 엔트리 위치 목록)"""
+
+    def __init__(self, log_path: Path):
+        self.log_path = log_path
+        self.idx_path = index_path_for(log_path)
+        self.source = None
+        self.entries: List[IndexEntry] = []
+        self.by_stream: Dict[str, List[int]] = {}
+        self.by_type: Dict[str, List[int]] = {}
+        self.by_status: Dict[int, List[int]] = {}
+        # 엔트리의 timestamp가 offset 순서대로 증가하는지 (그러면 since로 시작 위치를 bisect)
+        self.ts_sorted = True
+
+        self.covered = 0  # .jsonl에서 index가 반영된 위치
+        self.idx_pos = 0  # .idx에서 읽은 위치
+        self.log_ino: Optional[int] = None
+        self.idx_ino: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _reset(self) -> None:
+        # 제자리에서 비우지 않고 새로 만듦 (match가 잡아둔 이전 목록은 그대로 유지)
+        self.entries = []
+        self.by_stream = {}
+        self.by_type = {}
+        self.by_status = {}
+        self.ts_sorted = True
+        self.covered = 0
+        self.idx_pos = 0
+
+    def _add(self, entry: IndexEntry) -> None:
+        pos = len(self.entries)
+        _, _, ts, _, stream_id, error_type, status_code = entry
+        if self.ts_sorted and (ts is None or (pos and ts < self.entries[-1][2])):
+            self.ts_sorted = False
+        self.entries.append(entry)
+        if stream_id is not None:
+            self.by_stream.setdefault(stream_id, []).append(pos)
+        if error_type is not None:
+            self.by_type.setdefault(error_type, []).append(pos)
+        if status_code is not None:
+            self.by_status.setdefault(status_code, []).append(pos)
+        self.covered = entry[0] + entry[1]
+
+    def refresh(self) -> None:
+        """.idx / 로그 파일에 새로 추가된 부분만 반영"""
+        with self._lock:
+            try:
+                log_stat = self.log_path.stat()
+            except FileNotFoundError:
+                self._reset()
+                return
+            idx_stat = self.idx_path.stat() if self.idx_path.exists() else None
+
+            if log_stat.st_ino != self.log_ino or (idx_stat and idx_stat.st_ino != self.idx_ino and self.idx_pos):
+                self._reset()
+                self.source = open_log_source(self.log_path)
+            self.log_ino = log_stat.st_ino
+            self.idx_ino = idx_stat.st_ino if idx_stat else None
+
+            # 압축 보관본은 크기가 압축 후 크기이므로 source 기준 크기로 비교
+            log_size = self.source.size()
+            if log_size == self.covered and (idx_stat is None or idx_stat.st_size == self.idx_pos):
+                return
+
+            if idx_stat is not None and idx_stat.st_size > self.idx_pos:
+                self._read_index_file()
+            if self.covered < log_size:
+                existed = idx_stat is not None
+                for entry in scan_log_entries(self.source, self.covered, log_size):
+                    self._add(entry)
+                if not existed and time.time() - log_stat.st_mtime >= INDEX_PERSIST_MIN_AGE:
+                    self._persist()
+
+    def _read_index_file(self) -> None:
+        with open(self.idx_path, 'rb') as idx:
+            idx.seek(self.idx_pos)
+            data = idx.read()
+        end = data.rfind(b"\n") + 1
+        self.idx_pos += end
+
+        for line in data[:end].splitlines():
+            entry = _decode_index_line(line)
+            if entry is None or entry[0] < self.covered:
+                continue
+            if entry[0] > self.covered:
+                # index에 빠진 구간은 로그 파일에서 보충
+                for gap_entry in scan_log_entries(self.source, self.covered, entry[0]):
+                    self._add(gap_entry)
+            self._add(entry)
+
+    def _persist(self) -> None:
+        """오래된 파일의 index를 새로 만든 경우 파일로 저장 (다음 조회부터 재사용)"""
+        tmp_path = self.idx_path.with_name(self.idx_path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(b"".join(encode_index_entry(e) for e in self.entries))
+        os.replace(tmp_path, self.idx_path)
+        idx_stat = self.idx_path.stat()
+        self.idx_ino = idx_stat.st_ino
+        self.idx_pos = idx_stat.st_size
+
+    def entry_at(self, offset: int) -> Optional[IndexEntry]:
+        """offset에서 시작하는 엔트리 (없으면 None)"""
+        with self._lock:
+            pos = bisect.bisect_left(self.entries, offset, key=itemgetter(0))
+            if pos < len(self.entries) and self.entries[pos][0] == offset:
+                return self.entries[pos]
+        return None
+
+    def entries_from(self, start: int) -> Tuple[List[IndexEntry], int]:
+        """offset이 start 이상인 엔트리와 현재 covered (rollup 증분 집계용, 엔트리 수가 아니라 새 부분에 비례)"""
+        with self._lock:
+            pos = bisect.bisect_left(self.entries, start, key=itemgetter(0))
+            return self.entries[pos:], self.covered
+
+    def match(
+        self,
+        stream_id: Optional[str] = None,
+        error_type: Optional[str] = None,
+        status_code: Optional[int] = None,
+        since_ms: Optional[int] = None,
+        until_ms: Optional[int] = None,
+        after_offset: int = -1,
+    ) -> Iterator[IndexEntry]:
+        """
+        조건에 맞는 엔트리를 offset 순서로 yield
+
+        시작 위치는 after_offset (timestamp가 정렬된 파일이면 since_ms도) 로 bisect 하므로
+        cursor로 페이지를 넘겨도 앞쪽 엔트리를 다시 훑지 않습니다.
+        """
+        # 목록은 append만 되고 _reset은 새 목록으로 바꾸므로, lock 안에서 목록과 길이만 잡아두면 됨
+        with self._lock:
+            entries = self.entries
+            count = len(entries)
+            ts_sorted = self.ts_sorted
+            postings = []
+            if stream_id is not None:
+                postings.append(self.by_stream.get(stream_id, []))
+            if error_type is not None:
+                postings.append(self.by_type.get(error_type, []))
+            if status_code is not None:
+                postings.append(self.by_status.get(status_code, []))
+            postings = [(posting, len(posting)) for posting in postings]
+
+        start = bisect.bisect_right(entries, after_offset, 0, count, key=itemgetter(0))
+        if ts_sorted and since_ms is not None:
+            start = max(start, bisect.bisect_left(entries, since_ms, 0, count, key=itemgetter(2)))
+
+        # 가장 짧은 posting list만 순회하고 나머지 조건은 엔트리에서 직접 확인
+        if postings:
+            posting, length = min(postings, key=itemgetter(1))
+            candidates = (posting[i] for i in range(bisect.bisect_left(posting, start, 0, length), length))
+        else:
+            candidates = range(start, count)
+
+        for pos in candidates:
+            entry = entries[pos]
+            _, _, ts, _, entry_stream, entry_type, entry_status = entry
+            if ts_sorted and until_ms is not None and ts > until_ms:
+                return
+            if stream_id is not None and entry_stream != stream_id:
+                continue
+            if error_type is not None and entry_type != error_type:
+                continue
+            if status_code is not None and entry_status != status_code:
+                continue
+            if since_ms is not None and (ts is None or ts < since_ms):
+                continue
+            if until_ms is not None and (ts is None or ts > until_ms):
+                continue
+            yield entry
+
+
+_index_cache: "OrderedDict[Path, DayIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_day_index(log_path: Path, max_cached: int = 31) -> DayIndex:
+    with _index_cache_lock:
+        day_index = _index_cache.get(log_path)
+        if day_index is None:
+            day_index = DayIndex(log_path)
+            _index_cache[log_path] = day_index
+        else:
+            _index_cache.move_to_end(log_path)
+        while len(_index_cache) > max_cached:
+            _index_cache.popitem(last=False)
+    day_index.refresh()
+    return day_index
+
+
+def forget_day_index(log_path: Path) -> None:
+    with _index_cache_lock:
+        _index_cache.pop(log_path, None)
+
+
+# ============================================
+# Query
+# ============================================
+
+class StaleCursor(ValueError):
+    """cursor가 가리키는 레코드가 더 이상 그 위치에 없음 (compaction 등으로 파일이 바뀜)"""
+
+
+# 파일명 → (마지막으로 반환한 레코드 offset, 그 레코드의 index 엔트리 checksum)
+CursorPositions = Dict[str, Tuple[int, Optional[int]]]
+
+
+def entry_checksum(entry: IndexEntry) -> int:
+    """offset을 제외한 index 엔트리 checksum (cursor 위치에 같은 레코드가 있는지 확인용)"""
+    return zlib.crc32(dumps(entry[1:]))
+
+
+def encode_cursor(day: str, positions: CursorPositions) -> str:
+    """다음 페이지 위치: 날짜 + 그 날짜의 파일별 마지막으로 반환한 레코드 (offset, checksum)"""
+    data = dumps({"day": day, "offsets": {name: list(position) for name, position in positions.items()}})
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, CursorPositions]:
+    """
+    cursor → (날짜, 파일명 → (offset, checksum)), 형식이 맞지 않으면 ValueError
+
+    이전 형식("파일명:offset", offset만 담은 JSON)도 허용합니다 (checksum 없음).
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    if not raw.startswith("{"):
+        log_filename, offset = raw.rsplit(":", 1)
+        date.fromisoformat(log_filename[:10])
+        return log_filename[:10], {log_filename: (int(offset), None)}
+
+    data = loads(raw)
+    day = data.get("day") if isinstance(data, dict) else None
+    offsets = data.get("offsets") if isinstance(data, dict) else None
+    if not isinstance(day, str) or not isinstance(offsets, dict):
+        raise ValueError("Malformed cursor")
+    date.fromisoformat(day)
+    positions: CursorPositions = {}
+    for name, position in offsets.items():
+        if isinstance(position, list):
+            offset, checksum = position
+            positions[str(name)] = (int(offset), int(checksum))
+        else:
+            positions[str(name)] = (int(position), None)
+    return day, positions
+
+
+def _resolve_cursor(day_indexes: Dict[str, DayIndex], positions: CursorPositions) -> Dict[str, int]:
+    """
+    cursor의 파일별 위치 → 현재 파일명 → offset
+
+    압축 보관(.jsonl → .jsonl.gz)은 offset이 그대로이므로 보관본에서 이어갑니다.
+    위치에 같은 레코드가 없으면 (compaction으로 shard가 합쳐지는 등) 이어갈 수 없으므로 StaleCursor.
+    cursor에 없는 파일(이후에 생긴 파일)은 처음부터 읽습니다.
+    """
+    after: Dict[str, int] = {}
+    for name, (offset, checksum) in positions.items():
+        candidates = [name]
+        if checksum is not None:
+            # 압축 보관본 이름은 .jsonl.gz 또는 .partN.jsonl.gz (같은 레코드가 같은 offset에 있는지로 확인)
+            candidates += [other for other in day_indexes if other.endswith(ARCHIVE_SUFFIX) and other != name]
+        for candidate in candidates:
+            day_index = day_indexes.get(candidate)
+            if day_index is None or candidate in after:
+                continue
+            entry = day_index.entry_at(offset)
+            if entry is not None and (checksum is None or entry_checksum(entry) == checksum):
+                after[candidate] = offset
+                break
+        else:
+            raise StaleCursor("Cursor no longer matches the log files (restart the query)")
+    return after
+
+
+def _candidate_files(log_dir: Path, since: Optional[datetime], until: Optional[datetime]) -> List[Path]:
+    """
+    조회 기간에 걸치는 로그 파일 (오래된 날짜 먼저, 압축 보관본 포함)
+
+    파일명 날짜는 클라이언트 timestamp 기준이므로 timezone 차이를 감안해 앞뒤로 하루씩 여유를 둡니다.
+    """
+    first_day = (since - timedelta(days=1)).date().isoformat() if since else None
+    last_day = (until + timedelta(days=1)).date().isoformat() if until else None
+
+    files = []
+    for log_file in list_log_files(log_dir, newest_first=False):
+        day = log_day_of(log_file)
+        if first_day and day < first_day:
+            continue
+        if last_day and day > last_day:
+            continue
+        files.append(log_file)
+    return files
+
+
+def _tagged(log_file: Path, source, matches: Iterator[IndexEntry]) -> Iterator[Tuple[Path, object, IndexEntry]]:
+    for entry in matches:
+        yield log_file, source, entry
+
+
+def _merge_key(item: Tuple[Path, object, IndexEntry]) -> int:
+    ts = item[2][2]
+    return ts if ts is not None else 0
+
+
+def _read_page(page: List[Tuple[object, int, int]]) -> List[dict]:
+    """(source, offset, length) 목록을 순서대로 읽어 파싱 (파일마다 한 번만 열어서 읽음)"""
+    by_source: Dict[int, Tuple[object, List[int]]] = {}
+    for i, (source, _, _) in enumerate(page):
+        by_source.setdefault(id(source), (source, []))[1].append(i)
+
+    records: List[bytes] = [b""] * len(page)
+    for source, positions in by_source.values():
+        for i, data in zip(positions, source.read_ranges([page[i][1:] for i in positions])):
+            records[i] = data
+
+    logs = []
+    for data in records:
+        try:
+            logs.append(loads(data))
+        except ValueError:
+            continue
+    return logs
+
+
+def query_logs(
+    log_dir: Path,
+    stream_id: Optional[str] = None,
+    error_type: Optional[str] = None,
+    status_code: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    조건에 맞는 로그를 날짜 순으로 최대 limit개 반환
+
+    한 날짜에 파일이 여러 개면 (worker별 shard 등) 파일마다 index 조회 결과를 timestamp 기준으로
+    k-way merge 합니다. 파일이 하나면 파일 내 기록 순서 그대로입니다.
+
+    다음 페이지가 있으면 next cursor를 함께 반환합니다. cursor 이후 그 날짜의 파일이 compaction 으로
+    바뀌었으면 StaleCursor (압축 보관으로 이름만 바뀐 경우는 그대로 이어감).
+    압축 보관된 파일은 대상 레코드가 들어있는 블록만 압축 해제합니다.
+    """
+    since_ms = _to_ms(since)
+    until_ms = _to_ms(until)
+    cursor_day = None
+    cursor_positions: CursorPositions = {}
+    if cursor:
+        cursor_day, cursor_positions = decode_cursor(cursor)
+
+    # 페이지에 들어갈 레코드 위치 (source, offset, length) - 다 고른 뒤 파일별로 한 번에 읽음
+    page: List[Tuple[object, int, int]] = []
+    if not log_dir.exists():
+        return [], None
+
+    for day_files in group_by_day(_candidate_files(log_dir, since, until)):
+        day = log_day_of(day_files[0])
+        if cursor_day and day < cursor_day:
+            continue
+
+        day_indexes = {log_file.name: get_day_index(log_file) for log_file in day_files}
+        positions = cursor_positions if day == cursor_day else {}
+        after = _resolve_cursor(day_indexes, positions) if positions else {}
+
+        streams = []
+        for log_file in day_files:
+            day_index = day_indexes[log_file.name]
+            matches = day_index.match(
+                stream_id, error_type, status_code, since_ms, until_ms, after.get(log_file.name, -1)
+            )
+            streams.append(_tagged(log_file, day_index.source, matches))
+        merged = streams[0] if len(streams) == 1 else heapq.merge(*streams, key=_merge_key)
+
+        # 이 날짜에서 파일별로 마지막으로 반환한 레코드 (다음 페이지 cursor)
+        consumed: CursorPositions = {
+            name: (offset, entry_checksum(day_indexes[name].entry_at(offset)))
+            for name, offset in after.items()
+        }
+        for log_file, source, entry in merged:
+            if len(page) >= limit:
+                # 한 건 더 있으므로 다음 페이지 cursor 반환 (마지막으로 반환한 레코드 기준)
+                return _read_page(page), encode_cursor(day, consumed)
+            consumed[log_file.name] = (entry[0], entry_checksum(entry))
+            page.append((source, entry[0], entry[1]))
+
+    return _read_page(page), None
+
+
+def _to_ms(dt: Optional[datetime]) -> Optional[int]:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
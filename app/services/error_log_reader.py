@@ -0,0 +1,239 @@
+"""
+MediaMTX 오류 로그 reader
+
+날짜별 로그 파일(.jsonl)과 압축 보관된 파일(.jsonl.gz)을 같은 방식으로 읽기 위한 source 추상화와,
+파일을 끝에서부터 블록 단위로 거꾸로 읽어 최신 레코드부터 꺼내는 reader를 제공합니다.
+필요한 만큼만 읽기 때문에 비용이 파일 크기가 아니라 limit에 비례합니다.
+
+source 공통 인터페이스 (offset은 모두 압축 전 .jsonl 기준)
+- size(): 전체 크기
+- read_range(offset, length): 구간 읽기
+- read_ranges(ranges): 여러 구간을 파일을 한 번만 열어서 읽기 (offset 순서)
+- iter_lines(start, end): (offset, line) 을 앞에서부터
+- iter_lines_reversed(): line 을 뒤에서부터
+
+한 날짜에 파일이 여러 개면 (worker별 shard, 압축 보관본 + 늦게 들어온 로그) 각 파일을 거꾸로 읽으면서
+timestamp 기준 k-way heap merge로 합칩니다 (파일마다 필요한 만큼만 읽음).
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from app.services.metrics import (
+    error_log_latest_files_total,
+    error_log_latest_read_seconds,
+    error_log_latest_reads_total,
+    error_log_latest_records_total,
+    error_log_latest_skipped_lines_total,
+)
+from app.services.json_codec import loads
+from app.services.profiling import add_phase
+
+REVERSE_READ_BLOCK_SIZE = 64 * 1024
+
+LOG_SUFFIX = ".jsonl"
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+
+def iter_lines_reversed(path: Path, block_size: int = REVERSE_READ_BLOCK_SIZE) -> Iterator[bytes]:
+    """
+    파일의 라인을 마지막 라인부터 거꾸로 yield (빈 라인 제외)
+
+    writer가 아직 기록 중인 마지막 라인(개행으로 끝나지 않은 조각)은 건너뜁니다.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        trailing = True
+
+        while pos > 0:
+            read_size = min(block_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            block = f.read(read_size) + tail
+
+            lines = block.split(b"\n")
+            if trailing:
+                # 마지막 개행 뒤의 조각은 아직 기록 중인 라인 (블록보다 길면 여러 블록에 걸쳐 있음)
+                if len(lines) == 1:
+                    continue
+                lines.pop()
+                trailing = False
+            # 맨 앞 조각은 이전 블록과 이어질 수 있으므로 보관
+            tail = lines.pop(0) if lines else b""
+
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+
+        if tail.strip():
+            yield tail
+
+
+class PlainLogSource:
+    """압축되지 않은 .jsonl 파일"""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def read_ranges(self, ranges: Iterable[Tuple[int, int]]) -> List[bytes]:
+        parts = []
+        with open(self.path, 'rb') as f:
+            for offset, length in ranges:
+                f.seek(offset)
+                parts.append(f.read(length))
+        return parts
+
+    def iter_lines(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+        """[start, end) 구간의 완성된 라인(개행 포함)을 offset과 함께 yield"""
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            while end is None or offset < end:
+                line = f.readline()
+                if not line or not line.endswith(b"\n"):
+                    return
+                yield offset, line
+                offset += len(line)
+
+    def iter_lines_reversed(self) -> Iterator[bytes]:
+        return iter_lines_reversed(self.path)
+
+
+def is_log_file(path: Path) -> bool:
+    return path.name.endswith(LOG_SUFFIX) or path.name.endswith(ARCHIVE_SUFFIX)
+
+
+def open_log_source(path: Path):
+    """파일 종류(.jsonl / .jsonl.gz)에 맞는 source 반환"""
+    if path.name.endswith(ARCHIVE_SUFFIX):
+        from app.services.error_log_archive import ArchivedLogSource
+
+        return ArchivedLogSource(path)
+    return PlainLogSource(path)
+
+
+def log_day_of(path: Path) -> str:
+    """로그 파일명 → 날짜 (YYYY-MM-DD)"""
+    return path.name[:10]
+
+
+def log_file_sort_key(path: Path) -> Tuple[str, int, str]:
+    """같은 날짜 안에서는 압축 보관본(먼저 기록된 부분) → 일반 파일 순서"""
+    return (log_day_of(path), 1 if path.name.endswith(LOG_SUFFIX) else 0, path.name)
+
+
+def list_log_files(log_dir: Path, newest_first: bool = True) -> List[Path]:
+    """날짜별 로그 파일 목록 (.jsonl + .jsonl.gz, 기본은 최신 날짜 먼저)"""
+    files = list(log_dir.glob("*" + LOG_SUFFIX)) + list(log_dir.glob("*" + ARCHIVE_SUFFIX))
+    return sorted(files, key=log_file_sort_key, reverse=newest_first)
+
+
+def group_by_day(log_files: List[Path]) -> List[List[Path]]:
+    """list_log_files 결과를 날짜별 목록으로 묶음 (순서 유지)"""
+    return [list(files) for _, files in itertools.groupby(log_files, key=log_day_of)]
+
+
+def parse_timestamp_ms(timestamp: Optional[str]) -> Optional[int]:
+    """ISO 8601 timestamp → epoch milliseconds (timezone이 없으면 UTC로 간주)"""
+    if not timestamp:
+        return None
+    try:
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def _merge_key(item: Tuple[bytes, object]) -> int:
+    entry = item[1]
+    ts = parse_timestamp_ms(entry.get("timestamp")) if isinstance(entry, dict) else None
+    return ts if ts is not None else 0
+
+
+def _parsed_reversed(log_file: Path, skipped: List[int]) -> Iterator[Tuple[bytes, object]]:
+    for line in open_log_source(log_file).iter_lines_reversed():
+        try:
+            yield line, loads(line)
+        except ValueError:
+            skipped[0] += 1
+
+
+def iter_day_reversed(day_files: List[Path], skipped: List[int]) -> Iterator[Tuple[bytes, object]]:
+    """
+    한 날짜의 (라인, 파싱 결과)를 최신 것부터 yield (파싱할 수 없는 라인은 skipped[0]에 세고 건너뜀)
+
+    파일이 여러 개면 timestamp 기준으로 merge 합니다. 각 파일 안의 순서(기록 순서)는 그대로 유지되므로
+    timestamp가 뒤섞인 레코드가 있으면 결과도 완전한 정렬은 아닙니다.
+    """
+    streams = [_parsed_reversed(log_file, skipped) for log_file in day_files]
+    if len(streams) == 1:
+        return streams[0]
+    return heapq.merge(*streams, key=_merge_key, reverse=True)
+
+
+def read_latest(log_dir: Path, limit: int) -> List[dict]:
+    """
+    최신 로그부터 최대 limit개 반환
+
+    최신 날짜 파일의 끝에서부터 읽고, 부족할 때만 이전 날짜로 넘어갑니다.
+    같은 날짜의 파일(shard 등)은 timestamp 기준으로 merge 합니다.
+    압축 보관된 파일도 뒤쪽 블록부터 필요한 만큼만 풀어서 읽습니다.
+    파싱할 수 없는 라인(손상된 라인)은 건너뜁니다.
+    """
+    return [entry for _, entry in _read_latest(log_dir, limit)]
+
+
+def read_latest_raw(log_dir: Path, limit: int) -> List[bytes]:
+    """
+    read_latest와 같은 레코드를 파일에 저장된 라인(JSON bytes) 그대로 반환
+
+    응답에 다시 인코딩하지 않고 넣기 위한 용도입니다. 손상된 라인을 걸러내기 위해 파싱은 하지만
+    파싱 결과는 버립니다.
+    """
+    return [line for line, _ in _read_latest(log_dir, limit)]
+
+
+def _read_latest(log_dir: Path, limit: int) -> List[Tuple[bytes, object]]:
+    records: List[Tuple[bytes, object]] = []
+    if limit <= 0 or not log_dir.exists():
+        return records
+
+    started = time.perf_counter()
+    files = 0
+    skipped = [0]
+    try:
+        for day_files in group_by_day(list_log_files(log_dir)):
+            files += len(day_files)
+            for record in iter_day_reversed(day_files, skipped):
+                records.append(record)
+                if len(records) >= limit:
+                    return records
+        return records
+    finally:
+        error_log_latest_reads_total.inc()
+        error_log_latest_records_total.inc(amount=len(records))
+        error_log_latest_files_total.inc(amount=files)
+        if skipped[0]:
+            error_log_latest_skipped_lines_total.inc(amount=skipped[0])
+        elapsed = time.perf_counter() - started
+        error_log_latest_read_seconds.observe(elapsed)
+        add_phase("io", elapsed)
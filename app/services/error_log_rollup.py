@@ -0,0 +1,303 @@
+"""
+MediaMTX 오류 로그 분 단위 rollup
+
+writer가 기록한 레코드를 (분, streamId, errorType) 별 카운터로 누적합니다.
+통계 조회는 원본 로그가 아니라 이 카운터만 보기 때문에 로그 양과 관계없이 일정한 비용으로 응답합니다.
+
+- 날짜별 로그 파일 단위로 카운터를 관리하고, 주기적으로 snapshot 파일로 저장
+- snapshot에는 카운터가 반영된 .jsonl 위치(covered)를 함께 저장
+- 기동 시 snapshot을 읽고, snapshot 이후에 추가된 부분만 index/.jsonl에서 다시 집계
+- sharded 모드(worker 여러 개)에서는 writer listener 대신 조회 시점에 로그 디렉토리를 따라가며
+  (최대 refresh_interval 마다) 모든 worker의 shard에 추가된 부분을 index에서 집계
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.error_log_index import IndexEntry, get_day_index
+from app.services.error_log_reader import list_log_files, open_log_source
+
+# (streamId, errorType)
+RollupKey = Tuple[str, str]
+
+
+class _DayRollup:
+    __slots__ = ("counts", "covered", "dirty", "ino")
+
+    def __init__(self):
+        # 분(epoch minute) → (streamId, errorType) → count
+        self.counts: Dict[int, Dict[RollupKey, int]] = {}
+        self.covered = 0
+        self.dirty = False
+        # 파일을 따라가는 모드에서만: 집계한 로그 파일의 inode (compaction 으로 교체되면 다시 집계)
+        self.ino: Optional[int] = None
+
+    def add(self, entries: Iterable[IndexEntry]) -> None:
+        for _, _, ts, count, stream_id, error_type, _ in entries:
+            if ts is None:
+                continue
+            minute = self.counts.setdefault(ts // 60000, {})
+            key = (stream_id or "", error_type or "")
+            minute[key] = minute.get(key, 0) + count
+        self.dirty = True
+
+
+DAY_MS = 86400 * 1000
+# datetime으로 표현할 수 있는 범위 (기간을 열어두고 조회하는 경우)
+_MAX_MS = int(datetime(9999, 12, 31, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _day_of_ms(ms: int) -> str:
+    """epoch milliseconds → 날짜 (YYYY-MM-DD, UTC)"""
+    ms = min(max(ms, 0), _MAX_MS)
+    return datetime.fromtimestamp(ms / 1000, timezone.utc).date().isoformat()
+
+
+def _minutes_in(counts: Dict[int, Dict[RollupKey, int]], since_min: int, until_min: int) -> Iterator[Tuple[int, Dict[RollupKey, int]]]:
+    """[since_min, until_min] 범위의 (분, 카운터) - 범위와 하루치 카운터 중 작은 쪽만 순회"""
+    if until_min - since_min + 1 < len(counts):
+        for minute in range(since_min, until_min + 1):
+            counters = counts.get(minute)
+            if counters is not None:
+                yield minute, counters
+    else:
+        for minute, counters in counts.items():
+            if since_min <= minute <= until_min:
+                yield minute, counters
+
+
+class ErrorLogRollup:
+    def __init__(
+        self,
+        log_dir: Path,
+        rollup_dir: Path,
+        snapshot_interval: float = 60.0,
+        follow_files: bool = False,
+        refresh_interval: float = 1.0,
+    ):
+        self.log_dir = log_dir
+        self.rollup_dir = rollup_dir
+        self.snapshot_interval = snapshot_interval
+        self.follow_files = follow_files
+        self.refresh_interval = refresh_interval
+
+        # 로그 파일명 → 카운터
+        self._days: Dict[str, _DayRollup] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshed_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls) -> "ErrorLogRollup":
+        return cls(
+            log_dir=Path(settings.ERROR_LOG_DIR),
+            rollup_dir=Path(settings.ERROR_LOG_ROLLUP_DIR),
+            snapshot_interval=settings.ERROR_LOG_ROLLUP_SNAPSHOT_INTERVAL,
+            follow_files=settings.ERROR_LOG_WRITE_MODE == "sharded",
+        )
+
+    def snapshot_path(self, log_filename: str) -> Path:
+        return self.rollup_dir / f"{log_filename}.json"
+
+    # ============================================
+    # 집계
+    # ============================================
+
+    def on_written(self, log_filename: str, entries: List[IndexEntry], end_offset: int) -> None:
+        """writer listener: 기록된 배치를 카운터에 반영"""
+        with self._lock:
+            day = self._days.get(log_filename)
+            if day is None:
+                day = self._days[log_filename] = _DayRollup()
+            day.add(entries)
+            day.covered = end_offset
+
+    def rename(self, old_filename: str, new_filename: str) -> None:
+        """로그 파일이 압축 보관되어 이름이 바뀌었을 때 카운터를 새 이름으로 옮김"""
+        with self._lock:
+            day = self._days.pop(old_filename, None)
+            if day is not None:
+                self._days[new_filename] = day
+
+    def drop(self, log_filename: str) -> None:
+        """로그 파일이 삭제될 때 카운터와 snapshot도 함께 제거"""
+        with self._lock:
+            self._days.pop(log_filename, None)
+        self.snapshot_path(log_filename).unlink(missing_ok=True)
+
+    def query(
+        self,
+        since_ms: int,
+        until_ms: int,
+        stream_ids: Optional[set] = None,
+        error_type: Optional[str] = None,
+    ) -> Dict[Tuple[int, str, str], int]:
+        """
+        기간 내 분 단위 카운터를 (분, streamId, errorType) → count 로 반환
+
+        비용은 기간 내 분 수 × 분당 key 수에 비례하며 원본 로그 양(보관된 날짜 수)과는 무관합니다.
+        기간에 걸치는 날짜의 카운터만 봅니다 (파일명 날짜는 클라이언트 timestamp 기준이므로 앞뒤로 하루씩 여유).
+        """
+        if self.follow_files and time.monotonic() - self._refreshed_at >= self.refresh_interval:
+            self.refresh()
+
+        since_min = since_ms // 60000
+        until_min = until_ms // 60000
+        first_day = _day_of_ms(since_ms - DAY_MS)
+        last_day = _day_of_ms(until_ms + DAY_MS)
+        result: Dict[Tuple[int, str, str], int] = {}
+
+        with self._lock:
+            for log_filename, day in self._days.items():
+                if not first_day <= log_filename[:10] <= last_day:
+                    continue
+                for minute, counters in _minutes_in(day.counts, since_min, until_min):
+                    for (stream_id, entry_type), count in counters.items():
+                        if stream_ids is not None and stream_id not in stream_ids:
+                            continue
+                        if error_type is not None and entry_type != error_type:
+                            continue
+                        key = (minute, stream_id, entry_type)
+                        result[key] = result.get(key, 0) + count
+        return result
+
+    # ============================================
+    # Snapshot
+    # ============================================
+
+    def load(self) -> None:
+        """snapshot을 읽고, snapshot 이후에 추가된 로그만 index에서 다시 집계"""
+        if not self.log_dir.exists():
+            return
+
+        for log_path in list_log_files(self.log_dir, newest_first=False):
+            try:
+                day = self._catch_up(log_path, self._read_snapshot(log_path.name))
+            except FileNotFoundError:
+                continue
+            with self._lock:
+                self._days[log_path.name] = day
+        self._refreshed_at = time.monotonic()
+
+    def refresh(self) -> None:
+        """
+        로그 디렉토리 기준으로 카운터를 맞춤 (파일을 따라가는 모드)
+
+        다른 worker가 shard에 추가한 부분만 index에서 집계하고, 교체된 파일은 처음부터 다시,
+        사라진 파일(compaction / 보관 기간 정리)의 카운터는 버립니다.
+        """
+        with self._refresh_lock:
+            present = set()
+            if self.log_dir.exists():
+                for log_path in list_log_files(self.log_dir, newest_first=False):
+                    with self._lock:
+                        day = self._days.get(log_path.name)
+                    try:
+                        day = self._catch_up(log_path, day)
+                    except FileNotFoundError:
+                        continue
+                    present.add(log_path.name)
+                    with self._lock:
+                        self._days[log_path.name] = day
+            with self._lock:
+                for log_filename in set(self._days) - present:
+                    del self._days[log_filename]
+            self._refreshed_at = time.monotonic()
+
+    def _catch_up(self, log_path: Path, day: Optional[_DayRollup]) -> _DayRollup:
+        """day(이미 집계된 카운터, 없으면 None) 이후에 추가된 부분을 index에서 집계"""
+        ino = log_path.stat().st_ino if self.follow_files else None
+        size = open_log_source(log_path).size()
+        if day is None or day.covered > size or (day.ino is not None and day.ino != ino):
+            day = _DayRollup()
+        day.ino = ino
+
+        if day.covered < size:
+            entries, covered = get_day_index(log_path).entries_from(day.covered)
+            # 조회 중인 카운터를 바꾸므로 lock 안에서
+            with self._lock:
+                day.add(entries)
+                day.covered = covered
+        return day
+
+    def _read_snapshot(self, log_filename: str) -> Optional[_DayRollup]:
+        path = self.snapshot_path(log_filename)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        day = _DayRollup()
+        day.covered = data.get("covered", 0)
+        day.ino = data.get("ino")
+        for minute, stream_id, error_type, count in data.get("counts", []):
+            day.counts.setdefault(minute, {})[(stream_id, error_type)] = count
+        return day
+
+    def save_dirty(self) -> None:
+        """변경된 날짜의 카운터만 snapshot 파일로 저장"""
+        with self._lock:
+            snapshots = []
+            for log_filename, day in self._days.items():
+                if not day.dirty:
+                    continue
+                snapshots.append((log_filename, {
+                    "logFile": log_filename,
+                    "covered": day.covered,
+                    "ino": day.ino,
+                    "counts": [
+                        [minute, stream_id, error_type, count]
+                        for minute, counters in day.counts.items()
+                        for (stream_id, error_type), count in counters.items()
+                    ],
+                }))
+                day.dirty = False
+
+        if not snapshots:
+            return
+        self.rollup_dir.mkdir(parents=True, exist_ok=True)
+        for log_filename, data in snapshots:
+            path = self.snapshot_path(log_filename)
+            # worker 여러 개가 같은 snapshot을 저장할 수 있으므로 임시 파일은 프로세스별로
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self.load)
+        self._task = asyncio.create_task(self._run(), name="error-log-rollup")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.save_dirty)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await asyncio.to_thread(self.save_dirty)
+            except Exception as e:  # pragma: no cover - 디스크 오류 등
+                print(f"[error-log-rollup] Failed to save snapshot: {e}")
+
+
+error_log_rollup = ErrorLogRollup.from_settings()
@@ -0,0 +1,308 @@
+"""
+MediaMTX 오류 로그 worker별 shard (uvicorn --workers 여러 개로 실행할 때)
+
+ERROR_LOG_WRITE_MODE=sharded 이면 worker마다 자기 shard 파일(YYYY-MM-DD.wN.jsonl)에만 기록합니다.
+여러 프로세스가 같은 .jsonl에 append 하면 큰 레코드가 섞이거나 잘리고, writer가 tell()로 계산한
+sidecar index offset도 틀어지기 때문입니다.
+
+- shard 번호 N: log_dir/.shards/wN.lock 에 flock을 잡은 번호 (worker가 재시작되면 빈 번호를 재사용)
+- 조회: 같은 날짜의 파일들을 timestamp 기준 k-way heap merge (error_log_reader / error_log_index)
+- compaction: 지난 날짜의 shard들을 timestamp 순서로 합쳐 YYYY-MM-DD.jsonl 하나로 만듦
+  (이후 압축 보관은 기존과 동일하게 error_log_archive 가 처리)
+
+writer는 shard에 기록하는 동안 공유 flock을 잡고, compaction은 배타 flock을 잡은 뒤 크기가 그대로인
+경우에만 교체합니다. 교체된(삭제된) shard에 기록하려던 writer는 같은 이름으로 새 shard를 열어 기록하고,
+그 파일은 다음 compaction에서 다시 합쳐집니다.
+
+사용법 (서버 외부에서 1회 실행):
+    python -m app.services.error_log_shards
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from operator import itemgetter
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from app.core.config import settings
+from app.services.error_log_index import (
+    encode_index_entry,
+    forget_day_index,
+    index_path_for,
+    make_index_entry,
+)
+from app.services.error_log_reader import LOG_SUFFIX, PlainLogSource, log_day_of, parse_timestamp_ms
+from app.services.json_codec import loads
+
+WRITE_MODES = ("single", "sharded")
+
+# lock 파일을 두는 하위 디렉토리 (로그 파일 목록 / 용량 계산에 섞이지 않도록)
+SHARD_DIR = ".shards"
+
+# 마지막 기록 후 이 시간(초)이 지난 날짜만 compaction (늦게 들어오는 로그를 감안)
+COMPACT_MIN_IDLE = 3600
+
+COMPACT_TMP_SUFFIX = ".compact.tmp"
+
+_SHARD_NAME = re.compile(r"^\d{4}-\d{2}-\d{2}\.w(\d+)" + re.escape(LOG_SUFFIX) + "$")
+
+
+def shard_filename(log_filename: str, shard: int) -> str:
+    """YYYY-MM-DD.jsonl → YYYY-MM-DD.wN.jsonl"""
+    return f"{log_filename[:-len(LOG_SUFFIX)]}.w{shard}{LOG_SUFFIX}"
+
+
+def is_shard_file(path: Path) -> bool:
+    return _SHARD_NAME.match(path.name) is not None
+
+
+def _require_fcntl() -> None:
+    if fcntl is None:
+        raise RuntimeError("Sharded error log writes require fcntl (POSIX)")
+
+
+def lock_shared(f: BinaryIO) -> None:
+    fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+
+
+def unlock(f: BinaryIO) -> None:
+    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class ShardLease:
+    """
+    프로세스가 쓸 shard 번호
+
+    .shards/wN.lock 중 flock을 잡을 수 있는 가장 작은 N을 사용합니다.
+    lock은 프로세스가 끝나면 OS가 풀어주므로 죽은 worker의 번호도 다시 쓰입니다.
+    """
+
+    def __init__(self, log_dir: Path, max_shards: int = 1024):
+        self.log_dir = log_dir
+        self.max_shards = max_shards
+        self.number: Optional[int] = None
+        self._file: Optional[BinaryIO] = None
+
+    def acquire(self) -> int:
+        if self.number is not None:
+            return self.number
+        _require_fcntl()
+        lock_dir = self.log_dir / SHARD_DIR
+        lock_dir.mkdir(parents=True, exist_ok=True)
+        for n in range(self.max_shards):
+            f = open(lock_dir / f"w{n}.lock", 'ab')
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                f.close()
+                continue
+            self._file = f
+            self.number = n
+            return n
+        raise RuntimeError(f"No free error log shard (max {self.max_shards})")
+
+    def release(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self.number = None
+
+
+@contextmanager
+def maintenance_lock(log_dir: Path) -> Iterator[bool]:
+    """
+    로그 디렉토리 정리 작업(compaction, 압축 보관) 중복 실행 방지
+
+    worker마다 같은 background task가 돌기 때문에 한 프로세스만 실행하도록 합니다.
+    다른 프로세스가 실행 중이면 False를 yield 합니다 (이번 회차는 건너뜀).
+    """
+    if fcntl is None:
+        yield True
+        return
+    lock_dir = log_dir / SHARD_DIR
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    with open(lock_dir / "maintenance.lock", 'ab') as f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+
+
+# ============================================
+# Compaction
+# ============================================
+
+def _iter_records(log_path: Path, end: int) -> Iterator[Tuple[int, bytes, object]]:
+    """(timestamp ms, 라인, 파싱 결과) - 파싱할 수 없는 라인은 버림"""
+    for _, line in PlainLogSource(log_path).iter_lines(0, end):
+        if not line.strip():
+            continue
+        try:
+            log_entry = loads(line)
+        except ValueError:
+            continue
+        ts = parse_timestamp_ms(log_entry.get("timestamp")) if isinstance(log_entry, dict) else None
+        yield (ts if ts is not None else 0), line, log_entry
+
+
+def compact_day(log_dir: Path, day: str, rollup_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    한 날짜의 shard (+ 기존 YYYY-MM-DD.jsonl) 를 timestamp 순서로 합쳐 YYYY-MM-DD.jsonl 로 교체
+
+    합치는 동안 shard가 커졌거나 사라졌으면 교체하지 않고 None을 반환합니다 (다음 실행 때 다시 시도).
+    sidecar index는 합친 파일 기준으로 새로 만들고, 원본들의 rollup snapshot은 지웁니다.
+    """
+    _require_fcntl()
+    target = log_dir / f"{day}{LOG_SUFFIX}"
+    shards = sorted(p for p in log_dir.glob(f"{day}.w*{LOG_SUFFIX}") if is_shard_file(p))
+    if not shards:
+        return None
+    sources = shards + ([target] if target.exists() else [])
+    try:
+        sizes = [p.stat().st_size for p in sources]
+    except FileNotFoundError:
+        return None
+
+    tmp_path = target.with_name(target.name + COMPACT_TMP_SUFFIX)
+    idx_path = index_path_for(target)
+    idx_tmp_path = idx_path.with_name(idx_path.name + COMPACT_TMP_SUFFIX)
+
+    streams = [_iter_records(p, size) for p, size in zip(sources, sizes)]
+    offset = 0
+    with open(tmp_path, 'wb') as dst, open(idx_tmp_path, 'wb') as idx:
+        for _, line, log_entry in heapq.merge(*streams, key=itemgetter(0)):
+            dst.write(line)
+            if isinstance(log_entry, dict):
+                idx.write(encode_index_entry(make_index_entry(offset, len(line), log_entry)))
+            offset += len(line)
+        dst.flush()
+        os.fsync(dst.fileno())
+
+    locked: List[BinaryIO] = []
+    try:
+        # writer는 기록하는 동안 공유 lock을 잡으므로, 배타 lock을 잡으면 진행 중인 기록이 끝난 상태
+        for p, size in zip(sources, sizes):
+            f = open(p, 'rb')
+            locked.append(f)
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            st = os.fstat(f.fileno())
+            if st.st_size != size or st.st_nlink == 0:
+                raise FileNotFoundError(p)
+
+        os.replace(idx_tmp_path, idx_path)
+        os.replace(tmp_path, target)
+        for p in shards:
+            index_path_for(p).unlink(missing_ok=True)
+            p.unlink(missing_ok=True)
+    except FileNotFoundError:
+        tmp_path.unlink(missing_ok=True)
+        idx_tmp_path.unlink(missing_ok=True)
+        return None
+    finally:
+        # close 하면 flock도 풀림 → 대기 중이던 writer는 삭제된 shard임을 확인하고 새로 엶
+        for f in locked:
+            f.close()
+
+    for p in sources:
+        forget_day_index(p)
+        if rollup_dir is not None:
+            (rollup_dir / f"{p.name}.json").unlink(missing_ok=True)
+    return target
+
+
+def closed_shard_days(log_dir: Path, now: Optional[float] = None) -> List[str]:
+    """compaction 대상: 오늘(UTC) 이전 날짜이면서 모든 shard가 한동안 수정되지 않은 날짜"""
+    now = time.time() if now is None else now
+    today = datetime.fromtimestamp(now, timezone.utc).date().isoformat()
+    latest_mtime = {}
+    for log_path in log_dir.glob("*" + LOG_SUFFIX):
+        if not is_shard_file(log_path):
+            continue
+        day = log_day_of(log_path)
+        try:
+            mtime = log_path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        latest_mtime[day] = max(latest_mtime.get(day, 0.0), mtime)
+    return sorted(
+        day for day, mtime in latest_mtime.items()
+        if day < today and now - mtime >= COMPACT_MIN_IDLE
+    )
+
+
+class ErrorLogCompactor:
+    """주기적으로 지난 날짜의 shard를 합치는 background task (sharded 모드에서만 기동)"""
+
+    def __init__(self, log_dir: Path, rollup_dir: Path, interval: float = 3600.0):
+        self.log_dir = log_dir
+        self.rollup_dir = rollup_dir
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+        self.compacted_total = 0
+        self.last_run_at: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls) -> "ErrorLogCompactor":
+        return cls(
+            log_dir=Path(settings.ERROR_LOG_DIR),
+            rollup_dir=Path(settings.ERROR_LOG_ROLLUP_DIR),
+            interval=settings.ERROR_LOG_COMPACT_INTERVAL,
+        )
+
+    def run_once(self) -> List[Path]:
+        compacted = []
+        if not self.log_dir.exists():
+            return compacted
+        with maintenance_lock(self.log_dir) as acquired:
+            if not acquired:
+                return compacted
+            for day in closed_shard_days(self.log_dir):
+                target = compact_day(self.log_dir, day, self.rollup_dir)
+                if target is not None:
+                    compacted.append(target)
+        self.compacted_total += len(compacted)
+        self.last_run_at = time.time()
+        return compacted
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="error-log-compactor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:  # pragma: no cover - 디스크 오류 등
+                print(f"[error-log-compactor] Failed to compact shards: {e}")
+            await asyncio.sleep(self.interval)
+
+
+error_log_compactor = ErrorLogCompactor.from_settings()
+
+
+if __name__ == "__main__":
+    for path in error_log_compactor.run_once():
+        print(f"Compacted {path}")
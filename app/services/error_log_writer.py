@@ -0,0 +1,490 @@
+"""
+MediaMTX 오류 로그 비동기 writer
+
+핸들러는 레코드를 bounded queue에 넣고 바로 반환하고,
+백그라운드 task가 배치 단위로 모아서 날짜별 .jsonl 파일에 기록합니다.
+
+- 날짜별 파일 핸들을 열어둔 채로 재사용 (요청마다 open/close 하지 않음)
+- batch size 또는 flush interval 중 먼저 도달하는 조건에서 flush
+- fsync 정책: "none" (OS에 맡김) / "batch" (배치마다 fsync)
+- 종료 시 queue에 남은 레코드까지 모두 기록 후 파일 핸들 정리
+- 같은 fingerprint의 첫 레코드는 바로 기록하고, dedup window 동안의 반복만 하나로 합쳐서 기록 (error_log_dedup 참고)
+- 기록과 동시에 sidecar index(.idx)에 offset을 append (error_log_index 참고)
+- write mode "sharded": worker 프로세스마다 자기 shard 파일(YYYY-MM-DD.wN.jsonl)에 기록 (error_log_shards 참고)
+- 기록에 실패한 레코드(디스크 가득 참 등)는 버리지 않고 WRITE_RETRY_INTERVAL 뒤에 다시 기록
+  (다시 기록할 레코드는 queue_size까지만 보관, 넘치면 오래된 것부터 버리고 droppedTotal에 집계)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.error_log_dedup import ErrorFingerprintTable
+from app.services.error_log_index import (
+    IndexEntry,
+    catch_up_index_file,
+    encode_index_entry,
+    index_path_for,
+    make_index_entry,
+)
+from app.services.error_log_shards import WRITE_MODES, ShardLease, lock_shared, shard_filename, unlock
+from app.services.json_codec import dumps_line
+from app.services.metrics import error_log_write_seconds, error_log_written_bytes_total
+
+FSYNC_POLICIES = ("none", "batch")
+
+# (로그 파일명, 로그 엔트리)
+QueuedRecord = Tuple[str, dict]
+
+# 기록 완료 listener: (로그 파일명, 기록된 레코드의 index 엔트리, 기록 후 파일 끝 offset)
+WriteListener = Callable[[str, List[IndexEntry], int], None]
+
+# dedup window 만료로 깨어났을 때 (queue에서 꺼낸 레코드 없음)
+_NO_ITEM = object()
+
+# 기록에 실패한 레코드를 다시 기록하기까지 간격 (초)
+WRITE_RETRY_INTERVAL = 1.0
+
+
+class ErrorLogQueueFull(Exception):
+    """writer queue가 가득 차서 레코드를 받을 수 없음"""
+
+
+class ErrorLogWriteError(Exception):
+    """일부 파일에 기록하지 못함 (records: 기록하지 못한 레코드)"""
+
+    def __init__(self, records: List[QueuedRecord], cause: Exception):
+        super().__init__(f"Failed to write {len(records)} error log record(s): {cause}")
+        self.records = records
+
+
+def log_filename_for(timestamp: str) -> str:
+    """ISO 8601 timestamp → 날짜별 로그 파일명 (YYYY-MM-DD.jsonl)"""
+    log_date = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    return f"{log_date.strftime('%Y-%m-%d')}.jsonl"
+
+
+class ErrorLogWriter:
+    def __init__(
+        self,
+        log_dir: Path,
+        queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        fsync_policy: str = "batch",
+        max_open_files: int = 4,
+        dedup_window: float = 0.0,
+        dedup_max_entries: int = 10000,
+        write_mode: str = "single",
+    ):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy} (expected one of {FSYNC_POLICIES})")
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"Unknown write mode: {write_mode} (expected one of {WRITE_MODES})")
+
+        self.log_dir = log_dir
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.max_open_files = max_open_files
+        self.write_mode = write_mode
+        # sharded 모드에서 이 프로세스가 쓰는 shard 번호 (첫 기록 때 확보)
+        self._shard: Optional[ShardLease] = ShardLease(log_dir) if write_mode == "sharded" else None
+        self._dedup = ErrorFingerprintTable(window=dedup_window, max_entries=dedup_max_entries)
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        # 파일 핸들은 writer 스레드에서만 건드리지만, 미기동 상태의 동기 fallback과 겹치지 않도록 lock
+        self._lock = threading.Lock()
+        # 로그 파일명 → (.jsonl 핸들, .idx 핸들)
+        self._handles: "OrderedDict[str, Tuple[BinaryIO, BinaryIO]]" = OrderedDict()
+
+        self._listeners: List[WriteListener] = []
+
+        # 기록에 실패해서 다시 기록할 레코드 / 다시 시도할 시각 (loop time)
+        self._retry: List[QueuedRecord] = []
+        self._retry_at = 0.0
+
+        # 통계
+        self.accepted_total = 0
+        self.rejected_total = 0
+        self.written_total = 0
+        self.batches_total = 0
+        self.last_batch_size = 0
+        self.write_failed_total = 0
+        self.dropped_total = 0
+        self.last_flush_at: Optional[float] = None
+        self.last_flush_duration: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls) -> "ErrorLogWriter":
+        return cls(
+            log_dir=Path(settings.ERROR_LOG_DIR),
+            queue_size=settings.ERROR_LOG_QUEUE_SIZE,
+            batch_size=settings.ERROR_LOG_BATCH_SIZE,
+            flush_interval=settings.ERROR_LOG_FLUSH_INTERVAL,
+            fsync_policy=settings.ERROR_LOG_FSYNC,
+            max_open_files=settings.ERROR_LOG_MAX_OPEN_FILES,
+            dedup_window=settings.ERROR_LOG_DEDUP_WINDOW,
+            dedup_max_entries=settings.ERROR_LOG_DEDUP_MAX_ENTRIES,
+            write_mode=settings.ERROR_LOG_WRITE_MODE,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def log_path(self, log_filename: str) -> Path:
+        return self.log_dir / log_filename
+
+    def _target_filename(self, log_filename: str) -> str:
+        """실제로 기록할 파일명 (sharded 모드에서는 이 프로세스의 shard)"""
+        if self._shard is None:
+            return log_filename
+        return shard_filename(log_filename, self._shard.acquire())
+
+    def add_listener(self, listener: WriteListener) -> None:
+        """배치가 파일에 기록될 때마다 호출할 listener 등록 (rollup 등)"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    # ============================================
+    # Producer side (event loop)
+    # ============================================
+
+    async def submit(self, log_filename: str, log_entry: dict) -> Path:
+        """
+        레코드를 queue에 넣고 대상 파일 경로를 반환
+
+        writer가 기동되지 않은 상태(스크립트, lifespan 없는 테스트 클라이언트 등)에서는
+        중복 제거 없이 바로 기록합니다 (event loop를 막지 않도록 worker thread에서).
+        queue에 넣는 경우에는 대기하지 않습니다.
+        """
+        if not self._running:
+            await asyncio.to_thread(self._write_batch, [(log_filename, log_entry)])
+            self.accepted_total += 1
+            return self.log_path(log_filename)
+
+        try:
+            self._queue.put_nowait((log_filename, log_entry))
+        except asyncio.QueueFull:
+            self.rejected_total += 1
+            raise ErrorLogQueueFull(f"Error log queue is full ({self.queue_size} pending records)")
+
+        self.accepted_total += 1
+        return self.log_path(log_filename)
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._running = True
+        self._task = asyncio.create_task(self._run(), name="error-log-writer")
+
+    async def stop(self) -> None:
+        """남은 레코드를 모두 기록하고 파일 핸들을 닫음"""
+        if not self._running:
+            return
+        self._running = False
+
+        # sentinel을 넣어 writer loop가 현재 배치를 마무리하고 종료하도록 함
+        await self._queue.put(None)
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+        # sentinel 이후에 들어온 레코드까지 정리
+        leftover: List[QueuedRecord] = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                leftover.append(item)
+        leftover = self._take_retry() + self._coalesce(leftover, asyncio.get_running_loop().time(), final=True)
+        if leftover:
+            try:
+                await asyncio.to_thread(self._write_batch, leftover)
+            except ErrorLogWriteError as e:
+                # 종료 중이라 더 시도할 수 없음
+                self.dropped_total += len(e.records)
+                print(f"[error-log-writer] {e} (dropped at shutdown)")
+
+        await asyncio.to_thread(self._close_all)
+        if self._shard is not None:
+            self._shard.release()
+
+    # ============================================
+    # Consumer side
+    # ============================================
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # dedup window가 열려 있거나 다시 기록할 레코드가 있으면 그 시점에 깨어나서 기록
+            next_expiry = self._dedup.next_expiry()
+            if self._retry:
+                next_expiry = self._retry_at if next_expiry is None else min(next_expiry, self._retry_at)
+            try:
+                if next_expiry is None:
+                    first = await self._queue.get()
+                else:
+                    first = await asyncio.wait_for(self._queue.get(), max(0.0, next_expiry - loop.time()))
+            except asyncio.TimeoutError:
+                first = _NO_ITEM
+
+            batch: List[QueuedRecord] = []
+            stop_requested = first is None
+            if first is not None and first is not _NO_ITEM:
+                batch.append(first)
+                deadline = loop.time() + self.flush_interval
+
+                while len(batch) < self.batch_size:
+                    # 이미 쌓여 있는 레코드는 대기 없이 가져옴
+                    while len(batch) < self.batch_size and not self._queue.empty():
+                        item = self._queue.get_nowait()
+                        if item is None:
+                            stop_requested = True
+                            break
+                        batch.append(item)
+                    if stop_requested or len(batch) >= self.batch_size:
+                        break
+
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        stop_requested = True
+                        break
+                    batch.append(item)
+
+            to_write = self._coalesce(batch, loop.time(), final=stop_requested)
+            # 종료 요청이면 남은 재시도 레코드는 stop()에서 마지막으로 기록
+            if not stop_requested and self._retry and (to_write or loop.time() >= self._retry_at):
+                to_write = self._take_retry() + to_write
+            if to_write:
+                try:
+                    await asyncio.to_thread(self._write_batch, to_write)
+                except ErrorLogWriteError as e:
+                    print(f"[error-log-writer] {e} (retrying in {WRITE_RETRY_INTERVAL}s)")
+                    self._requeue(e.records, loop.time() + WRITE_RETRY_INTERVAL)
+
+            if stop_requested:
+                return
+
+    def _take_retry(self) -> List[QueuedRecord]:
+        records, self._retry = self._retry, []
+        return records
+
+    def _requeue(self, records: List[QueuedRecord], retry_at: float) -> None:
+        """기록하지 못한 레코드를 다음 시도 때 다시 기록 (queue_size를 넘으면 오래된 것부터 버림)"""
+        self._retry.extend(records)
+        self._retry_at = retry_at
+        overflow = len(self._retry) - self.queue_size
+        if overflow > 0:
+            del self._retry[:overflow]
+            self.dropped_total += overflow
+            print(f"[error-log-writer] Dropped {overflow} record(s) waiting for retry")
+
+    def _coalesce(self, batch: List[QueuedRecord], now: float, final: bool = False) -> List[QueuedRecord]:
+        """dedup 테이블을 거쳐 실제로 기록할 레코드 목록을 만듦"""
+        if not self._dedup.enabled:
+            return batch
+
+        to_write: List[QueuedRecord] = []
+        for log_filename, log_entry in batch:
+            to_write.extend(self._dedup.add(log_filename, log_entry, now))
+        to_write.extend(self._dedup.expire(now))
+        if final:
+            to_write.extend(self._dedup.drain())
+        return to_write
+
+    def _write_batch(self, batch: List[QueuedRecord]) -> None:
+        """
+        배치를 파일별로 기록
+
+        어떤 파일에 기록하지 못하면 그 파일의 레코드만 ErrorLogWriteError로 돌려줍니다
+        (다른 파일은 그대로 기록, 실패한 파일은 기록 전 크기로 되돌려서 잘린 라인을 남기지 않음).
+        """
+        started = time.perf_counter()
+
+        # 파일별로 묶어서 한 번의 write로 기록
+        lines_by_file: Dict[str, List[Tuple[bytes, dict]]] = {}
+        for log_filename, log_entry in batch:
+            line = dumps_line(log_entry)
+            lines_by_file.setdefault(log_filename, []).append((line, log_entry))
+
+        written_bytes = 0
+        failed: List[QueuedRecord] = []
+        error: Optional[Exception] = None
+        with self._lock:
+            for log_filename, lines in lines_by_file.items():
+                target = self._target_filename(log_filename)
+                start: Optional[int] = None
+                try:
+                    f, idx = self._get_handles(target)
+                    if self._shard is not None:
+                        f, idx = self._lock_shard(target, f, idx)
+                except OSError as e:
+                    failed.extend((log_filename, log_entry) for _, log_entry in lines)
+                    error = e
+                    continue
+
+                try:
+                    # 같은 배치의 index 라인도 함께 append
+                    start = offset = f.tell()
+                    index_entries = []
+                    for line, log_entry in lines:
+                        index_entries.append(make_index_entry(offset, len(line), log_entry))
+                        offset += len(line)
+
+                    data = b''.join(line for line, _ in lines)
+                    f.write(data)
+                    f.flush()
+                    if self.fsync_policy == "batch":
+                        os.fsync(f.fileno())
+                except OSError as e:
+                    self._discard_handles(target, truncate_to=start)
+                    failed.extend((log_filename, log_entry) for _, log_entry in lines)
+                    error = e
+                    continue
+                finally:
+                    if self._shard is not None and not f.closed:
+                        unlock(f)
+
+                written_bytes += len(data)
+                try:
+                    # index는 .jsonl에서 다시 만들 수 있으므로 fsync 하지 않음 (실패해도 다음에 열 때 보충)
+                    idx.write(b''.join(encode_index_entry(e) for e in index_entries))
+                    idx.flush()
+                except OSError as e:
+                    print(f"[error-log-writer] Failed to append index for {target}: {e}")
+                    self._discard_handles(target)
+
+                for listener in self._listeners:
+                    try:
+                        listener(target, index_entries, offset)
+                    except Exception as e:  # pragma: no cover
+                        print(f"[error-log-writer] Listener {listener!r} failed: {e}")
+
+        self.written_total += len(batch) - len(failed)
+        self.batches_total += 1
+        self.last_batch_size = len(batch)
+        self.last_flush_at = time.time()
+        self.last_flush_duration = time.perf_counter() - started
+        error_log_write_seconds.observe(self.last_flush_duration)
+        error_log_written_bytes_total.inc(amount=written_bytes)
+        if failed:
+            self.write_failed_total += len(failed)
+            raise ErrorLogWriteError(failed, error)
+
+    def _discard_handles(self, log_filename: str, truncate_to: Optional[int] = None) -> None:
+        """기록에 실패한 파일의 핸들을 닫고 (다음에 다시 엶), 일부만 기록된 내용은 잘라냄"""
+        for handle in self._handles.pop(log_filename, ()):
+            try:
+                handle.close()
+            except OSError:
+                pass
+        if truncate_to is not None:
+            try:
+                os.truncate(self.log_path(log_filename), truncate_to)
+            except OSError:
+                pass
+
+    def _get_handles(self, log_filename: str) -> Tuple[BinaryIO, BinaryIO]:
+        handles = self._handles.get(log_filename)
+        if handles is not None and not handles[0].closed:
+            self._handles.move_to_end(log_filename)
+            return handles
+
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        log_path = self.log_path(log_filename)
+        # index가 뒤처져 있으면 먼저 채운 뒤 이어서 append
+        catch_up_index_file(log_path)
+        handles = (open(log_path, 'ab'), open(index_path_for(log_path), 'ab'))
+        self._handles[log_filename] = handles
+
+        # 오래된 날짜 파일 핸들은 닫음 (LRU)
+        while len(self._handles) > self.max_open_files:
+            _, old = self._handles.popitem(last=False)
+            for old_f in old:
+                old_f.close()
+        return handles
+
+    def _lock_shard(self, log_filename: str, f: BinaryIO, idx: BinaryIO) -> Tuple[BinaryIO, BinaryIO]:
+        """
+        shard에 공유 lock을 잡음 (기록하는 동안 compaction이 파일을 교체하지 못하게)
+
+        lock을 잡고 보니 compaction / 보관 기간 정리로 이미 삭제된 파일이면 같은 이름으로 새로 엽니다.
+        """
+        while True:
+            lock_shared(f)
+            if os.fstat(f.fileno()).st_nlink > 0:
+                return f, idx
+            unlock(f)
+            for handle in self._handles.pop(log_filename):
+                handle.close()
+            f, idx = self._get_handles(log_filename)
+
+    @contextmanager
+    def detach(self, log_filename: str) -> Iterator[None]:
+        """
+        해당 로그 파일의 핸들을 닫고, 블록이 끝날 때까지 writer가 기록하지 못하게 막음
+
+        압축 보관 등으로 파일을 교체/삭제할 때 사용합니다.
+        이후 같은 파일명으로 들어오는 레코드는 새 파일에 기록됩니다.
+        """
+        with self._lock:
+            handles = self._handles.pop(log_filename, None)
+            if handles is not None:
+                for f in handles:
+                    f.close()
+            yield
+
+    def _close_all(self) -> None:
+        with self._lock:
+            while self._handles:
+                _, handles = self._handles.popitem(last=False)
+                for f in handles:
+                    f.close()
+
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "queueDepth": self._queue.qsize(),
+            "queueCapacity": self.queue_size,
+            "batchSize": self.batch_size,
+            "flushInterval": self.flush_interval,
+            "fsyncPolicy": self.fsync_policy,
+            "writeMode": self.write_mode,
+            "shard": self._shard.number if self._shard is not None else None,
+            "openFiles": len(self._handles),
+            "acceptedTotal": self.accepted_total,
+            "rejectedTotal": self.rejected_total,
+            "writtenTotal": self.written_total,
+            "writeFailedTotal": self.write_failed_total,
+            "retryPending": len(self._retry),
+            "droppedTotal": self.dropped_total,
+            "batchesTotal": self.batches_total,
+            "lastBatchSize": self.last_batch_size,
+            "lastFlushAt": self.last_flush_at,
+            "lastFlushDuration": self.last_flush_duration,
+            "dedup": self._dedup.stats(),
+        }
+
+
+error_log_writer = ErrorLogWriter.from_settings()
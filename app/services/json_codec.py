@@ -0,0 +1,85 @@
+"""
+JSON 인코딩 / 디코딩 backend
+
+오류 로그 기록(JSONL), 로그 라인 파싱, API 응답 인코딩에서 공통으로 사용합니다.
+JSON_BACKEND 설정으로 선택합니다.
+- "auto" (기본): orjson이 설치되어 있으면 orjson, 없으면 표준 json
+- "orjson": orjson 사용 (설치되어 있지 않으면 기동 실패)
+- "json": 표준 json
+
+출력 형식은 backend와 관계없이 같습니다 (공백 없는 구분자, 비 ASCII 문자는 escape 없이 UTF-8).
+orjson이 처리하지 못하는 값(64bit를 넘는 정수 등)과 입력(NaN / Infinity 리터럴 등)은
+표준 json으로 다시 처리하므로 결과는 표준 json과 같습니다.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+
+def _select_backend(name: str) -> str:
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON_BACKEND: {name} (expected one of {', '.join(JSON_BACKENDS)})")
+    if name == "json" or (name == "auto" and orjson is None):
+        return "json"
+    if orjson is None:
+        raise RuntimeError("JSON_BACKEND=orjson but orjson is not installed")
+    return "orjson"
+
+
+BACKEND = _select_backend(settings.JSON_BACKEND)
+
+
+def _std_dumps(obj: Any) -> bytes:
+    """obj → JSON (UTF-8 bytes)"""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+if BACKEND == "orjson":
+    # str이 아닌 dict key(int 등)는 표준 json처럼 문자열로 변환
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=_OPTIONS)
+        except TypeError:
+            return _std_dumps(obj)
+
+    def dumps_line(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            return _std_dumps(obj) + b"\n"
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            return json.loads(data)
+
+else:
+    dumps = _std_dumps
+
+    def dumps_line(obj: Any) -> bytes:
+        return _std_dumps(obj) + b"\n"
+
+    loads = json.loads
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse와 같은 형식이지만 선택된 backend로 인코딩 (FastAPI 기본 응답 class)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,155 @@
+"""
+요청 body를 chunk 단위로 읽으면서 JSON 레코드를 하나씩 꺼내는 incremental parser
+
+- NDJSON (application/x-ndjson): 한 줄에 하나의 JSON
+- JSON array: [ {...}, {...}, ... ]
+
+body 전체를 메모리에 올리지 않고, 레코드 하나 크기(max_item_bytes)만큼만 버퍼링합니다.
+각 항목은 (obj, error) 튜플로 yield 되며, 파싱 실패 시 obj=None, error=메시지 입니다.
+body가 JSON array가 아니면 (레코드를 하나도 꺼내기 전에) InvalidJsonBody 를 raise 합니다.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from app.services.json_codec import loads
+
+ParsedItem = Tuple[Optional[Any], Optional[str]]
+
+_WHITESPACE = " \t\r\n"
+
+
+class InvalidJsonBody(ValueError):
+    """body 전체가 기대한 형식이 아님 (레코드 단위 오류가 아님)"""
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes], max_item_bytes: int) -> AsyncIterator[ParsedItem]:
+    """NDJSON body → 라인별 JSON 객체 (잘못된 라인은 에러로 yield 후 계속 진행)"""
+    buf = b""
+    skipping = False  # 너무 긴 라인은 다음 개행까지 버림
+
+    async for chunk in chunks:
+        buf += chunk
+        while True:
+            newline = buf.find(b"\n")
+            if newline < 0:
+                if len(buf) > max_item_bytes:
+                    if not skipping:
+                        yield None, f"Record exceeds {max_item_bytes} bytes"
+                    skipping = True
+                    buf = b""
+                break
+
+            line, buf = buf[:newline], buf[newline + 1:]
+            if skipping:
+                skipping = False
+                continue
+            item = _parse_line(line, max_item_bytes)
+            if item is not None:
+                yield item
+
+    if buf and not skipping:
+        item = _parse_line(buf, max_item_bytes)
+        if item is not None:
+            yield item
+
+
+def _parse_line(line: bytes, max_item_bytes: int) -> Optional[ParsedItem]:
+    if not line.strip():
+        return None
+    if len(line) > max_item_bytes:
+        return None, f"Record exceeds {max_item_bytes} bytes"
+    try:
+        return loads(line), None
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes], max_item_bytes: int) -> AsyncIterator[ParsedItem]:
+    """
+    JSON array body → 원소별 JSON 객체
+
+    array 구조 자체가 깨진 경우에는 이후 원소를 신뢰할 수 없으므로 에러를 한 번 yield 하고 종료합니다.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    started = False
+    expect_separator = False
+
+    chunk_iter = chunks.__aiter__()
+    eof = False
+
+    while True:
+        # 버퍼가 비었거나 원소가 덜 들어온 경우 다음 chunk를 읽음
+        need_more = False
+        pos = _skip_whitespace(buf, 0)
+
+        if not started:
+            if pos < len(buf):
+                if buf[pos] != "[":
+                    raise InvalidJsonBody("Request body must be a JSON array")
+                started = True
+                buf = buf[pos + 1:]
+                continue
+            need_more = True
+
+        elif pos < len(buf):
+            ch = buf[pos]
+            if ch == "]":
+                return
+            if expect_separator:
+                if ch != ",":
+                    yield None, f"Invalid JSON array: expected ',' or ']' but found {ch!r}"
+                    return
+                expect_separator = False
+                buf = buf[pos + 1:]
+                continue
+
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except ValueError as e:
+                if eof:
+                    yield None, f"Invalid JSON: {e}"
+                    return
+                if len(buf) - pos > max_item_bytes:
+                    yield None, f"Record exceeds {max_item_bytes} bytes"
+                    return
+                need_more = True
+            else:
+                if end == len(buf) and not eof:
+                    # 숫자 등 경계가 모호한 값은 다음 chunk까지 확인
+                    need_more = True
+                else:
+                    yield obj, None
+                    expect_separator = True
+                    buf = buf[end:]
+                    continue
+        else:
+            need_more = True
+
+        if need_more:
+            if eof:
+                if not started:
+                    raise InvalidJsonBody("Request body must be a JSON array")
+                yield None, "Invalid JSON array: unexpected end of body"
+                return
+            try:
+                chunk = await chunk_iter.__anext__()
+            except StopAsyncIteration:
+                eof = True
+                chunk = b""
+            try:
+                buf = buf[pos:] + text_decoder.decode(chunk, final=eof)
+            except UnicodeDecodeError as e:
+                yield None, f"Invalid UTF-8 in request body: {e}"
+                return
+
+
+def _skip_whitespace(buf: str, pos: int) -> int:
+    while pos < len(buf) and buf[pos] in _WHITESPACE:
+        pos += 1
+    return pos
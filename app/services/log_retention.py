@@ -0,0 +1,201 @@
+"""
+MediaMTX 오류 로그 보관 기간 / 용량 관리
+
+서버 안에서 주기적으로 LOG_DIR을 점검해서
+- 보관 기간(ERROR_LOG_RETENTION_DAYS)이 지난 날짜의 로그 파일을 삭제하고
+- 전체 용량이 ERROR_LOG_MAX_BYTES를 넘으면 오래된 파일부터 삭제합니다.
+
+로그 파일을 지울 때 sidecar index, 블록 index, rollup 카운터/snapshot도 함께 정리합니다.
+writer가 기록 중인 오늘(UTC) 날짜의 파일은 용량 초과 시에도 삭제하지 않습니다.
+
+사용법 (서버 외부에서 1회 실행):
+    python -m app.services.log_retention
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, ContextManager, List, Optional
+
+from app.core.config import settings
+from app.services.error_log_archive import blocks_path_for
+from app.services.error_log_index import forget_day_index, index_path_for
+from app.services.error_log_reader import LOG_SUFFIX, list_log_files, log_day_of
+
+
+class LogRetention:
+    def __init__(
+        self,
+        log_dir: Path,
+        retention_days: int = 365,
+        max_bytes: int = 10 * 1024 ** 3,
+        interval: float = 60.0,
+    ):
+        self.log_dir = log_dir
+        self.retention_days = retention_days
+        self.max_bytes = max_bytes
+        self.interval = interval
+
+        # writer / rollup 과 상태를 맞추기 위한 hook (app lifespan에서 연결)
+        self.commit_lock: Optional[Callable[[str], ContextManager]] = None
+        self.on_evicted: Optional[Callable[[Path], None]] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.runs_total = 0
+        self.evicted_files_total = 0
+        self.reclaimed_bytes_total = 0
+        self.last_run_at: Optional[float] = None
+        self.last_run_duration: Optional[float] = None
+        self.last_reclaimed_bytes = 0
+        self.last_evicted: List[str] = []
+        self.total_bytes = 0
+        self.over_budget = False
+
+    @classmethod
+    def from_settings(cls) -> "LogRetention":
+        return cls(
+            log_dir=Path(settings.ERROR_LOG_DIR),
+            retention_days=settings.ERROR_LOG_RETENTION_DAYS,
+            max_bytes=settings.ERROR_LOG_MAX_BYTES,
+            interval=settings.ERROR_LOG_RETENTION_INTERVAL,
+        )
+
+    @staticmethod
+    def _related_files(log_path: Path) -> List[Path]:
+        """로그 파일과 함께 지워야 하는 파일 (sidecar index, 블록 index)"""
+        return [log_path, index_path_for(log_path), blocks_path_for(log_path)]
+
+    def _size_of(self, log_path: Path) -> int:
+        total = 0
+        for path in self._related_files(log_path):
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    @staticmethod
+    def _dir_size(directory: Path) -> int:
+        """디렉토리 바로 아래 파일 크기 합계 (압축 보관 / compaction 중 사라진 파일은 건너뜀)"""
+        total = 0
+        for path in directory.iterdir():
+            try:
+                if path.is_file():
+                    total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def _evict(self, log_path: Path) -> int:
+        reclaimed = 0
+        with (self.commit_lock(log_path.name) if self.commit_lock else nullcontext()):
+            for path in self._related_files(log_path):
+                try:
+                    size = path.stat().st_size
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                reclaimed += size
+        forget_day_index(log_path)
+        if self.on_evicted is not None:
+            self.on_evicted(log_path)
+        return reclaimed
+
+    def run_once(self, now: Optional[float] = None) -> int:
+        """보관 기간 / 용량 정책을 한 번 적용하고 회수한 바이트 수를 반환"""
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        evicted: List[str] = []
+        reclaimed = 0
+
+        if self.log_dir.exists():
+            today = datetime.fromtimestamp(now, timezone.utc)
+            oldest_kept_day = (today - timedelta(days=self.retention_days)).date().isoformat()
+            # 오늘 날짜의 일반 .jsonl 파일(worker별 shard 포함)은 writer가 쓰고 있으므로 용량 초과로는 지우지 않음
+            # (파일명 날짜는 클라이언트 timestamp 기준이라 최신 파일명이 아니라 현재 시각으로 판단)
+            active_day = today.date().isoformat()
+
+            # 오래된 파일 먼저
+            log_files = list_log_files(self.log_dir, newest_first=False)
+            sizes = {log_path: self._size_of(log_path) for log_path in log_files}
+            # 로그 디렉토리 전체 용량 (index, 임시 파일 등 포함 / rollup snapshot은 ERROR_LOG_ROLLUP_DIR 이라 제외)
+            total = self._dir_size(self.log_dir)
+
+            for log_path in log_files:
+                expired = log_day_of(log_path) < oldest_kept_day
+                active = log_path.name.endswith(LOG_SUFFIX) and log_day_of(log_path) == active_day
+                over = total > self.max_bytes and not active
+                if not expired and not over:
+                    if total <= self.max_bytes:
+                        break
+                    continue
+                freed = self._evict(log_path)
+                total -= sizes[log_path]
+                reclaimed += freed
+                evicted.append(log_path.name)
+
+            self.total_bytes = max(total, 0)
+            self.over_budget = total > self.max_bytes
+
+        self.runs_total += 1
+        self.evicted_files_total += len(evicted)
+        self.reclaimed_bytes_total += reclaimed
+        self.last_reclaimed_bytes = reclaimed
+        self.last_evicted = evicted
+        self.last_run_at = now
+        self.last_run_duration = time.perf_counter() - started
+        return reclaimed
+
+    def stats(self) -> dict:
+        return {
+            "retentionDays": self.retention_days,
+            "maxBytes": self.max_bytes,
+            "interval": self.interval,
+            "totalBytes": self.total_bytes,
+            "overBudget": self.over_budget,
+            "runsTotal": self.runs_total,
+            "evictedFilesTotal": self.evicted_files_total,
+            "reclaimedBytesTotal": self.reclaimed_bytes_total,
+            "lastRunAt": self.last_run_at,
+            "lastRunDuration": self.last_run_duration,
+            "lastReclaimedBytes": self.last_reclaimed_bytes,
+            "lastEvicted": self.last_evicted,
+        }
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="log-retention")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:  # pragma: no cover - 디스크 오류 등
+                print(f"[log-retention] Failed to enforce retention: {e}")
+            await asyncio.sleep(self.interval)
+
+
+log_retention = LogRetention.from_settings()
+
+
+if __name__ == "__main__":
+    from app.services.error_log_rollup import error_log_rollup
+
+    log_retention.on_evicted = lambda path: error_log_rollup.drop(path.name)
+    reclaimed = log_retention.run_once()
+    print(f"Evicted {len(log_retention.last_evicted)} file(s), reclaimed {reclaimed} bytes")
+    for name in log_retention.last_evicted:
+        print(f"  - {name}")
@@ -0,0 +1,235 @@
+"""
+프로세스 내 metrics (Prometheus text format)
+
+- Counter / Histogram: 스레드별 shard(label 값 tuple → 값 dict)에 lock 없이 기록하고,
+  scrape 시점에 shard를 합칩니다. 각 shard는 그 스레드만 갱신하므로 event loop,
+  threadpool(sync 핸들러), writer 스레드에서 동시에 기록해도 값이 유실되지 않습니다.
+  종료된 스레드의 shard는 scrape 때 누적값으로 합쳐서 정리합니다.
+- collector: scrape 시점에 기존 stats() 값 등을 읽어 gauge / counter로 내보내는 callback
+  (요청 경로에는 비용이 없음)
+
+worker 프로세스가 여러 개면 값은 프로세스별입니다 (scrape한 worker의 값).
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# 요청 처리 시간용 bucket (초)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# collector가 반환하는 sample: (이름, type, help, [(label dict, 값), ...])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+Collector = Callable[[], Iterable[Sample]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _ThreadShards:
+    """스레드별 dict shard (갱신은 자기 스레드 shard에만, 합산은 scrape 시점에)"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        # 종료된 스레드 shard를 합쳐 둔 값 (scrape 하는 쪽에서만 갱신)
+        self._retired: dict = {}
+        self._merge_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            # list.append는 GIL 아래에서 atomic
+            self._shards.append((threading.current_thread(), values))
+            return values
+
+    def _collect(self, merge) -> dict:
+        """모든 shard를 merge(합계 dict, shard 값)로 합친 결과"""
+        with self._merge_lock:
+            alive = []
+            for thread, values in list(self._shards):
+                if thread.is_alive():
+                    alive.append((thread, values))
+                else:
+                    merge(self._retired, values)
+            if len(alive) != len(self._shards):
+                self._shards[:] = alive
+            total = {labels: list(v) if isinstance(v, list) else v for labels, v in self._retired.items()}
+            for _, values in alive:
+                merge(total, values)
+            return total
+
+
+def _merge_counts(total: dict, values: dict) -> None:
+    for labels, value in values.copy().items():
+        total[labels] = total.get(labels, 0) + value
+
+
+def _merge_series(total: dict, values: dict) -> None:
+    for labels, series in values.copy().items():
+        series = list(series)
+        existing = total.get(labels)
+        if existing is None:
+            total[labels] = series
+        else:
+            for i, value in enumerate(series):
+                existing[i] += value
+
+
+class Counter(_ThreadShards):
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__()
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        values = self._shard()
+        values[labels] = values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._collect(_merge_counts).get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._collect(_merge_counts).items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram(_ThreadShards):
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__()
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels) -> None:
+        # label 값 → [bucket별 개수 (+Inf 포함, 누적 아님)..., 합계]
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels) -> int:
+        series = self._collect(_merge_series).get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        bounds = [_number(b) for b in self.buckets] + ["+Inf"]
+        for labels, series in sorted(self._collect(_merge_series).items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                le = 'le="' + bound + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Collector] = []
+        # 실패한 collector 수 (collector 결과 뒤에 렌더링해서 이번 scrape의 실패도 바로 보이도록 별도 보관)
+        self.collector_errors_total = Counter(
+            "metrics_collector_errors_total", "Collector callbacks that raised during a scrape", ("collector",)
+        )
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                # collector 하나 때문에 나머지 metrics를 잃지 않도록 건너뛰고 집계
+                self.collector_errors_total.inc(getattr(collector, "__qualname__", type(collector).__name__))
+                print(f"[metrics] Collector {collector!r} failed: {e}")
+                continue
+            for name, kind, help, values in samples:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in values:
+                    lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+        lines.extend(self.collector_errors_total.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# HTTP (MetricsMiddleware)
+http_requests_total = metrics.counter(
+    "http_requests_total", "HTTP requests by method, route template and status", ("method", "route", "status")
+)
+http_request_duration_seconds = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request duration until the response is complete", ("method", "route")
+)
+
+# 오류 로그 기록 (ErrorLogWriter, writer 스레드)
+error_log_write_seconds = metrics.histogram(
+    "error_log_write_seconds", "Time spent encoding and writing one batch to the log files (incl. fsync)"
+)
+error_log_written_bytes_total = metrics.counter("error_log_written_bytes_total", "Bytes appended to .jsonl log files")
+
+# /latest 읽기
+error_log_latest_reads_total = metrics.counter("error_log_latest_reads_total", "read_latest() calls")
+error_log_latest_records_total = metrics.counter("error_log_latest_records_total", "Records returned by read_latest()")
+error_log_latest_skipped_lines_total = metrics.counter(
+    "error_log_latest_skipped_lines_total", "Unparseable lines skipped by read_latest()"
+)
+error_log_latest_files_total = metrics.counter("error_log_latest_files_total", "Log files opened by read_latest()")
+error_log_latest_read_seconds = metrics.histogram("error_log_latest_read_seconds", "read_latest() duration")
@@ -0,0 +1,375 @@
+"""
+서명된 재생 티켓 (play ticket) 과 MediaMTX 외부 인증 hook 판정
+
+티켓은 서버에 저장하지 않는 self-describing 토큰입니다.
+
+    base64url("v1|{scope}|{exp}|{jti}|{streamId}") + "." + base64url(HMAC-SHA256(secret, 앞부분))
+
+- scope: "read" (WHEP / RTSP 재생) | "publish"
+- exp: 만료 시각 (epoch 초), jti: 폐기(revoke)용 티켓 ID
+- 검증은 I/O 없이 HMAC 한 번 + 문자열 비교로 끝남 (키를 미리 넣은 HMAC 객체를 copy 해서 사용)
+
+MediaMTX의 authMethod: http 설정으로 모든 WHEP / RTSP 연결마다 호출되는 hook에서 사용하므로
+판정 경로에서는 예외 생성, pydantic 검증, lock 을 쓰지 않습니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import heapq
+import hmac
+import os
+import secrets
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+TICKET_VERSION = "v1"
+SCOPE_READ = "read"
+SCOPE_PUBLISH = "publish"
+
+# MediaMTX action → 필요한 티켓 scope
+ACTION_SCOPES = {
+    "read": SCOPE_READ,
+    "playback": SCOPE_READ,
+    "publish": SCOPE_PUBLISH,
+}
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class TicketClaims:
+    __slots__ = ("stream_id", "scope", "exp", "jti")
+
+    def __init__(self, stream_id: str, scope: str, exp: int, jti: str):
+        self.stream_id = stream_id
+        self.scope = scope
+        self.exp = exp
+        self.jti = jti
+
+    def to_dict(self) -> dict:
+        return {"streamId": self.stream_id, "scope": self.scope, "exp": self.exp, "jti": self.jti}
+
+
+class PlayTicketSigner:
+    def __init__(self, secret: bytes, ttl: int = 1800):
+        self.ttl = ttl
+        # 키를 넣어 둔 HMAC 객체 (검증마다 copy → 매번 키 padding 계산을 하지 않음)
+        self._mac = hmac.new(secret, digestmod=hashlib.sha256)
+
+    @classmethod
+    def from_settings(cls) -> "PlayTicketSigner":
+        secret = settings.PLAY_TICKET_SECRET
+        if not secret:
+            # 프로세스마다 다른 키 → 재시작하면 기존 티켓은 무효, worker가 여러 개면 반드시 설정 필요
+            print("[play-ticket] PLAY_TICKET_SECRET is not set, using a random per-process secret")
+            return cls(secrets.token_bytes(32), ttl=settings.PLAY_TICKET_TTL)
+        return cls(secret.encode(), ttl=settings.PLAY_TICKET_TTL)
+
+    def _sign(self, payload: str) -> str:
+        mac = self._mac.copy()
+        mac.update(payload.encode("ascii"))
+        return _b64encode(mac.digest())
+
+    def issue(
+        self,
+        stream_id: str,
+        scope: str = SCOPE_READ,
+        ttl: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> Tuple[str, TicketClaims]:
+        claims = TicketClaims(
+            stream_id=stream_id,
+            scope=scope,
+            exp=int(time.time() if now is None else now) + (self.ttl if ttl is None else ttl),
+            jti=secrets.token_urlsafe(9),
+        )
+        payload = _b64encode(f"{TICKET_VERSION}|{scope}|{claims.exp}|{claims.jti}|{stream_id}".encode())
+        return f"{payload}.{self._sign(payload)}", claims
+
+    def decode(self, ticket: str) -> Optional[TicketClaims]:
+        """서명이 맞으면 claims, 아니면 None (만료 여부는 확인하지 않음)"""
+        payload, sep, signature = ticket.rpartition(".")
+        if not sep:
+            return None
+        try:
+            expected = self._sign(payload)
+        except UnicodeEncodeError:
+            return None
+        if not hmac.compare_digest(expected, signature):
+            return None
+        try:
+            version, scope, exp, jti, stream_id = _b64decode(payload).decode().split("|", 4)
+            if version != TICKET_VERSION:
+                return None
+            return TicketClaims(stream_id, scope, int(exp), jti)
+        except ValueError:
+            return None
+
+
+class TicketRevocations:
+    """
+    폐기된 티켓 jti 집합
+
+    티켓은 만료되면 어차피 거부되므로 jti는 그 티켓의 만료 시각까지만 보관합니다.
+    최대 개수를 넘으면 가장 먼저 만료되는 것부터 버립니다.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._until: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+        self.evicted_total = 0
+
+    @classmethod
+    def from_settings(cls) -> "TicketRevocations":
+        return cls(max_entries=settings.PLAY_TICKET_REVOCATION_MAX)
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._until
+
+    def __len__(self) -> int:
+        return len(self._until)
+
+    def revoke(self, jti: str, until: int, now: Optional[float] = None) -> None:
+        self.evict(time.time() if now is None else now)
+        if jti in self._until:
+            return
+        while len(self._until) >= self.max_entries and self._heap:
+            _, oldest = heapq.heappop(self._heap)
+            self._until.pop(oldest, None)
+            self.evicted_total += 1
+        self._until[jti] = until
+        heapq.heappush(self._heap, (until, jti))
+
+    def evict(self, now: float) -> None:
+        """만료 시각이 지난 jti 제거"""
+        while self._heap and self._heap[0][0] < now:
+            _, jti = heapq.heappop(self._heap)
+            self._until.pop(jti, None)
+
+
+class SharedRevocationLog:
+    """
+    worker 프로세스 사이의 폐기 목록 공유 (PLAY_TICKET_REVOCATION_DIR)
+
+    폐기할 때 "{jti} {만료 시각}" 한 줄을 만료 시각의 시간(hour) 단위 파일({hour}.log)에 O_APPEND로 기록하고,
+    각 worker는 background task에서 sync_interval마다 새로 추가된 줄만 읽어 자기 TicketRevocations에 반영합니다.
+    판정 경로(authorize)는 계속 메모리만 보므로, 다른 worker에 반영되기까지 최대 sync_interval 걸립니다.
+    안의 티켓이 모두 만료된 시간대 파일은 지웁니다. 디렉토리를 지정하지 않으면 아무것도 하지 않습니다.
+    """
+
+    _SUFFIX = ".log"
+
+    def __init__(self, directory: Optional[Path], revocations: TicketRevocations, sync_interval: float = 1.0):
+        self.directory = directory
+        self.revocations = revocations
+        self.sync_interval = sync_interval
+        # 파일명 → 읽은 위치
+        self._offsets: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.published_total = 0
+        self.applied_total = 0
+        self.last_sync_at: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, revocations: TicketRevocations) -> "SharedRevocationLog":
+        directory = settings.PLAY_TICKET_REVOCATION_DIR
+        return cls(
+            directory=Path(directory) if directory else None,
+            revocations=revocations,
+            sync_interval=settings.PLAY_TICKET_REVOCATION_SYNC_INTERVAL,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def publish(self, jti: str, until: int, now: Optional[float] = None) -> None:
+        """다른 worker에 폐기 전달 (이미 만료된 티켓은 어차피 거부되므로 기록하지 않음)"""
+        if not self.enabled or until < (time.time() if now is None else now):
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.directory / f"{until // 3600}{self._SUFFIX}", os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # 짧은 한 줄을 한 번의 write로 append → 여러 worker가 동시에 기록해도 섞이지 않음
+            os.write(fd, f"{jti} {until}\n".encode("ascii"))
+        finally:
+            os.close(fd)
+        self.published_total += 1
+
+    def sync(self, now: Optional[float] = None) -> int:
+        """다른 worker가 기록한 폐기를 반영하고 반영한 줄 수를 반환"""
+        if not self.enabled or not self.directory.exists():
+            return 0
+        now = time.time() if now is None else now
+        current_hour = int(now) // 3600
+        applied = 0
+        for path in sorted(self.directory.glob("*" + self._SUFFIX)):
+            try:
+                hour = int(path.name[:-len(self._SUFFIX)])
+            except ValueError:
+                continue
+            if hour < current_hour:
+                # 이 시간대에 만료되는 티켓은 모두 만료됨
+                path.unlink(missing_ok=True)
+                self._offsets.pop(path.name, None)
+                continue
+            offset = self._offsets.get(path.name, 0)
+            try:
+                with open(path, 'rb') as f:
+                    f.seek(offset)
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            end = data.rfind(b"\n") + 1
+            self._offsets[path.name] = offset + end
+            for line in data[:end].splitlines():
+                jti, _, until = line.decode("ascii", "replace").partition(" ")
+                try:
+                    self.revocations.revoke(jti, int(until), now=now)
+                except ValueError:
+                    continue
+                applied += 1
+        self.applied_total += applied
+        self.last_sync_at = now
+        return applied
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "syncInterval": self.sync_interval,
+            "publishedTotal": self.published_total,
+            "appliedTotal": self.applied_total,
+            "lastSyncAt": self.last_sync_at,
+        }
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="play-ticket-revocation-sync")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception as e:  # pragma: no cover - 디스크 오류 등
+                print(f"[play-ticket] Failed to sync revocations: {e}")
+            await asyncio.sleep(self.sync_interval)
+
+
+class MediaMTXAuthorizer:
+    """
+    MediaMTX 외부 인증 요청 판정
+
+    요청 body 예: {"user", "password", "token", "ip", "action", "path", "protocol", "id", "query"}
+    티켓은 token (Authorization: Bearer), password, query의 token= / ticket= 순서로 찾습니다.
+    """
+
+    def __init__(
+        self,
+        signer: PlayTicketSigner,
+        revocations: TicketRevocations,
+        path_prefix: str = "",
+        open_actions: Tuple[str, ...] = (),
+    ):
+        self.signer = signer
+        self.revocations = revocations
+        self.path_prefix = path_prefix.strip("/") + "/" if path_prefix.strip("/") else ""
+        self.open_actions = frozenset(open_actions)
+
+        # 통계
+        self.allowed_total = 0
+        self.denied: Dict[str, int] = {}
+
+    @classmethod
+    def from_settings(cls, signer: PlayTicketSigner, revocations: TicketRevocations) -> "MediaMTXAuthorizer":
+        return cls(
+            signer=signer,
+            revocations=revocations,
+            path_prefix=settings.MEDIAMTX_PATH,
+            open_actions=tuple(a.strip() for a in settings.MEDIAMTX_AUTH_OPEN_ACTIONS.split(",") if a.strip()),
+        )
+
+    @staticmethod
+    def _ticket_of(request: dict) -> Optional[str]:
+        ticket = request.get("token") or request.get("password")
+        if ticket and isinstance(ticket, str):
+            return ticket
+        query = request.get("query")
+        if query and isinstance(query, str):
+            for part in query.split("&"):
+                key, _, value = part.partition("=")
+                if key in ("token", "ticket") and value:
+                    return value
+        return None
+
+    def authorize(self, request: dict, now: Optional[float] = None) -> Optional[str]:
+        """허용이면 None, 거부면 사유 문자열"""
+        reason = self._check(request, time.time() if now is None else now)
+        if reason is None:
+            self.allowed_total += 1
+        else:
+            self.denied[reason] = self.denied.get(reason, 0) + 1
+        return reason
+
+    def _check(self, request: dict, now: float) -> Optional[str]:
+        action = request.get("action")
+        if action in self.open_actions:
+            return None
+        scope = ACTION_SCOPES.get(action)
+        if scope is None:
+            return "action"
+
+        ticket = self._ticket_of(request)
+        if not ticket:
+            return "missing"
+        claims = self.signer.decode(ticket)
+        if claims is None:
+            return "signature"
+        if claims.exp < now:
+            return "expired"
+        if claims.scope != scope:
+            return "scope"
+        if request.get("path") != self.path_prefix + claims.stream_id:
+            return "path"
+        if claims.jti in self.revocations:
+            return "revoked"
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "openActions": sorted(self.open_actions),
+            "allowedTotal": self.allowed_total,
+            "deniedTotal": sum(self.denied.values()),
+            "denied": dict(self.denied),
+            "revocations": len(self.revocations),
+            "revocationsMax": self.revocations.max_entries,
+            "revocationsEvictedTotal": self.revocations.evicted_total,
+        }
+
+
+play_ticket_signer = PlayTicketSigner.from_settings()
+ticket_revocations = TicketRevocations.from_settings()
+revocation_log = SharedRevocationLog.from_settings(ticket_revocations)
+mediamtx_authorizer = MediaMTXAuthorizer.from_settings(play_ticket_signer, ticket_revocations)
@@ -0,0 +1,350 @@
+"""
+요청 단위 profiling (운영 중 느린 요청의 원인 확인용, opt-in)
+
+활성화 (PROFILING_TOKEN 또는 PROFILING_SAMPLE_RATE 를 설정했을 때만 미들웨어 / route 계측을 설치)
+- 요청 header X-Profile: <PROFILING_TOKEN> 이 일치하는 요청
+- PROFILING_SAMPLE_RATE 비율로 무작위 선택된 요청
+
+선택된 요청은 RequestProfile 하나를 ContextVar에 두고, 각 구간에서 시간을 기록합니다.
+- auth: 인증 미들웨어 (토큰 확인)
+- validation: 라우팅 후 endpoint 호출 전까지 (body 읽기 / 파라미터 · 요청 모델 검증 / 의존성,
+  sync endpoint는 threadpool 스레드로 넘어가는 대기 시간 포함)
+- handler: endpoint 함수 실행 (io 포함)
+- io: handler 안의 파일 읽기 (read_latest, query_logs)
+- serialization: endpoint 반환 후 응답 시작까지 (response_model 검증 / JSON 인코딩)
+- total: 미들웨어 진입부터 응답 시작까지
+결과는 응답의 Server-Timing header로 돌려주고, 최근 PROFILING_MAX_PROFILES 개를 메모리에 보관합니다.
+
+cProfile 호출 profile은 한 번에 한 요청만 기록합니다 (같은 스레드에 profiler를 둘 수 없고,
+event loop에서 동시에 실행되는 다른 요청의 코루틴도 함께 잡히기 때문). 그 사이 선택된 요청은
+구간 시간만 기록합니다. sync endpoint는 threadpool 스레드에서 별도 profiler로 기록해서 합칩니다
+(Python 3.12+ 는 profiler가 인터프리터 전체에 하나뿐이라 요청 profiler가 스레드 호출까지 기록).
+
+선택되지 않은 요청의 비용은 ContextVar 조회 몇 번뿐이고, 설정이 없으면 계측 자체를 설치하지 않습니다.
+보관된 profile은 프로세스(worker)별입니다.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import itertools
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+
+# Server-Timing 에 내보내는 순서
+PHASES = ("auth", "validation", "handler", "io", "serialization")
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    __slots__ = (
+        "id", "method", "path", "route", "status", "sampled", "started_at", "started",
+        "phases", "marks", "profiler", "thread_profilers", "calls", "context_token",
+    )
+
+    def __init__(self, profile_id: str, method: str, path: str, sampled: bool):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status: Optional[int] = None
+        self.sampled = sampled
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        # 직접 누적하는 구간 (auth, io) - 초
+        self.phases: Dict[str, float] = {}
+        # 경계 시각 (route, handler_start, handler_end, response_start) - perf_counter
+        self.marks: Dict[str, float] = {}
+        self.profiler: Optional[cProfile.Profile] = None
+        self.thread_profilers: List[cProfile.Profile] = []
+        self.calls: List[dict] = []
+        self.context_token = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def mark(self, name: str) -> None:
+        self.marks[name] = time.perf_counter()
+
+    def timings(self) -> Dict[str, float]:
+        """구간별 시간 (초, 측정되지 않은 구간은 제외)"""
+        marks = self.marks
+        timings = dict(self.phases)
+        route = marks.get("route")
+        handler_start = marks.get("handler_start")
+        handler_end = marks.get("handler_end")
+        response_start = marks.get("response_start")
+        if route is not None and handler_start is not None:
+            timings["validation"] = handler_start - route
+        if handler_start is not None and handler_end is not None:
+            timings["handler"] = handler_end - handler_start
+        if handler_end is not None and response_start is not None:
+            timings["serialization"] = response_start - handler_end
+        end = response_start if response_start is not None else time.perf_counter()
+        timings["total"] = end - self.started
+        return timings
+
+    def server_timing(self) -> str:
+        timings = self.timings()
+        parts = [f"{name};dur={timings[name] * 1000:.3f}" for name in PHASES if name in timings]
+        parts.append(f"total;dur={timings['total'] * 1000:.3f}")
+        return ", ".join(parts)
+
+    def summary(self) -> dict:
+        timings = self.timings()
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "sampled": self.sampled,
+            "startedAt": datetime.fromtimestamp(self.started_at, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
+            "totalMs": round(timings.pop("total") * 1000, 3),
+            "phasesMs": {name: round(timings[name] * 1000, 3) for name in PHASES if name in timings},
+            "hasCalls": bool(self.calls),
+        }
+
+    def to_dict(self) -> dict:
+        data = self.summary()
+        data["calls"] = self.calls
+        return data
+
+
+class _Phase:
+    __slots__ = ("profile", "name", "started")
+
+    def __init__(self, profile: RequestProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.add(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def profile_phase(name: str):
+    """with profile_phase("io"): ... → profile 중인 요청이면 구간 시간 누적 (아니면 아무것도 안 함)"""
+    profile = _current_profile.get()
+    if profile is None:
+        return _NO_PHASE
+    return _Phase(profile, name)
+
+
+def add_phase(name: str, seconds: float) -> None:
+    """이미 시간을 재고 있는 곳에서 구간 시간만 더할 때"""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.add(name, seconds)
+
+
+class ProfileStore:
+    """
+    최근 profile 보관 (deque maxlen, 오래된 것부터 밀려남)
+    event loop 스레드에서만 추가 / 조회합니다.
+    """
+
+    def __init__(self, max_profiles: int = 50, top_calls: int = 40):
+        self.max_profiles = max_profiles
+        self.top_calls = top_calls
+        self._profiles: "deque[RequestProfile]" = deque(maxlen=max(max_profiles, 1))
+        self._ids = itertools.count(1)
+        # cProfile은 한 번에 한 요청만
+        self._calls_busy = False
+
+        # 통계
+        self.profiled = 0
+        self.sampled = 0
+        self.calls_skipped = 0
+
+    @classmethod
+    def from_settings(cls) -> "ProfileStore":
+        return cls(max_profiles=settings.PROFILING_MAX_PROFILES, top_calls=settings.PROFILING_TOP_CALLS)
+
+    def begin(self, method: str, path: str, sampled: bool) -> RequestProfile:
+        """profile 시작 (현재 context의 profile로 설정, 같은 task에서 finish 호출)"""
+        profile = RequestProfile(f"{os.getpid():x}-{next(self._ids)}", method, path, sampled)
+        profile.context_token = _current_profile.set(profile)
+        self.profiled += 1
+        if sampled:
+            self.sampled += 1
+        if self._calls_busy:
+            self.calls_skipped += 1
+        else:
+            self._calls_busy = True
+            profile.profiler = cProfile.Profile()
+            profile.profiler.enable()
+        return profile
+
+    def finish(self, profile: RequestProfile) -> None:
+        _current_profile.reset(profile.context_token)
+        profile.context_token = None
+        profiler = profile.profiler
+        if profiler is not None:
+            profiler.disable()
+            self._calls_busy = False
+            profile.calls = self._top_calls(profiler, profile.thread_profilers)
+            profile.profiler = None
+            profile.thread_profilers = []
+        self._profiles.append(profile)
+
+    def _top_calls(self, profiler: cProfile.Profile, others: List[cProfile.Profile]) -> List[dict]:
+        """누적 시간 기준 상위 함수 목록 (profile 대상 요청에서만, 응답을 보낸 뒤 계산)"""
+        stats = pstats.Stats(profiler)
+        for other in others:
+            stats.add(other)
+        rows = []
+        for (filename, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                "function": f"{filename}:{line}({func})",
+                "calls": ncalls,
+                "totalMs": round(tottime * 1000, 3),
+                "cumulativeMs": round(cumtime * 1000, 3),
+            })
+        rows.sort(key=lambda row: row["cumulativeMs"], reverse=True)
+        return rows[: self.top_calls]
+
+    def list(self, limit: Optional[int] = None) -> List[dict]:
+        profiles = list(self._profiles)[::-1]
+        if limit is not None:
+            profiles = profiles[:limit]
+        return [p.summary() for p in profiles]
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        for profile in self._profiles:
+            if profile.id == profile_id:
+                return profile.to_dict()
+        return None
+
+    def clear(self) -> None:
+        self._profiles.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": profiling_enabled(),
+            "sampleRate": settings.PROFILING_SAMPLE_RATE,
+            "stored": len(self._profiles),
+            "maxProfiles": self.max_profiles,
+            "profiled": self.profiled,
+            "sampled": self.sampled,
+            "callProfilesSkipped": self.calls_skipped,
+        }
+
+
+def profiling_enabled() -> bool:
+    return bool(settings.PROFILING_TOKEN) or settings.PROFILING_SAMPLE_RATE > 0
+
+
+def _enable_thread_profiler() -> Optional[cProfile.Profile]:
+    """
+    threadpool 스레드용 profiler 시작
+
+    Python 3.12+ 에서는 profiler가 인터프리터 전체에 하나만 켜질 수 있어 (요청 profiler가 이미 켜져 있으면
+    ValueError), 별도 profiler 없이 요청 profiler가 그대로 스레드의 호출도 기록합니다.
+    """
+    thread_profiler = cProfile.Profile()
+    try:
+        thread_profiler.enable()
+    except ValueError:
+        return None
+    return thread_profiler
+
+
+def _instrument_call(call):
+    """endpoint 함수 감싸기 (sync / async 구분을 유지해야 FastAPI가 threadpool 여부를 그대로 판단)"""
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_endpoint(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return await call(*args, **kwargs)
+            profile.mark("handler_start")
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                profile.mark("handler_end")
+
+        return async_endpoint
+
+    @functools.wraps(call)
+    def sync_endpoint(*args, **kwargs):
+        # threadpool 스레드에서 실행 (ContextVar는 run_in_threadpool이 복사해서 넘겨줌)
+        profile = _current_profile.get()
+        if profile is None:
+            return call(*args, **kwargs)
+        thread_profiler = None
+        if profile.profiler is not None and threading.current_thread() is not threading.main_thread():
+            thread_profiler = _enable_thread_profiler()
+        profile.mark("handler_start")
+        try:
+            return call(*args, **kwargs)
+        finally:
+            profile.mark("handler_end")
+            if thread_profiler is not None:
+                thread_profiler.disable()
+                profile.thread_profilers.append(thread_profiler)
+
+    return sync_endpoint
+
+
+def _instrument_app(route_app):
+    @functools.wraps(route_app)
+    async def app(scope, receive, send):
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.mark("route")
+        await route_app(scope, receive, send)
+
+    return app
+
+
+def instrument_routes(app: FastAPI) -> int:
+    """
+    등록된 APIRoute에 구간 경계 기록을 설치 (include_router 이후 한 번 호출)
+    - route.app: 라우팅 직후 (validation 시작)
+    - dependant.call: endpoint 시작 / 끝
+    설치한 route 수 반환
+    """
+    count = 0
+    for route in app.router.routes:
+        if not isinstance(route, APIRoute) or getattr(route, "_profiling_instrumented", False):
+            continue
+        route.dependant.call = _instrument_call(route.dependant.call)
+        route.app = _instrument_app(route.app)
+        route._profiling_instrumented = True
+        count += 1
+    return count
+
+
+profile_store = ProfileStore.from_settings()
@@ -0,0 +1,91 @@
+"""
+Version-scoped cache of encoded JSON responses
+
+Bodies for data that only changes with a version (e.g. the topology snapshot)
+are encoded once and reused until the version they were built for changes.
+The ETag is derived from (version, key) alone, so a conditional request can be
+answered with 304 without building a body (callers check that the resource
+exists first, so "*" only matches a current representation).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from app.core.config import settings
+
+
+def etag_for(version: str, key: str) -> str:
+    """Strong ETag for the response identified by key at the given version"""
+    return '"' + hashlib.sha1(f"{version}|{key}".encode()).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 (weak 비교, 목록 / "*" 지원)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class VersionedResponseCache:
+    def __init__(self, max_entries: int = 20000):
+        self.max_entries = max_entries
+        # key → (version, body, etag)
+        self._entries: "OrderedDict[str, Tuple[str, bytes, str]]" = OrderedDict()
+        # sync 핸들러는 threadpool에서 동시에 실행됨
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_settings(cls) -> "VersionedResponseCache":
+        return cls(max_entries=settings.TOPOLOGY_RESPONSE_CACHE_SIZE)
+
+    def get(self, version: str, key: str, build: Callable[[], bytes]) -> Tuple[bytes, str]:
+        """(body, etag) - 캐시에 없거나 다른 version으로 만든 것이면 build()로 다시 만들어 저장"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                if cached[0] == version:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return cached[1], cached[2]
+                self.invalidations += 1
+
+        # 만드는 동안에는 lock을 잡지 않음 (같은 key를 동시에 만들어도 결과는 같음)
+        body, etag = build(), etag_for(version, key)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (version, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body, etag
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "notModified": self.not_modified,
+            "invalidations": self.invalidations,
+        }
+
+
+topology_response_cache = VersionedResponseCache.from_settings()
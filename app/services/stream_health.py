@@ -0,0 +1,376 @@
+"""
+MediaMTX 스트림 상태 poller
+
+주기적으로 MediaMTX Control API에 path 상태를 물어보고 결과를 메모리 상태 테이블에 기록합니다.
+스트림 API는 정적인 토폴로지 status 대신 이 테이블을 읽습니다.
+
+확인 방식 (STREAM_HEALTH_MODE):
+- list (기본값): `/v3/paths/list`를 페이지 단위로 읽어 모든 path 상태를 한 번에 확인
+  (5천 스트림 = 요청 몇 건). API에 연결할 수 없으면 다음 확인까지 간격을 지수적으로 늘림
+- path: 스트림마다 `/v3/paths/get/{path}` 요청. 비정상(inactive / unreachable)이 이어지는
+  스트림은 스트림별로 확인 간격을 지수적으로 늘림
+
+공통:
+- 연결을 재사용하는 httpx AsyncClient 하나로 요청 (keep-alive pool)
+- 동시 요청 수는 STREAM_HEALTH_CONCURRENCY로 제한, 최대 확인 간격은 STREAM_HEALTH_MAX_BACKOFF
+- 상태가 바뀌면 version이 증가하고 등록된 listener에 (streamId, 이전 상태, 새 상태, 시각)을 전달
+
+상태 값:
+- active: path가 있고 publisher가 연결되어 ready
+- inactive: path가 없거나 ready가 아님
+- unreachable: MediaMTX API에 연결할 수 없거나 오류 응답
+"""
+
+from __future__ import annotations
+
+import asyncio
+import secrets
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.mock_data import get_topology
+from app.services.topology import Stream
+
+STATUS_ACTIVE = "active"
+STATUS_INACTIVE = "inactive"
+STATUS_UNREACHABLE = "unreachable"
+
+HEALTH_MODES = ("list", "path")
+
+# (streamId, 이전 상태, 새 상태, 변경 시각 epoch 초)
+TransitionListener = Callable[[str, Optional[str], str, float], None]
+
+
+class StreamHealth:
+    __slots__ = ("status", "checked_at", "changed_at", "failures", "next_check", "error")
+
+    def __init__(self):
+        self.status: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self.changed_at: Optional[float] = None
+        self.failures = 0
+        self.next_check = 0.0
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "checkedAt": self.checked_at,
+            "changedAt": self.changed_at,
+            "failures": self.failures,
+            "nextCheck": self.next_check,
+            "error": self.error,
+        }
+
+
+class StreamStatusTable:
+    """streamId → 최근 확인 결과 (읽기는 lock 없이 dict 조회)"""
+
+    def __init__(self):
+        self._entries: Dict[str, StreamHealth] = {}
+        # 어떤 스트림이든 상태가 바뀌면 증가 (응답 캐시 / ETag 무효화용)
+        self.version = 0
+        # worker 프로세스마다 상태가 다르므로 version 문자열에 프로세스별 값을 붙임
+        self._epoch = secrets.token_hex(4)
+        self._listeners: List[TransitionListener] = []
+        self._lock = threading.Lock()
+
+    @property
+    def version_tag(self) -> str:
+        """ETag 계산용 version (다른 프로세스의 version과 겹치지 않음)"""
+        return f"{self._epoch}.{self.version}"
+
+    def add_listener(self, listener: TransitionListener) -> None:
+        """상태 변경 listener 등록 (lifespan이 다시 시작되어도 한 번만 등록)"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def get(self, stream_id: str) -> Optional[StreamHealth]:
+        return self._entries.get(stream_id)
+
+    def status_of(self, stream: Stream) -> str:
+        """poller가 확인한 상태 (아직 확인 전이면 토폴로지의 정적 status)"""
+        entry = self._entries.get(stream.stream_id)
+        return entry.status if entry is not None and entry.status is not None else stream.status
+
+    def entry(self, stream_id: str) -> StreamHealth:
+        entry = self._entries.get(stream_id)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.setdefault(stream_id, StreamHealth())
+        return entry
+
+    def record(self, stream_id: str, status: str, now: float, error: Optional[str] = None) -> None:
+        entry = self.entry(stream_id)
+        old = entry.status
+        entry.checked_at = now
+        entry.error = error
+        if old == status:
+            return
+        entry.status = status
+        entry.changed_at = now
+        self.version += 1
+        for listener in self._listeners:
+            listener(stream_id, old, status, now)
+
+    def prune(self, stream_ids: set) -> None:
+        """토폴로지에서 빠진 스트림 정리"""
+        with self._lock:
+            for stream_id in [s for s in self._entries if s not in stream_ids]:
+                del self._entries[stream_id]
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in list(self._entries.values()):
+            key = entry.status or "unknown"
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+
+class StreamHealthPoller:
+    def __init__(
+        self,
+        api_url: str,
+        path_prefix: str = "",
+        mode: str = "list",
+        interval: float = 5.0,
+        concurrency: int = 8,
+        timeout: float = 2.0,
+        max_backoff: float = 60.0,
+        page_size: int = 1000,
+    ):
+        if mode not in HEALTH_MODES:
+            raise ValueError(f"Unknown stream health mode: {mode} (expected one of {HEALTH_MODES})")
+        self.mode = mode
+        self.page_size = page_size
+        self.api_url = api_url.rstrip("/")
+        self.path_prefix = path_prefix.strip("/")
+        self.interval = interval
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+
+        self.table = StreamStatusTable()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._topology_version: Optional[str] = None
+        # list 모드: API 전체에 대한 연속 실패 횟수 / 다음 확인 시각
+        self._failures = 0
+        self._next_sweep = 0.0
+
+        # 통계
+        self.cycles_total = 0
+        self.checks_total = 0
+        self.errors_total = 0
+        self.last_cycle_at: Optional[float] = None
+        self.last_cycle_duration: Optional[float] = None
+        self.last_cycle_checks = 0
+
+    @classmethod
+    def from_settings(cls) -> "StreamHealthPoller":
+        return cls(
+            api_url=f"http://{settings.MEDIAMTX_HOST}:{settings.MEDIAMTX_API_PORT}",
+            path_prefix=settings.MEDIAMTX_PATH,
+            mode=settings.STREAM_HEALTH_MODE,
+            interval=settings.STREAM_HEALTH_INTERVAL,
+            concurrency=settings.STREAM_HEALTH_CONCURRENCY,
+            timeout=settings.STREAM_HEALTH_TIMEOUT,
+            max_backoff=settings.STREAM_HEALTH_MAX_BACKOFF,
+            page_size=settings.STREAM_HEALTH_PAGE_SIZE,
+        )
+
+    def path_name(self, stream_id: str) -> str:
+        """MediaMTX path 이름 (WHEP URL과 같은 규칙: {MEDIAMTX_PATH}/{streamId})"""
+        return f"{self.path_prefix}/{stream_id}" if self.path_prefix else stream_id
+
+    def _backoff(self, failures: int) -> float:
+        """연속 실패 횟수별 다음 확인까지 간격 (interval, 2×, 4×, ... 최대 max_backoff)"""
+        return min(self.interval * (2 ** (failures - 1)), self.max_backoff)
+
+    # ============================================
+    # list 모드
+    # ============================================
+
+    async def _get_page(self, client: httpx.AsyncClient, page: int) -> dict:
+        response = await client.get("/v3/paths/list", params={"page": page, "itemsPerPage": self.page_size})
+        response.raise_for_status()
+        return response.json()
+
+    async def _fetch_ready_paths(self, client: httpx.AsyncClient) -> Dict[str, bool]:
+        """path 이름 → ready (첫 페이지로 전체 페이지 수를 확인한 뒤 나머지는 동시에 요청)"""
+        first = await self._get_page(client, 0)
+        pages = [first]
+        if first.get("pageCount", 1) > 1:
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def fetch(page: int) -> dict:
+                async with semaphore:
+                    return await self._get_page(client, page)
+
+            pages += await asyncio.gather(*(fetch(page) for page in range(1, first["pageCount"])))
+        return {item["name"]: bool(item.get("ready")) for page in pages for item in page.get("items") or ()}
+
+    async def _sweep(self, client: httpx.AsyncClient) -> int:
+        now = time.time()
+        if now < self._next_sweep:
+            return 0
+        try:
+            ready_paths = await self._fetch_ready_paths(client)
+            error = None
+        except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+            ready_paths = None
+            error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+
+        now = time.time()
+        stream_ids = list(self._due_streams(now, all_streams=True))
+        if ready_paths is None:
+            self._failures += 1
+            self._next_sweep = now + self._backoff(self._failures)
+            self.errors_total += 1
+            for stream_id in stream_ids:
+                self.table.record(stream_id, STATUS_UNREACHABLE, now, error)
+        else:
+            self._failures = 0
+            self._next_sweep = now + self.interval
+            for stream_id in stream_ids:
+                ready = ready_paths.get(self.path_name(stream_id))
+                self.table.record(stream_id, STATUS_ACTIVE if ready else STATUS_INACTIVE, now)
+        self.checks_total += len(stream_ids)
+        return len(stream_ids)
+
+    # ============================================
+    # path 모드
+    # ============================================
+
+    async def _probe(self, client: httpx.AsyncClient, stream_id: str) -> tuple:
+        """(상태, 오류 메시지)"""
+        try:
+            response = await client.get(f"/v3/paths/get/{self.path_name(stream_id)}")
+        except httpx.HTTPError as e:
+            return STATUS_UNREACHABLE, f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        if response.status_code == 404:
+            return STATUS_INACTIVE, None
+        if response.status_code != 200:
+            return STATUS_UNREACHABLE, f"HTTP {response.status_code}"
+        try:
+            ready = bool(response.json().get("ready"))
+        except ValueError:
+            return STATUS_UNREACHABLE, "Invalid JSON response"
+        return (STATUS_ACTIVE if ready else STATUS_INACTIVE), None
+
+    async def _check(self, client: httpx.AsyncClient, stream_id: str) -> None:
+        status, error = await self._probe(client, stream_id)
+        now = time.time()
+        entry = self.table.entry(stream_id)
+        if status == STATUS_ACTIVE:
+            entry.failures = 0
+            entry.next_check = now + self.interval
+        else:
+            # 비정상이 이어질수록 확인 간격을 늘림
+            entry.failures += 1
+            entry.next_check = now + self._backoff(entry.failures)
+        if status == STATUS_UNREACHABLE:
+            self.errors_total += 1
+        self.checks_total += 1
+        self.table.record(stream_id, status, now, error)
+
+    def _due_streams(self, now: float, all_streams: bool = False) -> Iterator[str]:
+        topology = get_topology()
+        if topology.version != self._topology_version:
+            self.table.prune({s.stream_id for s in topology.streams})
+            self._topology_version = topology.version
+        for stream in topology.streams:
+            entry = self.table.get(stream.stream_id)
+            if all_streams or entry is None or entry.next_check <= now:
+                yield stream.stream_id
+
+    async def _probe_due(self, client: httpx.AsyncClient) -> int:
+        due = self._due_streams(time.time())
+        checked = 0
+
+        async def worker() -> None:
+            nonlocal checked
+            # 모든 worker가 같은 iterator를 나눠 씀 → 동시 요청 수 = worker 수
+            for stream_id in due:
+                await self._check(client, stream_id)
+                checked += 1
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return checked
+
+    # ============================================
+    # 실행
+    # ============================================
+
+    async def poll_once(self, client: Optional[httpx.AsyncClient] = None) -> int:
+        """확인할 때가 된 스트림을 모두 확인하고 확인한 개수를 반환"""
+        client = client or self._client
+        started = time.perf_counter()
+        if self.mode == "list":
+            checked = await self._sweep(client)
+        else:
+            checked = await self._probe_due(client)
+
+        self.cycles_total += 1
+        self.last_cycle_at = time.time()
+        self.last_cycle_duration = time.perf_counter() - started
+        self.last_cycle_checks = checked
+        return checked
+
+    def make_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.api_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+
+    def stats(self) -> dict:
+        return {
+            "apiUrl": self.api_url,
+            "mode": self.mode,
+            "interval": self.interval,
+            "concurrency": self.concurrency,
+            "maxBackoff": self.max_backoff,
+            "running": self._task is not None,
+            "statusVersion": self.table.version,
+            "statusCounts": self.table.counts(),
+            "cyclesTotal": self.cycles_total,
+            "checksTotal": self.checks_total,
+            "errorsTotal": self.errors_total,
+            "lastCycleAt": self.last_cycle_at,
+            "lastCycleDuration": self.last_cycle_duration,
+            "lastCycleChecks": self.last_cycle_checks,
+        }
+
+    async def start(self) -> None:
+        self._client = self.make_client()
+        self._task = asyncio.create_task(self._run(), name="stream-health-poller")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            try:
+                await self.poll_once()
+            except Exception as e:  # pragma: no cover - 예상하지 못한 오류
+                print(f"[stream-health] Failed to poll MediaMTX: {e}")
+            await asyncio.sleep(max(self.interval - (time.perf_counter() - started), 0.1))
+
+
+stream_health_poller = StreamHealthPoller.from_settings()
+stream_status_table = stream_health_poller.table
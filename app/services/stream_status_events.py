@@ -0,0 +1,130 @@
+"""
+스트림 상태 변경 push (coalescing)
+
+StreamStatusTable의 상태 변경을 받아 broadcaster로 publish 합니다.
+같은 스트림의 이벤트는 STREAM_STATUS_EVENT_WINDOW 초에 최대 한 번만 보냅니다.
+- 마지막 이벤트 후 window가 지났으면 바로 전송
+- window 안에 다시 바뀌면 마지막 상태만 기억해 두었다가 window가 끝날 때 한 번 전송
+  (그 사이 원래 상태로 돌아왔으면 전송하지 않음)
+따라서 상태가 계속 흔들리는 카메라도 스트림당 초당 1/window 건을 넘지 않습니다.
+
+이벤트 형식:
+    {"streamId", "gateId", "stationId", "old", "new", "timestamp", "transitions"}
+transitions는 이 이벤트에 합쳐진 실제 상태 변경 횟수입니다.
+
+poller의 listener로 등록되므로 event loop 스레드에서만 호출됩니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.mock_data import get_topology
+from app.services.broadcaster import Broadcaster, stream_status_broadcaster
+
+
+class _Pending:
+    __slots__ = ("status", "new", "ts", "transitions", "handle")
+
+    def __init__(self, status: str):
+        # 마지막으로 전송한 상태
+        self.status = status
+        # window 안에서 바뀐 최신 상태 (없으면 None)
+        self.new: Optional[str] = None
+        self.ts = 0.0
+        self.transitions = 0
+        self.handle: Optional[asyncio.TimerHandle] = None
+
+
+class StreamStatusEvents:
+    def __init__(self, broadcaster: Broadcaster, window: float = 1.0):
+        self.broadcaster = broadcaster
+        self.window = window
+        # 최근 window 안에 이벤트를 보낸 스트림만 보관
+        self._recent: Dict[str, _Pending] = {}
+
+        # 통계
+        self.transitions_total = 0
+        self.published_total = 0
+        self.coalesced_total = 0
+        self.suppressed_total = 0
+
+    @classmethod
+    def from_settings(cls, broadcaster: Broadcaster) -> "StreamStatusEvents":
+        return cls(broadcaster=broadcaster, window=settings.STREAM_STATUS_EVENT_WINDOW)
+
+    def on_transition(self, stream_id: str, old: Optional[str], new: str, ts: float) -> None:
+        """StreamStatusTable listener"""
+        # 처음 확인한 상태는 변경이 아님 (기동 직후 전체 스트림이 한꺼번에 나가지 않도록)
+        if old is None:
+            return
+        self.transitions_total += 1
+
+        recent = self._recent.get(stream_id)
+        if recent is None:
+            recent = self._recent[stream_id] = _Pending(old)
+            self._emit(stream_id, recent, new, ts, 1)
+            return
+
+        # window 안의 변경 → 마지막 상태만 남기고 window 끝에 전송
+        self.coalesced_total += 1
+        recent.new = new
+        recent.ts = ts
+        recent.transitions += 1
+
+    def _emit(self, stream_id: str, recent: _Pending, new: str, ts: float, transitions: int) -> None:
+        old, recent.status = recent.status, new
+        recent.new = None
+        recent.transitions = 0
+        recent.handle = asyncio.get_running_loop().call_later(self.window, self._flush, stream_id)
+
+        topology = get_topology()
+        stream = topology.stream(stream_id)
+        gate = topology.gate(stream.gate_id) if stream else None
+        self.published_total += 1
+        self.broadcaster.publish({
+            "streamId": stream_id,
+            "gateId": stream.gate_id if stream else None,
+            "stationId": gate.station_id if gate else None,
+            "old": old,
+            "new": new,
+            "timestamp": datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z"),
+            "transitions": transitions,
+        })
+
+    def _flush(self, stream_id: str) -> None:
+        recent = self._recent.get(stream_id)
+        if recent is None:
+            return
+        if recent.new is None:
+            del self._recent[stream_id]
+        elif recent.new == recent.status:
+            # window 안에서 원래 상태로 돌아옴 → 보낼 변경 없음
+            self.suppressed_total += 1
+            del self._recent[stream_id]
+        else:
+            self._emit(stream_id, recent, recent.new, recent.ts, recent.transitions)
+
+    def close(self) -> None:
+        """대기 중인 timer 정리 (보류 중인 변경은 버림)"""
+        for recent in self._recent.values():
+            if recent.handle is not None:
+                recent.handle.cancel()
+        self._recent.clear()
+
+    def stats(self) -> dict:
+        return {
+            "window": self.window,
+            "pendingStreams": len(self._recent),
+            "transitionsTotal": self.transitions_total,
+            "publishedTotal": self.published_total,
+            "coalescedTotal": self.coalesced_total,
+            "suppressedTotal": self.suppressed_total,
+            "subscribers": self.broadcaster.stats(),
+        }
+
+
+stream_status_events = StreamStatusEvents.from_settings(stream_status_broadcaster)
@@ -0,0 +1,88 @@
+"""
+검증이 끝난 인증 토큰 캐시 (JWT 서명 검증을 토큰당 한 번만)
+
+key는 토큰 원문이 아니라 digest(blake2b 128bit)라서 메모리에 토큰이 남지 않습니다.
+값은 (claims, 만료 시각)이며 만료 시각은 토큰의 exp와 AUTH_TOKEN_CACHE_TTL 중 빠른 쪽입니다.
+만료된 항목은 조회 시 버리고, 최대 개수를 넘으면 가장 오래 쓰지 않은 항목부터 버립니다 (LRU).
+검증에 실패한 토큰은 캐시하지 않습니다.
+
+미들웨어(event loop 스레드)에서만 호출하므로 lock을 쓰지 않습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # digest → (claims, 만료 시각 epoch 초)
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_settings(cls) -> "VerifiedTokenCache":
+        return cls(max_entries=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL)
+
+    def get(self, digest: bytes, now: Optional[float] = None) -> Optional[dict]:
+        """캐시된 claims (없거나 만료되었으면 None)"""
+        cached = self._entries.get(digest)
+        if cached is None:
+            self.misses += 1
+            return None
+        if cached[1] <= (time.time() if now is None else now):
+            del self._entries[digest]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return cached[0]
+
+    def put(self, digest: bytes, claims: dict, now: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = (time.time() if now is None else now) + self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        self._entries[digest] = (claims, expires_at)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": self.hits / lookups if lookups else None,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+
+verified_token_cache = VerifiedTokenCache.from_settings()
@@ -0,0 +1,405 @@
+"""
+Station / gate / stream topology registry
+
+Records are immutable ``__slots__`` objects. ``TopologyRegistry`` builds
+id → record maps and parent → children indexes once, so every lookup used by
+the API is O(1) (children lookups return a precomputed tuple).
+
+``TopologyStore`` holds the current registry. When ``TOPOLOGY_FILE`` is set the
+topology is loaded from that YAML/JSON file, and the file is watched: a changed
+file is parsed and indexed in a worker thread, and the finished registry is
+swapped in with a single reference assignment. Readers that grab
+``store.current`` once per request always see one complete snapshot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import yaml
+
+from app.core.config import settings
+from app.services.json_codec import loads
+
+try:  # libyaml 바인딩이 있으면 C 파서 사용
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - libyaml 없이 설치된 환경
+    from yaml import SafeLoader as _YamlLoader
+
+
+class _Record:
+    """Base for immutable ``__slots__`` records"""
+
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, n) for n in self.__slots__))
+
+    def __repr__(self):
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Station(_Record):
+    __slots__ = ("station_id", "name")
+
+    def __init__(self, station_id: str, name: str):
+        super().__init__(station_id=station_id, name=name)
+
+
+class Gate(_Record):
+    __slots__ = ("gate_id", "station_id", "name")
+
+    def __init__(self, gate_id: str, station_id: str, name: str):
+        super().__init__(gate_id=gate_id, station_id=station_id, name=name)
+
+
+class Stream(_Record):
+    __slots__ = ("stream_id", "gate_id", "name", "status")
+
+    def __init__(self, stream_id: str, gate_id: str, name: str, status: str = "unknown"):
+        super().__init__(stream_id=stream_id, gate_id=gate_id, name=name, status=status)
+
+
+def _index_by(records: Iterable, attr: str, kind: str) -> Dict[str, _Record]:
+    index: Dict[str, _Record] = {}
+    for record in records:
+        key = getattr(record, attr)
+        if key in index:
+            raise ValueError(f"Duplicate {kind} id: {key}")
+        index[key] = record
+    return index
+
+
+def _group_by(records: Iterable, attr: str, parents: Dict[str, _Record], kind: str) -> Dict[str, Tuple]:
+    groups: Dict[str, list] = {key: [] for key in parents}
+    for record in records:
+        parent_id = getattr(record, attr)
+        if parent_id not in groups:
+            raise ValueError(f"{kind} {record} references unknown {attr}: {parent_id}")
+        groups[parent_id].append(record)
+    return {key: tuple(children) for key, children in groups.items()}
+
+
+class TopologyRegistry:
+    """Immutable, fully indexed snapshot of the station → gate → stream tree"""
+
+    __slots__ = (
+        "stations",
+        "gates",
+        "streams",
+        "_stations_by_id",
+        "_gates_by_id",
+        "_streams_by_id",
+        "_gates_by_station",
+        "_streams_by_gate",
+        "version",
+    )
+
+    def __init__(
+        self,
+        stations: Iterable[Station],
+        gates: Iterable[Gate],
+        streams: Iterable[Stream],
+        version: Optional[str] = None,
+    ):
+        self.stations: Tuple[Station, ...] = tuple(stations)
+        self.gates: Tuple[Gate, ...] = tuple(gates)
+        self.streams: Tuple[Stream, ...] = tuple(streams)
+        # 내용이 바뀌면 달라지는 값 (파일에서 읽은 경우 파일 내용의 hash)
+        self.version: str = version or _digest(repr((self.stations, self.gates, self.streams)).encode())
+
+        self._stations_by_id = _index_by(self.stations, "station_id", "station")
+        self._gates_by_id = _index_by(self.gates, "gate_id", "gate")
+        self._streams_by_id = _index_by(self.streams, "stream_id", "stream")
+        self._gates_by_station = _group_by(self.gates, "station_id", self._stations_by_id, "Gate")
+        self._streams_by_gate = _group_by(self.streams, "gate_id", self._gates_by_id, "Stream")
+
+    def station(self, station_id: str) -> Optional[Station]:
+        return self._stations_by_id.get(station_id)
+
+    def gate(self, gate_id: str) -> Optional[Gate]:
+        return self._gates_by_id.get(gate_id)
+
+    def stream(self, stream_id: str) -> Optional[Stream]:
+        return self._streams_by_id.get(stream_id)
+
+    def gates_of(self, station_id: str) -> Sequence[Gate]:
+        return self._gates_by_station.get(station_id, ())
+
+    def streams_of(self, gate_id: str) -> Sequence[Stream]:
+        return self._streams_by_gate.get(gate_id, ())
+
+    def __len__(self) -> int:
+        return len(self.stations) + len(self.gates) + len(self.streams)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+# ============================================
+# 파일 로드
+# ============================================
+
+def parse_topology(document: Any, version: Optional[str] = None) -> TopologyRegistry:
+    """
+    토폴로지 문서(dict) → TopologyRegistry
+
+    형식:
+        stations:
+          - stationId: station-001
+            name: 서울역
+            gates:
+              - gateId: gate-001
+                name: 1번 게이트
+                streams:
+                  - streamId: stream-001
+                    name: 1번 게이트 카메라
+                    status: active
+    """
+    if not isinstance(document, dict) or not isinstance(document.get("stations"), list):
+        raise ValueError("Topology document must be a mapping with a 'stations' list")
+
+    stations, gates, streams = [], [], []
+    try:
+        for station in document["stations"]:
+            station_id = station["stationId"]
+            stations.append(Station(station_id=station_id, name=station["name"]))
+            for gate in station.get("gates") or ():
+                gate_id = gate["gateId"]
+                gates.append(Gate(gate_id=gate_id, station_id=station_id, name=gate["name"]))
+                for stream in gate.get("streams") or ():
+                    streams.append(Stream(
+                        stream_id=stream["streamId"],
+                        gate_id=gate_id,
+                        name=stream["name"],
+                        status=stream.get("status", "unknown"),
+                    ))
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid topology record: missing or malformed field {e}") from e
+
+    return TopologyRegistry(stations, gates, streams, version=version)
+
+
+def station_document(
+    registry: TopologyRegistry,
+    station: Station,
+    status_of: Optional[Callable[[Stream], str]] = None,
+) -> dict:
+    """역 하나의 토폴로지 문서 (게이트 / 스트림 포함, status_of가 있으면 스트림 status를 그 값으로)"""
+    return {
+        "stationId": station.station_id,
+        "name": station.name,
+        "gates": [
+            {
+                "gateId": gate.gate_id,
+                "name": gate.name,
+                "streams": [
+                    {"streamId": s.stream_id, "name": s.name, "status": status_of(s) if status_of else s.status}
+                    for s in registry.streams_of(gate.gate_id)
+                ],
+            }
+            for gate in registry.gates_of(station.station_id)
+        ],
+    }
+
+
+def topology_document(registry: TopologyRegistry) -> dict:
+    """TopologyRegistry → 토폴로지 문서 (parse_topology의 역변환)"""
+    return {"stations": [station_document(registry, station) for station in registry.stations]}
+
+
+def load_topology_file(path: Path) -> TopologyRegistry:
+    """YAML(.yaml/.yml) 또는 JSON 토폴로지 파일을 읽어 registry 생성 (version = 파일 내용 hash)"""
+    data = path.read_bytes()
+    if path.suffix.lower() in (".yaml", ".yml"):
+        document = yaml.load(data, Loader=_YamlLoader)
+    else:
+        document = loads(data)
+    return parse_topology(document, version=_digest(data))
+
+
+# ============================================
+# Reload 격리
+# ============================================
+# 큰 파일의 JSON / YAML 파싱은 GIL을 오래 잡는 단일 호출이라 thread에서 돌려도
+# event loop가 멈춥니다. 그래서 reload 시에는 파싱과 검증을 별도 프로세스에서 하고,
+# 결과를 작은 pickle chunk로 받아 thread에서 registry를 만듭니다 (GIL이 자주 양보됨).
+
+_CHUNK_RECORDS = 2000
+
+Chunks = Tuple[List[bytes], List[bytes], List[bytes]]
+
+
+def _pickle_chunks(rows: List[tuple]) -> List[bytes]:
+    return [pickle.dumps(rows[i:i + _CHUNK_RECORDS]) for i in range(0, len(rows), _CHUNK_RECORDS)]
+
+
+def _parse_file_to_chunks(path: str) -> Chunks:
+    """(자식 프로세스) 파일을 파싱 / 검증하고 record 필드를 chunk 단위로 직렬화"""
+    registry = load_topology_file(Path(path))
+    return (
+        _pickle_chunks([(s.station_id, s.name) for s in registry.stations]),
+        _pickle_chunks([(g.gate_id, g.station_id, g.name) for g in registry.gates]),
+        _pickle_chunks([(s.stream_id, s.gate_id, s.name, s.status) for s in registry.streams]),
+    )
+
+
+def _registry_from_chunks(chunks: Chunks, version: str) -> TopologyRegistry:
+    station_chunks, gate_chunks, stream_chunks = chunks
+    return TopologyRegistry(
+        [Station(*row) for chunk in station_chunks for row in pickle.loads(chunk)],
+        [Gate(*row) for chunk in gate_chunks for row in pickle.loads(chunk)],
+        [Stream(*row) for chunk in stream_chunks for row in pickle.loads(chunk)],
+        version=version,
+    )
+
+
+def load_topology_file_isolated(path: Path, version: str) -> TopologyRegistry:
+    """load_topology_file과 같은 결과를, 파싱은 별도 프로세스에서 수행해서 생성"""
+    # 이미 thread가 여러 개인 프로세스에서 fork 하지 않도록 spawn 사용
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        chunks = pool.submit(_parse_file_to_chunks, str(path)).result()
+    return _registry_from_chunks(chunks, version)
+
+
+class TopologyStore:
+    """현재 토폴로지 snapshot 보관 및 파일 변경 시 hot reload"""
+
+    def __init__(
+        self,
+        default: TopologyRegistry,
+        path: Optional[Path] = None,
+        debounce: float = 0.5,
+        isolate_reload: bool = True,
+    ):
+        self.path = path
+        self.debounce = debounce
+        self.isolate_reload = isolate_reload
+        self._task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.loaded_at: Optional[float] = None
+        self.reloads_total = 0
+        self.failed_reloads_total = 0
+        self.last_error: Optional[str] = None
+        self.last_load_duration: Optional[float] = None
+
+        # 파일이 지정되어 있으면 기동 시 한 번 읽음 (실패하면 기동 실패)
+        self.current: TopologyRegistry = default
+        if path is not None:
+            self._load(isolate=False)
+
+    @classmethod
+    def from_settings(cls, default: TopologyRegistry) -> "TopologyStore":
+        path = Path(settings.TOPOLOGY_FILE) if settings.TOPOLOGY_FILE else None
+        return cls(
+            default=default,
+            path=path,
+            debounce=settings.TOPOLOGY_RELOAD_DEBOUNCE,
+            isolate_reload=settings.TOPOLOGY_RELOAD_ISOLATED,
+        )
+
+    def _load(self, isolate: bool) -> bool:
+        started = time.perf_counter()
+        if isolate:
+            # 내용이 같으면 (touch 등) 파싱하지 않음 - hashlib은 큰 입력에서 GIL을 놓음
+            version = _digest(self.path.read_bytes())
+            if version == self.current.version:
+                return False
+            registry = load_topology_file_isolated(self.path, version)
+        else:
+            registry = load_topology_file(self.path)
+        self.last_load_duration = time.perf_counter() - started
+        if registry.version == self.current.version:
+            return False
+        # 참조 한 번 교체 → 읽는 쪽은 이전 또는 새 snapshot 중 하나만 봄
+        self.current = registry
+        self.loaded_at = time.time()
+        return True
+
+    def reload(self) -> bool:
+        """파일을 다시 읽어 snapshot 교체 (내용이 같으면 교체하지 않음). 실패 시 기존 snapshot 유지"""
+        try:
+            swapped = self._load(isolate=self.isolate_reload)
+        except Exception as e:
+            # 파일 / YAML 오류 외에 파싱 프로세스 오류(BrokenProcessPool, pickle 오류 등)도
+            # watcher를 끝내지 않고 기존 snapshot으로 계속 서비스
+            self.failed_reloads_total += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"[topology] Failed to reload {self.path}: {self.last_error}")
+            return False
+        self.last_error = None
+        if swapped:
+            self.reloads_total += 1
+        return swapped
+
+    def stats(self) -> dict:
+        current = self.current
+        return {
+            "file": str(self.path) if self.path else None,
+            "version": current.version,
+            "stations": len(current.stations),
+            "gates": len(current.gates),
+            "streams": len(current.streams),
+            "loadedAt": self.loaded_at,
+            "lastLoadDuration": self.last_load_duration,
+            "reloadsTotal": self.reloads_total,
+            "failedReloadsTotal": self.failed_reloads_total,
+            "lastError": self.last_error,
+        }
+
+    async def start(self) -> None:
+        if self.path is not None:
+            self._task = asyncio.create_task(self._watch(), name="topology-watcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        from watchfiles import awatch
+
+        # 편집기 / 배포 도구는 파일을 새로 만들어 교체하므로 디렉토리를 감시하고 파일명으로 거름
+        name = self.path.name
+        async for _ in awatch(
+            self.path.parent,
+            watch_filter=lambda change, changed_path: Path(changed_path).name == name,
+            debounce=int(self.debounce * 1000),
+        ):
+            # 파싱 / index 생성은 worker thread에서 (event loop를 막지 않음)
+            try:
+                swapped = await asyncio.to_thread(self.reload)
+            except Exception as e:  # pragma: no cover - thread 생성 실패 등
+                print(f"[topology] Failed to reload {self.path}: {e}")
+                continue
+            if swapped:
+                print(f"[topology] Reloaded {self.path} (version {self.current.version})")
@@ -0,0 +1,167 @@
+"""
+Auth middleware benchmark: pure ASGI ApiV1AuthMiddleware vs the previous
+BaseHTTPMiddleware implementation
+
+Builds the API router under each middleware and drives the ASGI app
+in process (no sockets), so the numbers are the per-request cost of
+middleware + routing + handler. Measured on
+- GET /api/v1/ping      (public path)
+- GET /api/v1/stations  (authenticated, cached topology response)
+- GET /api/v1/stations  without a token (401)
+- GET /api/v1/stations  with a JWT (JWT_SECRET set), with and without the
+  verified-token cache (pure ASGI only)
+
+Usage:
+    python -m benchmarks.bench_auth_middleware [--requests 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import List, Optional
+
+os.environ.setdefault("DEV_AUTH_TOKEN", "bench-token")
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.api.v1.routes import api_router
+from app.core.config import settings
+from app.middlewares.auth import PUBLIC_PATHS, ApiV1AuthMiddleware, jwt
+from app.services.token_cache import verified_token_cache
+
+
+def _get_bearer_token(request: Request) -> Optional[str]:
+    auth = request.headers.get("Authorization", "")
+    if not auth:
+        return None
+    parts = auth.split(" ", 1)
+    if len(parts) != 2:
+        return None
+    scheme, token = parts[0], parts[1].strip()
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token
+
+
+class LegacyApiV1AuthMiddleware(BaseHTTPMiddleware):
+    """비교용: 순수 ASGI로 바꾸기 전의 BaseHTTPMiddleware 구현"""
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        if not path.startswith("/api/v1"):
+            return await call_next(request)
+        if path in PUBLIC_PATHS:
+            return await call_next(request)
+
+        token = _get_bearer_token(request)
+        if not token:
+            return JSONResponse(status_code=401, content={"detail": "Missing Authorization Bearer token"})
+
+        dev_jwt = settings.DEV_AUTH_TOKEN
+        if dev_jwt and token == dev_jwt:
+            return await call_next(request)
+        return JSONResponse(status_code=401, content={"detail": "Invalid token"})
+
+
+def _build_app(middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+    app.include_router(api_router, prefix=settings.API_V1_PREFIX)
+    return app
+
+
+async def _call(app, path: str, headers: list) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": headers, "client": ("127.0.0.1", 50000), "server": ("127.0.0.1", 8000),
+    }
+    disconnected = asyncio.Event()
+    status = 0
+
+    async def receive():
+        if not disconnected.is_set():
+            disconnected.set()
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # 클라이언트는 응답을 받을 때까지 연결을 유지
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _measure(app, path: str, headers: list, requests: int, expected: int) -> List[float]:
+    for _ in range(200):
+        await _call(app, path, headers)
+    samples = []
+    clock = time.perf_counter
+    for _ in range(requests):
+        started = clock()
+        status = await _call(app, path, headers)
+        samples.append(clock() - started)
+        if status != expected:
+            raise RuntimeError(f"{path}: expected {expected}, got {status}")
+    return samples
+
+
+def _summary(samples: List[float]) -> str:
+    samples = sorted(samples)
+    p99 = samples[max(int(len(samples) * 0.99) - 1, 0)]
+    return (
+        f"{len(samples) / sum(samples):8.0f} req/s   p50 {statistics.median(samples) * 1e6:7.1f} us   "
+        f"p99 {p99 * 1e6:7.1f} us"
+    )
+
+
+async def _run(requests: int) -> None:
+    token = [(b"authorization", f"Bearer {settings.DEV_AUTH_TOKEN}".encode())]
+    cases = [
+        ("GET /api/v1/ping", "/api/v1/ping", [], 200),
+        ("GET /api/v1/stations", "/api/v1/stations", token, 200),
+        ("GET /api/v1/stations (401)", "/api/v1/stations", [], 401),
+    ]
+    apps = [
+        ("BaseHTTPMiddleware", _build_app(LegacyApiV1AuthMiddleware)),
+        ("pure ASGI", _build_app(ApiV1AuthMiddleware)),
+    ]
+    for label, path, headers, expected in cases:
+        print(label)
+        for name, app in apps:
+            samples = await _measure(app, path, headers, requests, expected)
+            print(f"  {name:20s} {_summary(samples)}")
+
+    if jwt is None:
+        print("python-jose is not installed, skipping JWT cases")
+        return
+    settings.JWT_SECRET = "bench-jwt-secret"
+    bearer = jwt.encode({"sub": "bench", "exp": int(time.time()) + 3600}, settings.JWT_SECRET)
+    headers = [(b"authorization", f"Bearer {bearer}".encode())]
+    app = apps[1][1]
+    print("GET /api/v1/stations (JWT)")
+    for name, cache_size in (("token cache", verified_token_cache.max_entries), ("no cache", 0)):
+        verified_token_cache.clear()
+        verified_token_cache.max_entries = cache_size
+        samples = await _measure(app, "/api/v1/stations", headers, requests, 200)
+        print(f"  {name:20s} {_summary(samples)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+JSON backend benchmark (log writes, line parsing, large /latest pages)
+
+Compares the stdlib json module with the configured fast backend
+(app.services.json_codec, orjson when installed) on realistic error log
+records with a clientInfo payload:
+
+- write: encoding one JSONL line per record (ErrorLogWriter._write_batch)
+- parse: decoding stored lines (read_latest / query_logs / index rebuild)
+- GET /api/v1/error-logs/mediamtx/latest?limit=N, driven in process:
+  - decoded + JSONResponse: lines parsed to dicts, then FastAPI's
+    jsonable_encoder + stdlib JSONResponse (the previous path)
+  - decoded + FastJSONResponse: same, rendered by the fast backend
+  - raw passthrough: the actual endpoint, stored line bytes copied into
+    the body (lines are still parsed once to drop torn records)
+
+All three responses are checked to decode to the same document.
+
+Usage:
+    python -m benchmarks.bench_json [--records 20000] [--payload 512] [--limits 100,1000,5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+os.environ.setdefault("ERROR_LOG_DIR", tempfile.mkdtemp(prefix="bench-json-"))
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.api.v1.routes import api_router
+from app.core.config import settings
+from app.services import json_codec
+from app.services.error_log_reader import read_latest
+from app.services.json_codec import FastJSONResponse
+
+LATEST_PATH = f"{settings.API_V1_PREFIX}/error-logs/mediamtx/latest"
+
+
+def _record(rng: random.Random, i: int, payload: int) -> dict:
+    return {
+        "timestamp": f"2026-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}.{i % 1000:03d}Z",
+        "streamId": f"stream-{rng.randrange(500):04d}",
+        "errorType": rng.choice(["connection_failed", "whep_post_failed", "connection_closed"]),
+        "errorMessage": "WHEP 연결 실패: timeout",
+        "statusCode": rng.choice([None, 500, 502, 503]),
+        "whepUrl": f"http://mediamtx:8889/stitched/stream-{i % 500}/whep",
+        "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0",
+        "clientInfo": {"attempt": i % 5, "gate": f"G{i % 40:02d}", "trace": "x" * payload},
+    }
+
+
+def _time(fn: Callable[[], object], repeat: int = 5) -> float:
+    """best of `repeat` runs (seconds)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _write_logs(records: List[dict]) -> List[bytes]:
+    log_dir = Path(settings.ERROR_LOG_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    lines = [json_codec.dumps_line(record) for record in records]
+    (log_dir / "2026-01-01.jsonl").write_bytes(b"".join(lines))
+    return lines
+
+
+def _bench_codec(records: List[dict], lines: List[bytes]) -> None:
+    n = len(records)
+    std_write = _time(lambda: [(json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in records])
+    fast_write = _time(lambda: [json_codec.dumps_line(r) for r in records])
+    std_parse = _time(lambda: [json.loads(line) for line in lines])
+    fast_parse = _time(lambda: [json_codec.loads(line) for line in lines])
+    print(f"{n} records, backend={json_codec.BACKEND}")
+    print(f"  write  stdlib {std_write / n * 1e6:6.2f} us/record   {json_codec.BACKEND:6s} {fast_write / n * 1e6:6.2f} us/record")
+    print(f"  parse  stdlib {std_parse / n * 1e6:6.2f} us/record   {json_codec.BACKEND:6s} {fast_parse / n * 1e6:6.2f} us/record")
+
+
+def _build_apps() -> Tuple[FastAPI, FastAPI, FastAPI]:
+    def decoded_app(response_class) -> FastAPI:
+        app = FastAPI(default_response_class=response_class)
+
+        @app.get(LATEST_PATH)
+        def get_latest_logs(limit: int = 50):
+            logs = read_latest(Path(settings.ERROR_LOG_DIR), limit)
+            return {"logs": logs, "count": len(logs), "message": f"Retrieved {len(logs)} most recent error logs"}
+
+        return app
+
+    raw = FastAPI(default_response_class=FastJSONResponse)
+    raw.include_router(api_router, prefix=settings.API_V1_PREFIX)
+    return decoded_app(JSONResponse), decoded_app(FastJSONResponse), raw
+
+
+async def _get(app, path: str, query: bytes) -> Tuple[int, bytes]:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query,
+        "headers": [], "client": ("127.0.0.1", 50000), "server": ("127.0.0.1", 8000),
+    }
+    status = 0
+    body: List[bytes] = []
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(body)
+
+
+async def _bench_latest(limits: List[int], requests: int) -> None:
+    cases = list(zip(("decoded + JSONResponse", "decoded + FastJSONResponse", "raw passthrough"), _build_apps()))
+    for limit in limits:
+        query = f"limit={limit}".encode()
+        documents = []
+        for name, app in cases:
+            status, body = await _get(app, LATEST_PATH, query)
+            if status != 200:
+                raise RuntimeError(f"{name}: expected 200, got {status}")
+            documents.append(json.loads(body))
+        if any(document != documents[0] for document in documents[1:]):
+            raise RuntimeError(f"limit={limit}: responses differ")
+
+        print(f"GET /latest?limit={limit} ({len(body) / 1024:.0f} KiB)")
+        samples = {name: [] for name, _ in cases}
+        # 번갈아 여러 번 측정 (순서 효과 제거)
+        for _ in range(requests):
+            for name, app in cases:
+                started = time.perf_counter()
+                await _get(app, LATEST_PATH, query)
+                samples[name].append(time.perf_counter() - started)
+        for name, values in samples.items():
+            print(f"  {name:28s} p50 {statistics.median(values) * 1000:8.2f} ms   min {min(values) * 1000:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--payload", type=int, default=512, help="clientInfo padding (bytes)")
+    parser.add_argument("--limits", default="100,1000,5000", help="page sizes for /latest (comma separated)")
+    parser.add_argument("--requests", type=int, default=20, help="requests per page size and path")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    records = [_record(rng, i, args.payload) for i in range(args.records)]
+    lines = _write_logs(records)
+    _bench_codec(records, lines)
+    limits = [int(limit) for limit in args.limits.split(",")]
+    asyncio.run(_bench_latest(limits, args.requests))
+
+
+if __name__ == "__main__":
+    main()
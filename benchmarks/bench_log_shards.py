@@ -0,0 +1,150 @@
+"""
+Multi-process error log write benchmark (single file vs per-worker shards)
+
+Starts N writer processes (one ErrorLogWriter each, like N uvicorn workers)
+that append records with a large clientInfo payload for the same day, then
+checks what ended up on disk:
+
+- corrupt lines: lines that fail json.loads (interleaved / torn writes)
+- bad index entries: sidecar .idx entries whose offset does not point at a
+  complete record
+- throughput: records/s across all processes
+- merged read: read_latest / query_logs over the shards (k-way merge) and
+  the cost of compacting the day into one file
+
+Each mode writes into a fresh temporary directory. On a machine with fewer
+cores than processes the throughput numbers show contention, not scaling.
+
+Usage:
+    python -m benchmarks.bench_log_shards [--processes 4] [--records 2000] [--payload 16384]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.services.error_log_index import _decode_index_line, index_path_for, query_logs
+from app.services.error_log_reader import list_log_files, read_latest
+from app.services.error_log_shards import compact_day
+from app.services.error_log_writer import ErrorLogWriter, log_filename_for
+
+DAY = datetime(2026, 1, 8, tzinfo=timezone.utc)
+
+
+def _worker(log_dir: str, mode: str, wid: int, records: int, batch: int, payload: int, barrier) -> None:
+    writer = ErrorLogWriter(Path(log_dir), fsync_policy="none", write_mode=mode)
+    pad = "x" * payload
+    barrier.wait()
+    for start in range(0, records, batch):
+        items = []
+        for i in range(start, min(start + batch, records)):
+            ts = (DAY + timedelta(milliseconds=i * 100 + wid)).isoformat().replace("+00:00", "Z")
+            entry = {
+                "timestamp": ts,
+                "streamId": f"stream-{wid:03d}",
+                "errorType": "connection_failed",
+                "errorMessage": "bench",
+                "clientInfo": {"worker": wid, "seq": i, "pad": pad},
+            }
+            items.append((log_filename_for(ts), entry))
+        writer._write_batch(items)
+    writer._close_all()
+
+
+def _check(log_dir: Path) -> dict:
+    lines = corrupt = bad_index = 0
+    for log_path in list_log_files(log_dir):
+        data = log_path.read_bytes()
+        for line in data.splitlines():
+            lines += 1
+            try:
+                json.loads(line)
+            except ValueError:
+                corrupt += 1
+        idx_path = index_path_for(log_path)
+        if not idx_path.exists():
+            continue
+        for idx_line in idx_path.read_bytes().splitlines():
+            entry = _decode_index_line(idx_line)
+            if entry is None:
+                bad_index += 1
+                continue
+            offset, length = entry[0], entry[1]
+            record = data[offset:offset + length]
+            if not record.endswith(b"\n") or (offset > 0 and data[offset - 1:offset] != b"\n"):
+                bad_index += 1
+                continue
+            try:
+                json.loads(record)
+            except ValueError:
+                bad_index += 1
+    return {"lines": lines, "corrupt": corrupt, "badIndex": bad_index}
+
+
+def run(mode: str, processes: int, records: int, batch: int, payload: int) -> None:
+    log_dir = Path(tempfile.mkdtemp(prefix=f"bench_shards_{mode}_"))
+    try:
+        barrier = mp.Barrier(processes + 1)
+        workers = [
+            mp.Process(target=_worker, args=(str(log_dir), mode, wid, records, batch, payload, barrier))
+            for wid in range(processes)
+        ]
+        for p in workers:
+            p.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for p in workers:
+            p.join()
+        elapsed = time.perf_counter() - started
+
+        total = processes * records
+        check = _check(log_dir)
+        files = len(list_log_files(log_dir))
+        print(
+            f"{mode:8s} {processes} procs  {total / elapsed:9.0f} records/s  files {files}  "
+            f"lines {check['lines']}/{total}  corrupt {check['corrupt']}  bad index {check['badIndex']}"
+        )
+
+        started = time.perf_counter()
+        latest = read_latest(log_dir, 100)
+        latest_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        page, _ = query_logs(log_dir, stream_id="stream-000", limit=100)
+        query_ms = (time.perf_counter() - started) * 1000
+        print(f"{'':8s} read_latest(100) {latest_ms:7.1f} ms ({len(latest)})  query_logs(100) {query_ms:7.1f} ms ({len(page)})")
+
+        if mode == "sharded":
+            started = time.perf_counter()
+            target = compact_day(log_dir, DAY.date().isoformat())
+            compact_s = time.perf_counter() - started
+            check = _check(log_dir)
+            print(
+                f"{'':8s} compact -> {target.name if target else None} in {compact_s:.2f} s  "
+                f"lines {check['lines']}  corrupt {check['corrupt']}  bad index {check['badIndex']}"
+            )
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--records", type=int, default=2000, help="records per process")
+    parser.add_argument("--batch", type=int, default=50, help="records per write batch")
+    parser.add_argument("--payload", type=int, default=16384, help="clientInfo padding (bytes)")
+    args = parser.parse_args()
+
+    for mode in ("single", "sharded"):
+        for processes in sorted({1, args.processes}):
+            run(mode, processes, args.records, args.batch, args.payload)
+
+
+if __name__ == "__main__":
+    main()
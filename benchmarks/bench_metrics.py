@@ -0,0 +1,116 @@
+"""
+Metrics instrumentation overhead benchmark
+
+- Counter.inc() / Histogram.observe() cost per call
+- MetricsMiddleware around a no-op ASGI app vs the bare app (= per-request
+  instrumentation overhead)
+- GET /api/v1/stations through the full middleware stack with and without
+  MetricsMiddleware
+- concurrent updates from several threads (no lost updates)
+
+Usage:
+    python -m benchmarks.bench_metrics [--requests 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import threading
+import time
+
+os.environ.setdefault("DEV_AUTH_TOKEN", "bench-token")
+
+from fastapi import FastAPI
+
+from app.api.v1.routes import api_router
+from app.core.config import settings
+from app.middlewares.auth import ApiV1AuthMiddleware
+from app.middlewares.metrics import MetricsMiddleware
+from app.services.metrics import Counter, Histogram
+from benchmarks.bench_auth_middleware import _call, _measure, _summary
+
+
+def _per_call(fn, n: int = 200000) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - started) / n
+
+
+def bench_primitives() -> None:
+    counter = Counter("bench_total", "bench", ("method", "route", "status"))
+    histogram = Histogram("bench_seconds", "bench", ("method", "route"))
+    baseline = _per_call(lambda: None)
+    inc = _per_call(lambda: counter.inc("GET", "/api/v1/stations", 200)) - baseline
+    observe = _per_call(lambda: histogram.observe(0.0042, "GET", "/api/v1/stations")) - baseline
+    print(f"Counter.inc()        {inc * 1e9:7.0f} ns")
+    print(f"Histogram.observe()  {observe * 1e9:7.0f} ns")
+
+
+def bench_threads(threads: int = 4, per_thread: int = 100000) -> None:
+    counter = Counter("bench_threads_total", "bench")
+    histogram = Histogram("bench_threads_seconds", "bench")
+
+    def work():
+        for _ in range(per_thread):
+            counter.inc()
+            histogram.observe(0.001)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    expected = threads * per_thread
+    print(
+        f"{threads} threads x {per_thread}: counter {counter.value()} / {expected}, "
+        f"histogram {histogram.count()} / {expected}"
+    )
+
+
+async def _noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def bench_middleware(requests: int) -> None:
+    rounds = []
+    for _ in range(5):
+        bare = await _measure(_noop_app, "/noop", [], requests, 200)
+        wrapped = await _measure(MetricsMiddleware(_noop_app), "/noop", [], requests, 200)
+        rounds.append(statistics.mean(wrapped) - statistics.mean(bare))
+    print(f"MetricsMiddleware overhead per request: {statistics.median(rounds) * 1e6:.2f} us (median of 5 rounds)")
+
+    token = [(b"authorization", f"Bearer {settings.DEV_AUTH_TOKEN}".encode())]
+    apps = {}
+    for name, with_metrics in (("without metrics", False), ("with metrics", True)):
+        app = FastAPI()
+        app.add_middleware(ApiV1AuthMiddleware)
+        if with_metrics:
+            app.add_middleware(MetricsMiddleware)
+        app.include_router(api_router, prefix=settings.API_V1_PREFIX)
+        apps[name] = app
+    # 번갈아 여러 번 측정 (GC / 캐시 상태에 따른 순서 효과 제거)
+    samples = {name: [] for name in apps}
+    for _ in range(5):
+        for name, app in apps.items():
+            samples[name] += await _measure(app, "/api/v1/stations", token, requests // 5, 200)
+    for name in apps:
+        print(f"GET /api/v1/stations {name:16s} {_summary(samples[name])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    bench_primitives()
+    bench_threads()
+    asyncio.run(bench_middleware(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Play ticket / MediaMTX auth hook benchmark
+
+1. In-process: per-call latency of MediaMTXAuthorizer.authorize() for a valid
+   ticket, a bad signature and a revoked ticket.
+2. HTTP: starts the backend under uvicorn in a child process and fires bursts
+   of concurrent POST /api/v1/mediamtx/auth requests, one TCP connection per
+   request (like MediaMTX does for every viewer connect), reporting latency
+   percentiles per burst.
+
+Usage:
+    python -m benchmarks.bench_play_ticket [--connections 2000] [--bursts 3] [--iterations 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+from app.services.play_ticket import MediaMTXAuthorizer, PlayTicketSigner, TicketRevocations
+
+PORT = 18000
+SECRET = "bench-secret"
+
+
+def _percentiles(samples: List[float], unit: str, scale: float) -> str:
+    samples = sorted(samples)
+    p99 = samples[max(int(len(samples) * 0.99) - 1, 0)]
+    return (
+        f"p50 {statistics.median(samples) * scale:8.2f} {unit}   "
+        f"p99 {p99 * scale:8.2f} {unit}   max {samples[-1] * scale:8.2f} {unit}"
+    )
+
+
+def bench_in_process(iterations: int) -> None:
+    signer = PlayTicketSigner(SECRET.encode())
+    revocations = TicketRevocations()
+    authorizer = MediaMTXAuthorizer(signer, revocations, path_prefix="stitched")
+    ticket, _ = signer.issue("stream-0000-00-0")
+    revoked, claims = signer.issue("stream-0000-00-0")
+    revocations.revoke(claims.jti, claims.exp)
+
+    cases = {
+        "valid": ticket,
+        "bad signature": ticket[:-4] + "AAAA",
+        "revoked": revoked,
+    }
+    print(f"in-process authorize() x {iterations}:")
+    for name, token in cases.items():
+        request = {"action": "read", "path": "stitched/stream-0000-00-0", "token": token, "protocol": "webrtc"}
+        samples = []
+        clock = time.perf_counter
+        for _ in range(iterations):
+            started = clock()
+            authorizer.authorize(request)
+            samples.append(clock() - started)
+        print(f"  {name:14s} {_percentiles(samples, 'us', 1e6)}")
+
+
+async def _connect_once(body: bytes) -> float:
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    writer.write(
+        b"POST /api/v1/mediamtx/auth HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        b"Connection: close\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+    )
+    status = await reader.readline()
+    await reader.read()
+    writer.close()
+    if not status.startswith(b"HTTP/1.1 200"):
+        raise RuntimeError(f"unexpected response: {status!r}")
+    return time.perf_counter() - started
+
+
+async def _wait_ready(timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", PORT)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def bench_http(connections: int, bursts: int) -> None:
+    await _wait_ready()
+    signer = PlayTicketSigner(SECRET.encode())
+    ticket, _ = signer.issue("stream-001")
+    body = json.dumps({
+        "user": "", "password": "", "token": ticket, "ip": "127.0.0.1", "action": "read",
+        "path": "stitched/stream-001", "protocol": "webrtc", "id": None, "query": "",
+    }).encode()
+
+    # 연결 준비 (import / 첫 요청 비용 제외)
+    for _ in range(20):
+        await _connect_once(body)
+
+    sequential = [await _connect_once(body) for _ in range(500)]
+    print("HTTP auth hook:")
+    print(f"  sequential     {_percentiles(sequential, 'ms', 1e3)}")
+    print(f" {connections} concurrent connects per burst:")
+    for burst in range(bursts):
+        started = time.perf_counter()
+        samples = await asyncio.gather(*(_connect_once(body) for _ in range(connections)))
+        elapsed = time.perf_counter() - started
+        print(f"  burst {burst + 1}: {connections / elapsed:6.0f} req/s   {_percentiles(samples, 'ms', 1e3)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--bursts", type=int, default=3)
+    args = parser.parse_args()
+
+    bench_in_process(args.iterations)
+
+    env = {**os.environ, "PLAY_TICKET_SECRET": SECRET, "STREAM_HEALTH_ENABLED": "false", "MEDIAMTX_PATH": "stitched"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning",
+         "--backlog", str(max(args.connections, 2048))],
+        env=env,
+    )
+    try:
+        asyncio.run(bench_http(args.connections, args.bursts))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Request profiling overhead benchmark
+
+Builds the API router under the auth middleware and drives the ASGI app in
+process (see bench_auth_middleware), measuring GET /api/v1/stations and
+GET /api/v1/error-logs/mediamtx/latest:
+- profiling not installed (PROFILING_TOKEN / PROFILING_SAMPLE_RATE unset)
+- installed, request not selected (= cost paid by every request when on)
+- selected, phase timings only (another request holds the call profiler)
+- selected, phase timings + cProfile call profile
+
+Usage:
+    python -m benchmarks.bench_profiling [--requests 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("DEV_AUTH_TOKEN", "bench-token")
+os.environ.setdefault("ERROR_LOG_DIR", tempfile.mkdtemp(prefix="bench-profiling-"))
+
+from fastapi import FastAPI
+
+from app.api.v1.routes import api_router
+from app.core.config import settings
+from app.middlewares.auth import ApiV1AuthMiddleware
+from app.middlewares.profiling import ProfilingMiddleware
+from app.services.profiling import ProfileStore, instrument_routes
+from benchmarks.bench_auth_middleware import _measure, _summary
+
+PROFILE_TOKEN = "bench-profile"
+
+
+def _write_logs(records: int = 2000) -> None:
+    log_dir = Path(settings.ERROR_LOG_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    with open(log_dir / "mediamtx_errors_2026-01-01.jsonl", "w", encoding="utf-8") as f:
+        for i in range(records):
+            f.write(json.dumps({
+                "streamId": f"stream-{i % 50}", "errorType": "connection_failed", "errorMessage": "timeout",
+                "statusCode": 500, "timestamp": "2026-01-01T00:00:00Z",
+            }) + "\n")
+
+
+def _build_app(profiled: bool, store: ProfileStore) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ApiV1AuthMiddleware)
+    if profiled:
+        app.add_middleware(ProfilingMiddleware, store=store, token=PROFILE_TOKEN, sample_rate=0.0)
+    # 벤치마크마다 새 route 객체가 필요 (instrument_routes는 route를 직접 감쌈)
+    router = type(api_router)()
+    router.include_router(api_router)
+    app.include_router(router, prefix=settings.API_V1_PREFIX)
+    if profiled:
+        instrument_routes(app)
+    return app
+
+
+async def _run(requests: int) -> None:
+    _write_logs()
+    store = ProfileStore(max_profiles=50)
+    plain = _build_app(False, store)
+    profiled = _build_app(True, store)
+    token = [(b"authorization", f"Bearer {settings.DEV_AUTH_TOKEN}".encode())]
+    selected = token + [(b"x-profile", PROFILE_TOKEN.encode())]
+
+    for path in ("/api/v1/stations", "/api/v1/error-logs/mediamtx/latest"):
+        print(f"GET {path}")
+        samples = {"not installed": [], "not selected": []}
+        # 번갈아 여러 번 측정 (순서 효과 제거)
+        for _ in range(5):
+            samples["not installed"] += await _measure(plain, path, token, requests // 5, 200)
+            samples["not selected"] += await _measure(profiled, path, token, requests // 5, 200)
+        for name, values in samples.items():
+            print(f"  {name:26s} {_summary(values)}")
+        overhead = statistics.median(samples["not selected"]) - statistics.median(samples["not installed"])
+        print(f"  {'':26s} overhead p50 {overhead * 1e6:+.1f} us")
+
+        # 다른 요청이 call profiler를 쓰는 중이면 구간 시간만 기록
+        store._calls_busy = True
+        phases = await _measure(profiled, path, selected, requests // 5, 200)
+        store._calls_busy = False
+        print(f"  {'selected (phases only)':26s} {_summary(phases)}")
+        calls = await _measure(profiled, path, selected, requests // 20, 200)
+        print(f"  {'selected (+ cProfile)':26s} {_summary(calls)}")
+        print(f"  last profile: {store.list(1)[0]['phasesMs']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Stream health poller benchmark against the fake MediaMTX API
+
+Starts benchmarks.fake_mediamtx in a child process, installs a synthetic
+topology, and times full poll cycles while measuring event loop lag.
+
+Usage:
+    python -m benchmarks.bench_stream_health [--mode list|path] [--streams 5000] [--concurrency 8] [--latency 0.005]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.mock_data import topology_store
+from app.services.stream_health import StreamHealthPoller
+from app.services.topology import TopologyRegistry
+from benchmarks.bench_topology import build_network
+
+PORT = 19997
+
+
+async def _wait_ready(url: str, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(url + "/v3/paths/list")
+                return
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+
+async def _run(args) -> None:
+    url = f"http://127.0.0.1:{PORT}"
+    await _wait_ready(url)
+
+    poller = StreamHealthPoller(
+        api_url=url, path_prefix="stitched", mode=args.mode, concurrency=args.concurrency, interval=0
+    )
+    lags = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            expected = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            lags.append((time.perf_counter() - expected) * 1000)
+
+    async with poller.make_client() as client:
+        probe_task = asyncio.create_task(probe())
+        for cycle in range(args.cycles):
+            started = time.perf_counter()
+            checked = await poller.poll_once(client)
+            elapsed = time.perf_counter() - started
+            print(f"cycle {cycle + 1}: {checked} streams in {elapsed:.2f} s ({checked / elapsed:.0f} checks/s)")
+        done.set()
+        await probe_task
+
+    lags.sort()
+    print(f"status: {poller.table.counts()}")
+    print(
+        f"event loop lag during polling: p50 {statistics.median(lags):.2f} ms, "
+        f"p99 {lags[int(len(lags) * 0.99) - 1]:.2f} ms, max {lags[-1]:.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=5000)
+    parser.add_argument("--mode", choices=("list", "path"), default="list")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005, help="fake per-request MediaMTX latency (seconds)")
+    parser.add_argument("--cycles", type=int, default=3)
+    args = parser.parse_args()
+
+    gates = max(args.streams // 10, 1)
+    topology_store.current = TopologyRegistry(*build_network(1, gates, max(args.streams // gates, 1)))
+    print(f"topology: {len(topology_store.current.streams)} streams, mode {args.mode}, concurrency {args.concurrency}")
+
+    server = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.fake_mediamtx",
+        "--port", str(PORT), "--latency", str(args.latency), "--streams", str(args.streams),
+    ])
+    try:
+        asyncio.run(_run(args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
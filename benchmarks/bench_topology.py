@@ -0,0 +1,92 @@
+"""
+Topology lookup benchmark: linear scans vs. TopologyRegistry
+
+Builds a synthetic network (default: 600 stations, ~100k streams) and times
+the lookups used by the stations/gates/streams API.
+
+Usage:
+    python -m benchmarks.bench_topology [--stations 600] [--gates-per-station 20] [--streams-per-gate 9]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from app.services.topology import Gate, Station, Stream, TopologyRegistry
+
+
+def build_network(n_stations: int, gates_per_station: int, streams_per_gate: int):
+    stations, gates, streams = [], [], []
+    for s in range(n_stations):
+        station_id = f"station-{s:04d}"
+        stations.append(Station(station_id=station_id, name=f"역 {s}"))
+        for g in range(gates_per_station):
+            gate_id = f"gate-{s:04d}-{g:02d}"
+            gates.append(Gate(gate_id=gate_id, station_id=station_id, name=f"{g + 1}번 게이트"))
+            for c in range(streams_per_gate):
+                streams.append(Stream(
+                    stream_id=f"stream-{s:04d}-{g:02d}-{c}",
+                    gate_id=gate_id,
+                    name=f"{g + 1}번 게이트 카메라 {c + 1}",
+                    status="active",
+                ))
+    return stations, gates, streams
+
+
+def _time(fn: Callable[[str], object], keys: List[str]) -> float:
+    """key당 평균 소요 시간 (µs)"""
+    started = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - started) / len(keys) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, default=600)
+    parser.add_argument("--gates-per-station", type=int, default=20)
+    parser.add_argument("--streams-per-gate", type=int, default=9)
+    parser.add_argument("--lookups", type=int, default=200, help="linear scan lookups per case")
+    args = parser.parse_args()
+
+    stations, gates, streams = build_network(args.stations, args.gates_per_station, args.streams_per_gate)
+    print(f"network: {len(stations)} stations, {len(gates)} gates, {len(streams)} streams")
+
+    started = time.perf_counter()
+    registry = TopologyRegistry(stations, gates, streams)
+    print(f"registry build: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    rng = random.Random(0)
+    station_keys = [rng.choice(stations).station_id for _ in range(args.lookups)]
+    gate_keys = [rng.choice(gates).gate_id for _ in range(args.lookups)]
+    stream_keys = [rng.choice(streams).stream_id for _ in range(args.lookups)]
+
+    # 기존 mock_data 구현 (전체 리스트 선형 탐색)
+    linear = {
+        "station by id": (lambda k: next((s for s in stations if s.station_id == k), None), station_keys),
+        "gate by id": (lambda k: next((g for g in gates if g.gate_id == k), None), gate_keys),
+        "stream by id": (lambda k: next((s for s in streams if s.stream_id == k), None), stream_keys),
+        "gates of station": (lambda k: [g for g in gates if g.station_id == k], station_keys),
+        "streams of gate": (lambda k: [s for s in streams if s.gate_id == k], gate_keys),
+    }
+    indexed = {
+        "station by id": registry.station,
+        "gate by id": registry.gate,
+        "stream by id": registry.stream,
+        "gates of station": registry.gates_of,
+        "streams of gate": registry.streams_of,
+    }
+
+    print(f"\n{'lookup':<18} {'linear (µs)':>12} {'indexed (µs)':>13} {'speedup':>9}")
+    for name, (linear_fn, keys) in linear.items():
+        linear_us = _time(linear_fn, keys)
+        # O(1) 조회는 너무 빨라서 반복 횟수를 늘려 측정
+        indexed_us = _time(indexed[name], keys * 1000)
+        print(f"{name:<18} {linear_us:>12.1f} {indexed_us:>13.3f} {linear_us / indexed_us:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
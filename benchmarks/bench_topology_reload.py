@@ -0,0 +1,106 @@
+"""
+Topology hot reload benchmark
+
+Writes a synthetic topology file (default ~100k streams) and measures
+- how long a full parse + index takes (JSON and YAML)
+- event loop lag and /stations-style lookup latency while a reload runs in
+  a worker thread, compared with an idle baseline, with the file parsed in
+  the thread itself or in a child process (TOPOLOGY_RELOAD_ISOLATED)
+
+Usage:
+    python -m benchmarks.bench_topology_reload [--stations 600] [--gates-per-station 20] [--streams-per-gate 9]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import yaml
+
+from app.services.topology import TopologyRegistry, TopologyStore, topology_document
+from benchmarks.bench_topology import build_network
+
+
+async def _probe(store: TopologyStore, until: asyncio.Event, interval: float = 0.001) -> List[float]:
+    """interval마다 깨어나 조회를 한 번 수행하고, 예정 시각 대비 지연(ms)을 기록"""
+    lags = []
+    while not until.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        topology = store.current
+        topology.gates_of(topology.stations[0].station_id)
+        lags.append((time.perf_counter() - expected) * 1000)
+    return lags
+
+
+def _summary(lags: List[float]) -> str:
+    lags = sorted(lags)
+    p99 = lags[max(int(len(lags) * 0.99) - 1, 0)]
+    return f"p50 {statistics.median(lags):6.2f} ms   p99 {p99:6.2f} ms   max {lags[-1]:6.2f} ms"
+
+
+async def _measure(store: TopologyStore, rewrite) -> None:
+    # 기준값: reload 없이 1초
+    idle = asyncio.Event()
+    probe = asyncio.create_task(_probe(store, idle))
+    await asyncio.sleep(1.0)
+    idle.set()
+    baseline = await probe
+
+    # reload (worker thread) 동안
+    rewrite()
+    done = asyncio.Event()
+    probe = asyncio.create_task(_probe(store, done))
+    started = time.perf_counter()
+    swapped = await asyncio.to_thread(store.reload)
+    reload_seconds = time.perf_counter() - started
+    done.set()
+    during = await probe
+
+    print(f"  reload: {reload_seconds * 1000:.0f} ms (swapped={swapped})")
+    print(f"  idle     lag: {_summary(baseline)}")
+    print(f"  reload   lag: {_summary(during)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, default=600)
+    parser.add_argument("--gates-per-station", type=int, default=20)
+    parser.add_argument("--streams-per-gate", type=int, default=9)
+    args = parser.parse_args()
+
+    stations, gates, streams = build_network(args.stations, args.gates_per_station, args.streams_per_gate)
+    document = topology_document(TopologyRegistry(stations, gates, streams))
+    print(f"network: {len(stations)} stations, {len(gates)} gates, {len(streams)} streams")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ("json", "yaml"):
+            path = Path(tmp) / f"topology.{fmt}"
+            generation = [0]
+
+            def rewrite():
+                # 매번 내용을 조금 바꿔서 version이 달라지게 함
+                generation[0] += 1
+                document["stations"][0]["name"] = f"역 0 (rev {generation[0]})"
+                if fmt == "json":
+                    path.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+                else:
+                    path.write_text(yaml.safe_dump(document, allow_unicode=True, sort_keys=False), encoding="utf-8")
+
+            rewrite()
+            print(f"\n{fmt}: {path.stat().st_size / 1024 / 1024:.1f} MiB")
+            for isolate in (False, True):
+                print(f" {'subprocess parse' if isolate else 'in-thread parse'}:")
+                store = TopologyStore(TopologyRegistry([], [], []), path=path, isolate_reload=isolate)
+                asyncio.run(_measure(store, rewrite))
+
+
+if __name__ == "__main__":
+    main()
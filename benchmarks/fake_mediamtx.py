@@ -0,0 +1,138 @@
+"""
+Fake MediaMTX Control API for local testing and benchmarks
+
+Implements the parts of the MediaMTX v3 API the backend uses:
+- GET /v3/paths/get/{name}  → {"name", "ready", ...} or 404 {"error": "path not found"}
+- GET /v3/paths/list        → {"itemCount", "pageCount", "items": [...]} (page / itemsPerPage)
+
+Path state is derived from a hash of the path name, so it is stable across
+restarts: --missing-ratio of paths do not exist, --ready-ratio of the rest are
+ready, and --flap-ratio of paths toggle their ready flag every --flap-period
+seconds. Optional --latency adds a per-request delay.
+
+Usage:
+    python -m benchmarks.fake_mediamtx --port 9997 --prefix stitched --streams 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import zlib
+from typing import Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+def _fraction(name: str, salt: str) -> float:
+    return (zlib.crc32(f"{salt}:{name}".encode()) & 0xFFFFFFFF) / 0xFFFFFFFF
+
+
+class FakeMediaMTX:
+    def __init__(
+        self,
+        prefix: str = "stitched",
+        streams: int = 5000,
+        ready_ratio: float = 0.95,
+        missing_ratio: float = 0.02,
+        flap_ratio: float = 0.0,
+        flap_period: float = 1.0,
+        latency: float = 0.0,
+    ):
+        self.prefix = prefix.strip("/")
+        self.streams = streams
+        self.ready_ratio = ready_ratio
+        self.missing_ratio = missing_ratio
+        self.flap_ratio = flap_ratio
+        self.flap_period = flap_period
+        self.latency = latency
+        self.requests_total = 0
+
+    def path_names(self):
+        """/v3/paths/list 에 나오는 path 이름 (benchmarks.bench_topology.build_network 의 스트림 ID 규칙)"""
+        gates = max(self.streams // 10, 1)
+        for g in range(gates):
+            for c in range(max(self.streams // gates, 1)):
+                stream_id = f"stream-0000-{g:02d}-{c}"
+                yield f"{self.prefix}/{stream_id}" if self.prefix else stream_id
+
+    def state(self, name: str) -> Optional[dict]:
+        if _fraction(name, "missing") < self.missing_ratio:
+            return None
+        ready = _fraction(name, "ready") < self.ready_ratio
+        if _fraction(name, "flap") < self.flap_ratio and int(time.time() / self.flap_period) % 2:
+            ready = not ready
+        return {
+            "name": name,
+            "confName": name,
+            "source": {"type": "rtspSession", "id": "fake"} if ready else None,
+            "ready": ready,
+            "readyTime": None,
+            "tracks": ["H264"] if ready else [],
+            "bytesReceived": 0,
+            "bytesSent": 0,
+            "readers": [],
+        }
+
+    async def get_path(self, request: Request) -> JSONResponse:
+        self.requests_total += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        state = self.state(request.path_params["name"])
+        if state is None:
+            return JSONResponse({"error": "path not found"}, status_code=404)
+        return JSONResponse(state)
+
+    async def list_paths(self, request: Request) -> JSONResponse:
+        self.requests_total += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        items = [state for state in map(self.state, self.path_names()) if state is not None]
+        per_page = int(request.query_params.get("itemsPerPage", 100))
+        page = int(request.query_params.get("page", 0))
+        page_count = max((len(items) + per_page - 1) // per_page, 1)
+        return JSONResponse({
+            "itemCount": len(items),
+            "pageCount": page_count,
+            "items": items[page * per_page:(page + 1) * per_page],
+        })
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/v3/paths/get/{name:path}", self.get_path),
+            Route("/v3/paths/list", self.list_paths),
+        ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9997)
+    parser.add_argument("--prefix", default="stitched")
+    parser.add_argument("--streams", type=int, default=5000, help="number of paths in /v3/paths/list")
+    parser.add_argument("--ready-ratio", type=float, default=0.95)
+    parser.add_argument("--missing-ratio", type=float, default=0.02)
+    parser.add_argument("--flap-ratio", type=float, default=0.0)
+    parser.add_argument("--flap-period", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.0, help="per-request delay (seconds)")
+    args = parser.parse_args()
+
+    fake = FakeMediaMTX(
+        prefix=args.prefix,
+        streams=args.streams,
+        ready_ratio=args.ready_ratio,
+        missing_ratio=args.missing_ratio,
+        flap_ratio=args.flap_ratio,
+        flap_period=args.flap_period,
+        latency=args.latency,
+    )
+    uvicorn.run(fake.app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
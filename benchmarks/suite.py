@@ -0,0 +1,572 @@
+"""
+Load / benchmark suite for the HTTP API
+
+Drives the app with an async HTTP client (httpx), either in process through
+the ASGI transport (lifespan included) or against the production launcher
+(python -m app.server) started in a child process, and reports throughput and p50/p95/p99 per case:
+
+- ingest        POST /error-logs/mediamtx storm, POST /error-logs/mediamtx/bulk
+                (500 records per request), then time until the writer queue
+                has drained to disk
+- latest        GET /error-logs/mediamtx/latest and /query over a synthetic log
+                directory (default 2 GiB over 7 days, generated once and
+                reused from --data-dir)
+- topology      GET /stations, /stations/{id}/gates, /gates/{id}/streams and
+                /topology/status on a ~100k stream topology file
+- play-tickets  POST /streams/{id}/play-ticket and /streams/play-tickets
+                (36 streams, one video wall) bursts, then POST /mediamtx/auth
+                with the issued tickets
+
+Results can be saved as a JSON baseline and compared against one later: a
+case regresses when throughput drops or p95 latency grows by more than
+--tolerance (exit status 1).
+
+Usage:
+    python -m benchmarks.suite [--target inprocess|server] [--scenarios ingest,latest,topology,play-tickets]
+                               [--scale 1.0] [--log-gb 2] [--save benchmarks/baselines/inprocess.json]
+                               [--baseline benchmarks/baselines/inprocess.json] [--tolerance 0.2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+SCENARIOS = ("topology", "play-tickets", "latest", "ingest")
+
+AUTH_TOKEN = "bench-token"
+PLAY_TICKET_SECRET = "bench-play-ticket-secret"
+SERVER_PORT = 18001
+
+# 실행 시 요청 1건 = (method, path, kwargs)
+RequestSpec = Tuple[str, str, dict]
+
+
+# ============================================
+# 결과 집계
+# ============================================
+
+def _percentile(samples: List[float], q: float) -> float:
+    return samples[min(max(int(len(samples) * q) - 1, 0), len(samples) - 1)]
+
+
+def summarize(latencies: List[float], elapsed: float, statuses: Dict[int, int], errors: int) -> dict:
+    samples = sorted(latencies)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "seconds": round(elapsed, 3),
+        "throughput": round(len(samples) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50Ms": round(statistics.median(samples) * 1000, 3) if samples else None,
+        "p95Ms": round(_percentile(samples, 0.95) * 1000, 3) if samples else None,
+        "p99Ms": round(_percentile(samples, 0.99) * 1000, 3) if samples else None,
+        "maxMs": round(samples[-1] * 1000, 3) if samples else None,
+    }
+
+
+def print_result(name: str, result: dict) -> None:
+    line = (
+        f"  {name:32s} {result['throughput']:9.1f} req/s   p50 {result['p50Ms']:8.2f} ms   "
+        f"p95 {result['p95Ms']:8.2f} ms   p99 {result['p99Ms']:8.2f} ms"
+    )
+    if result["errors"]:
+        line += f"   errors {result['errors']} {result['statuses']}"
+    extra = {k: v for k, v in result.items() if k not in _RESULT_KEYS}
+    if extra:
+        line += "   " + " ".join(f"{k}={v}" for k, v in extra.items())
+    print(line, flush=True)
+
+
+_RESULT_KEYS = {"requests", "errors", "statuses", "seconds", "throughput", "p50Ms", "p95Ms", "p99Ms", "maxMs"}
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    requests: List[RequestSpec],
+    concurrency: int,
+    ok: Callable[[int], bool] = lambda status: 200 <= status < 300,
+    warmup: bool = True,
+) -> dict:
+    """requests를 concurrency개 worker로 나눠 보내고 요청별 latency 집계"""
+    if warmup:
+        # 첫 요청 비용 제외 (index 생성, 응답 캐시 등)
+        method, path, kwargs = requests[0]
+        await client.request(method, path, **kwargs)
+
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    errors = 0
+    pending = iter(requests)
+    clock = time.perf_counter
+
+    async def worker():
+        nonlocal errors
+        for method, path, kwargs in pending:
+            started = clock()
+            response = await client.request(method, path, **kwargs)
+            latencies.append(clock() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if not ok(response.status_code):
+                errors += 1
+
+    started = clock()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, clock() - started, statuses, errors)
+
+
+# ============================================
+# 합성 데이터
+# ============================================
+
+ERROR_TYPES = ("connection_failed", "whep_post_failed", "connection_closed", "ice_failed")
+
+
+def _log_line(stream_id: str, error_type: str, status: int, timestamp: str, seq: int) -> str:
+    return json.dumps({
+        "timestamp": timestamp,
+        "streamId": stream_id,
+        "errorType": error_type,
+        "errorMessage": f"WHEP POST failed: {status} (attempt {seq % 7})",
+        "statusCode": status,
+        "whepUrl": f"http://10.0.0.10:8889/stitched/{stream_id}/whep",
+        "userAgent": "Mozilla/5.0 (X11; Linux x86_64) Chrome/120.0 Safari/537.36",
+        "clientInfo": {"browserName": "Chrome", "browserVersion": "120", "os": "Linux", "screenResolution": "1920x1080"},
+        "serverReceivedAt": timestamp,
+    }, ensure_ascii=False)
+
+
+def generate_logs(log_dir: Path, total_bytes: int, days: int, stream_ids: List[str]) -> None:
+    """
+    지난 days일 (어제까지) 날짜별 로그 파일을 합계 total_bytes 크기로 생성
+    같은 설정으로 이미 만들어 둔 디렉토리는 다시 만들지 않음 (index / rollup snapshot도 재사용)
+    """
+    marker = log_dir / ".bench-dataset.json"
+    spec = {"bytes": total_bytes, "days": days, "streams": len(stream_ids)}
+    today = datetime.now(timezone.utc).date()
+    names = [f"{today - timedelta(days=d)}.jsonl" for d in range(days, 0, -1)]
+    if marker.exists() and json.loads(marker.read_text()) == {**spec, "files": names}:
+        # 이전 실행의 ingest가 남긴 오늘 파일만 정리
+        for path in log_dir.iterdir():
+            if path.name.startswith(str(today)):
+                path.unlink()
+        return
+
+    if log_dir.exists():
+        shutil.rmtree(log_dir)
+    log_dir.mkdir(parents=True)
+    per_day = total_bytes // days
+    rng = random.Random(42)
+    print(f"generating {total_bytes / 1024 ** 3:.2f} GiB of logs over {days} days in {log_dir} ...", flush=True)
+    for name in names:
+        day = datetime.fromisoformat(name[:-len(".jsonl")]).replace(tzinfo=timezone.utc)
+        written = 0
+        seq = 0
+        with open(log_dir / name, "w", encoding="utf-8") as f:
+            chunk: List[str] = []
+            while written < per_day:
+                ts = (day + timedelta(milliseconds=seq * 86400000 * 300 // per_day)).isoformat()
+                line = _log_line(rng.choice(stream_ids), rng.choice(ERROR_TYPES), rng.choice((500, 502, 503, 504)),
+                                 ts.replace("+00:00", "Z"), seq) + "\n"
+                chunk.append(line)
+                written += len(line.encode())
+                seq += 1
+                if len(chunk) >= 10000:
+                    f.write("".join(chunk))
+                    chunk.clear()
+            f.write("".join(chunk))
+    marker.write_text(json.dumps({**spec, "files": names}))
+
+
+def generate_topology(path: Path, stations: int, gates_per_station: int, streams_per_gate: int) -> List[str]:
+    """토폴로지 JSON 파일 생성 (이미 있으면 재사용), stream id 목록 반환"""
+    from app.services.topology import TopologyRegistry, topology_document
+    from benchmarks.bench_topology import build_network
+
+    station_list, gates, streams = build_network(stations, gates_per_station, streams_per_gate)
+    document = json.dumps(topology_document(TopologyRegistry(station_list, gates, streams)), ensure_ascii=False)
+    if not path.exists() or path.read_text(encoding="utf-8") != document:
+        path.write_text(document, encoding="utf-8")
+    return [s.stream_id for s in streams]
+
+
+# ============================================
+# 대상 (in-process ASGI / uvicorn)
+# ============================================
+
+def bench_environ(data_dir: Path, log_dir: Path, topology_file: Path) -> Dict[str, str]:
+    return {
+        "DEV_AUTH_TOKEN": AUTH_TOKEN,
+        "JWT_SECRET": "",
+        "PLAY_TICKET_SECRET": PLAY_TICKET_SECRET,
+        "TOPOLOGY_FILE": str(topology_file),
+        "ERROR_LOG_DIR": str(log_dir),
+        "ERROR_LOG_ROLLUP_DIR": str(data_dir / "rollups"),
+        # 합성 로그가 압축 / 삭제되지 않도록
+        "ERROR_LOG_ARCHIVE_ENABLED": "false",
+        "ERROR_LOG_RETENTION_DAYS": "3650",
+        "ERROR_LOG_MAX_BYTES": str(1 << 50),
+        # 모든 레코드가 파일까지 기록되는 시간을 재도록 dedup 비활성화
+        "ERROR_LOG_DEDUP_WINDOW": "0",
+        "STREAM_HEALTH_ENABLED": "false",
+        "PROFILING_TOKEN": "",
+        "PROFILING_SAMPLE_RATE": "0",
+    }
+
+
+class InProcessTarget:
+    """같은 프로세스에서 ASGI app 직접 호출 (lifespan 포함, socket 없음)"""
+
+    name = "inprocess"
+
+    def __init__(self):
+        self._lifespan = None
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        from app.main import app
+
+        started = time.perf_counter()
+        self._lifespan = app.router.lifespan_context(app)
+        await self._lifespan.__aenter__()
+        self.startup_seconds = time.perf_counter() - started
+        self._client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+            headers={"Authorization": f"Bearer {AUTH_TOKEN}"},
+            timeout=120.0,
+        )
+        return self._client
+
+    async def __aexit__(self, *exc) -> None:
+        await self._client.aclose()
+        await self._lifespan.__aexit__(None, None, None)
+
+
+class ServerTarget:
+    """운영 실행과 같은 launcher(python -m app.server)를 자식 프로세스로 띄우고 TCP로 호출"""
+
+    name = "server"
+
+    def __init__(self, environ: Dict[str, str], workers: int, port: int = SERVER_PORT):
+        self.environ = environ
+        self.workers = workers
+        self.port = port
+        self._process: Optional[subprocess.Popen] = None
+
+    async def __aenter__(self) -> httpx.AsyncClient:
+        server_environ = {
+            "SERVER_HOST": "127.0.0.1",
+            "SERVER_PORT": str(self.port),
+            "SERVER_WORKERS": str(self.workers),
+            "SERVER_BACKLOG": "4096",
+            "SERVER_ACCESS_LOG": "false",
+        }
+        started = time.perf_counter()
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "app.server"], env={**os.environ, **self.environ, **server_environ}
+        )
+        self._client = httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{self.port}",
+            headers={"Authorization": f"Bearer {AUTH_TOKEN}"},
+            limits=httpx.Limits(max_connections=256, max_keepalive_connections=256),
+            timeout=120.0,
+        )
+        deadline = time.monotonic() + 600
+        while True:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"server exited with {self._process.returncode}")
+            try:
+                if (await self._client.get("/api/v1/ping")).status_code == 200:
+                    break
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+            await asyncio.sleep(0.2)
+        self.startup_seconds = time.perf_counter() - started
+        return self._client
+
+    async def __aexit__(self, *exc) -> None:
+        await self._client.aclose()
+        self._process.terminate()
+        self._process.wait(timeout=60)
+
+
+# ============================================
+# 시나리오
+# ============================================
+
+def _scaled(n: int, scale: float) -> int:
+    return max(int(n * scale), 1)
+
+
+async def scenario_topology(client: httpx.AsyncClient, ctx: dict) -> Dict[str, dict]:
+    rng = random.Random(1)
+    stream_ids = ctx["stream_ids"]
+    station_ids = sorted({"station-" + s.split("-")[1] for s in stream_ids})
+    gate_ids = sorted({"gate-" + "-".join(s.split("-")[1:3]) for s in stream_ids})
+    n = _scaled(5000, ctx["scale"])
+    c = ctx["concurrency"]
+    return {
+        "GET /stations": await run_load(client, [("GET", "/api/v1/stations", {})] * n, c),
+        "GET /stations/{id}/gates": await run_load(
+            client, [("GET", f"/api/v1/stations/{rng.choice(station_ids)}/gates", {}) for _ in range(n)], c
+        ),
+        "GET /gates/{id}/streams": await run_load(
+            client, [("GET", f"/api/v1/gates/{rng.choice(gate_ids)}/streams", {}) for _ in range(n)], c
+        ),
+        "GET /topology/status": await run_load(
+            client, [("GET", "/api/v1/topology/status", {})] * _scaled(200, ctx["scale"]), c
+        ),
+    }
+
+
+async def scenario_play_tickets(client: httpx.AsyncClient, ctx: dict) -> Dict[str, dict]:
+    rng = random.Random(2)
+    stream_ids = ctx["stream_ids"]
+    n = _scaled(5000, ctx["scale"])
+    c = ctx["concurrency"]
+    results = {
+        "POST /streams/{id}/play-ticket": await run_load(
+            client, [("POST", f"/api/v1/streams/{rng.choice(stream_ids)}/play-ticket", {}) for _ in range(n)], c
+        ),
+        "POST /streams/play-tickets (36)": await run_load(
+            client,
+            [("POST", "/api/v1/streams/play-tickets", {"json": {"streamIds": rng.sample(stream_ids, 36)}})
+             for _ in range(_scaled(500, ctx["scale"]))],
+            c,
+        ),
+    }
+
+    # MediaMTX가 재생 연결마다 보내는 auth hook (발급된 티켓으로)
+    response = await client.post("/api/v1/streams/play-tickets", json={"streamIds": rng.sample(stream_ids, 100)})
+    bodies = []
+    for ticket in response.json()["tickets"]:
+        path = urlsplit(ticket["whepUrl"]).path.strip("/")[:-len("/whep")]
+        bodies.append({
+            "user": "", "password": "", "token": ticket["playTicket"], "ip": "127.0.0.1", "action": "read",
+            "path": path, "protocol": "webrtc", "id": None, "query": "",
+        })
+    results["POST /mediamtx/auth"] = await run_load(
+        client, [("POST", "/api/v1/mediamtx/auth", {"json": rng.choice(bodies)}) for _ in range(n)], c
+    )
+    return results
+
+
+async def scenario_latest(client: httpx.AsyncClient, ctx: dict) -> Dict[str, dict]:
+    rng = random.Random(3)
+    n = _scaled(2000, ctx["scale"])
+    c = ctx["concurrency"]
+    return {
+        "GET /latest?limit=50": await run_load(
+            client, [("GET", "/api/v1/error-logs/mediamtx/latest", {"params": {"limit": 50}})] * n, c
+        ),
+        "GET /latest?limit=1000": await run_load(
+            client, [("GET", "/api/v1/error-logs/mediamtx/latest", {"params": {"limit": 1000}})] * (n // 10 or 1), c
+        ),
+        "GET /query?streamId (all days)": await run_load(
+            client,
+            [("GET", "/api/v1/error-logs/mediamtx/query", {"params": {"streamId": rng.choice(ctx["stream_ids"][:500]),
+                                                                        "limit": 100}})
+             for _ in range(n // 4 or 1)],
+            c,
+        ),
+    }
+
+
+def _ingest_record(rng: random.Random, stream_ids: List[str]) -> dict:
+    return {
+        "streamId": rng.choice(stream_ids),
+        "errorType": rng.choice(ERROR_TYPES),
+        "errorMessage": f"WHEP POST failed: 502 Bad Gateway ({rng.randrange(1000)})",
+        "statusCode": 502,
+        "whepUrl": "http://10.0.0.10:8889/stitched/whep",
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "userAgent": "Mozilla/5.0 (bench)",
+        "clientInfo": {"browserName": "Chrome", "browserVersion": "120", "os": "Linux", "screenResolution": "1920x1080"},
+    }
+
+
+async def _wait_drained(client: httpx.AsyncClient, timeout: float = 300.0) -> Tuple[float, dict]:
+    """받은 레코드가 모두 파일에 기록될 때까지 대기 → (대기 시간, writer stats)"""
+    started = time.perf_counter()
+    while True:
+        stats = (await client.get("/api/v1/error-logs/mediamtx/writer")).json()
+        drained = stats["queueDepth"] == 0 and stats["writtenTotal"] >= stats["acceptedTotal"]
+        if drained or time.perf_counter() - started > timeout:
+            return time.perf_counter() - started, stats
+        await asyncio.sleep(0.05)
+
+
+async def scenario_ingest(client: httpx.AsyncClient, ctx: dict) -> Dict[str, dict]:
+    rng = random.Random(4)
+    # 실제 장애 시처럼 스트림 일부에서 오류가 몰리는 상황 (dedup window 안의 중복 포함)
+    stream_ids = ctx["stream_ids"][:2000]
+    c = ctx["concurrency"]
+    results = {}
+
+    before = (await client.get("/api/v1/error-logs/mediamtx/writer")).json()
+    single = await run_load(
+        client,
+        [("POST", "/api/v1/error-logs/mediamtx", {"json": _ingest_record(rng, stream_ids)})
+         for _ in range(_scaled(20000, ctx["scale"]))],
+        c,
+        warmup=False,
+    )
+    drain, after = await _wait_drained(client)
+    single["drainSeconds"] = round(drain, 3)
+    single["accepted"] = after["acceptedTotal"] - before["acceptedTotal"]
+    single["written"] = after["writtenTotal"] - before["writtenTotal"]
+    results["POST /error-logs/mediamtx"] = single
+
+    before = after
+    bulk_requests = []
+    for _ in range(_scaled(200, ctx["scale"])):
+        body = "\n".join(json.dumps(_ingest_record(rng, stream_ids)) for _ in range(500)).encode()
+        bulk_requests.append((
+            "POST", "/api/v1/error-logs/mediamtx/bulk",
+            {"content": body, "headers": {"Content-Type": "application/x-ndjson"}},
+        ))
+    bulk = await run_load(client, bulk_requests, min(c, 16), warmup=False)
+    drain, after = await _wait_drained(client)
+    bulk["drainSeconds"] = round(drain, 3)
+    bulk["recordsPerSecond"] = round(len(bulk_requests) * 500 / (bulk["seconds"] + drain), 1)
+    bulk["accepted"] = after["acceptedTotal"] - before["acceptedTotal"]
+    bulk["written"] = after["writtenTotal"] - before["writtenTotal"]
+    results["POST /error-logs/mediamtx/bulk (500)"] = bulk
+    return results
+
+
+SCENARIO_FUNCS = {
+    "topology": scenario_topology,
+    "play-tickets": scenario_play_tickets,
+    "latest": scenario_latest,
+    "ingest": scenario_ingest,
+}
+
+
+# ============================================
+# baseline 비교
+# ============================================
+
+def compare(results: Dict[str, dict], baseline: dict, tolerance: float) -> List[str]:
+    """throughput 감소 또는 p95 증가가 tolerance를 넘는 case 목록"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        if base["throughput"] and result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {result['throughput']} < baseline {base['throughput']}")
+        if base["p95Ms"] and result["p95Ms"] > base["p95Ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95Ms']} ms > baseline {base['p95Ms']} ms")
+        if result["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: errors {result['errors']} > baseline {base.get('errors', 0)}")
+    return regressions
+
+
+async def run_suite(args, target, ctx: dict) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+    async with target as client:
+        print(f"target: {target.name} (startup {target.startup_seconds:.2f} s)", flush=True)
+        for scenario in args.scenarios:
+            print(f"[{scenario}]", flush=True)
+            for name, result in (await SCENARIO_FUNCS[scenario](client, ctx)).items():
+                print_result(name, result)
+                results[name] = result
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("inprocess", "server"), default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="server workers (--target server, 0 = one per CPU)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for request counts")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--log-gb", type=float, default=2.0, help="synthetic log directory size")
+    parser.add_argument("--log-days", type=int, default=7)
+    parser.add_argument("--stations", type=int, default=600)
+    parser.add_argument("--gates-per-station", type=int, default=20)
+    parser.add_argument("--streams-per-gate", type=int, default=9)
+    parser.add_argument("--data-dir", type=Path, default=Path(tempfile.gettempdir()) / "tmoney_bench_data")
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--baseline", type=Path, help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    selected = {s.strip() for s in args.scenarios.split(",") if s.strip()}
+    unknown = selected - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    # 항상 같은 순서로 (ingest가 오늘 날짜 파일을 만들기 전에 latest를 측정)
+    args.scenarios = [s for s in SCENARIOS if s in selected]
+
+    data_dir = args.data_dir
+    data_dir.mkdir(parents=True, exist_ok=True)
+    log_dir = data_dir / "logs"
+    topology_file = data_dir / "topology.json"
+    environ = bench_environ(data_dir, log_dir, topology_file)
+    # settings는 import 시점에 읽으므로 app 모듈을 import 하기 전에 설정
+    os.environ.update(environ)
+
+    stream_ids = generate_topology(topology_file, args.stations, args.gates_per_station, args.streams_per_gate)
+    if "latest" in args.scenarios or "ingest" in args.scenarios:
+        generate_logs(log_dir, int(args.log_gb * 1024 ** 3), args.log_days, stream_ids[:5000])
+    log_bytes = sum(p.stat().st_size for p in log_dir.glob("*.jsonl")) if log_dir.exists() else 0
+    print(f"topology: {len(stream_ids)} streams, logs: {log_bytes / 1024 ** 3:.2f} GiB", flush=True)
+
+    target = InProcessTarget() if args.target == "inprocess" else ServerTarget(environ, args.workers)
+    ctx = {"stream_ids": stream_ids, "scale": args.scale, "concurrency": args.concurrency}
+    results = asyncio.run(run_suite(args, target, ctx))
+
+    report = {
+        "meta": {
+            "createdAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "target": args.target,
+            "workers": args.workers,
+            "scale": args.scale,
+            "concurrency": args.concurrency,
+            "streams": len(stream_ids),
+            "logBytes": log_bytes,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"saved {args.save}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        for key in ("target", "workers", "scale", "concurrency", "logBytes", "cpus"):
+            if baseline.get("meta", {}).get(key) != report["meta"][key]:
+                print(f"warning: baseline {key}={baseline.get('meta', {}).get(key)!r}, this run {report['meta'][key]!r}")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"REGRESSIONS vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"no regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,17 @@
 #
 # MediaMTX 오류 로그 정리 스크립트
 #
-# 30일 이상 된 로그 파일을 자동으로 삭제합니다.
-# Cron으로 매일 실행하도록 설정하세요.
+# 1) 지난 날짜의 .jsonl 로그를 블록 단위 .jsonl.gz 로 압축 보관합니다.
+# 2) 보관 기간(RETENTION_DAYS)이 지났거나 용량(ERROR_LOG_MAX_BYTES)을 넘는 로그 파일을 삭제합니다.
+#
+# 서버 실행 중에는 서버가 같은 작업을 주기적으로 수행하므로,
+# 이 스크립트는 서버를 띄우지 않는 환경에서 Cron으로 실행할 때만 필요합니다.
 #
 
-LOG_DIR="/root/tmoney_control_center_be/logs/mediamtx_errors"
-RETENTION_DAYS=30
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+LOG_DIR="${LOG_DIR:-$SCRIPT_DIR/logs/mediamtx_errors}"
+RETENTION_DAYS="${RETENTION_DAYS:-365}"
+PYTHON="${PYTHON:-python3}"
 
 echo "=================================================="
 echo "MediaMTX Error Log Cleanup"
@@ -23,32 +28,16 @@ if [ ! -d "$LOG_DIR" ]; then
     exit 0
 fi
 
-# 삭제 전 파일 개수 확인
-TOTAL_FILES=$(find "$LOG_DIR" -name "*.jsonl" 2>/dev/null | wc -l)
-OLD_FILES=$(find "$LOG_DIR" -name "*.jsonl" -mtime +$RETENTION_DAYS 2>/dev/null | wc -l)
+cd "$SCRIPT_DIR" || exit 1
 
-echo "Total log files: $TOTAL_FILES"
-echo "Files older than $RETENTION_DAYS days: $OLD_FILES"
+# 지난 날짜 로그 압축 보관
+echo "Archiving closed log files..."
+ERROR_LOG_DIR="$LOG_DIR" "$PYTHON" -m app.services.error_log_archive || exit 1
 echo ""
 
-if [ "$OLD_FILES" -gt 0 ]; then
-    echo "Deleting old log files..."
-    
-    # 삭제할 파일 목록 표시 (옵션)
-    # find "$LOG_DIR" -name "*.jsonl" -mtime +$RETENTION_DAYS -ls
-    
-    # 오래된 로그 파일 삭제
-    find "$LOG_DIR" -name "*.jsonl" -mtime +$RETENTION_DAYS -delete
-    
-    if [ $? -eq 0 ]; then
-        echo "✅ Successfully deleted $OLD_FILES old log file(s)"
-    else
-        echo "❌ Failed to delete some files"
-        exit 1
-    fi
-else
-    echo "ℹ️  No old files to delete"
-fi
+# 보관 기간 / 용량 초과 로그 삭제 (sidecar index, 블록 index, rollup snapshot 포함)
+echo "Enforcing retention..."
+ERROR_LOG_DIR="$LOG_DIR" ERROR_LOG_RETENTION_DAYS="$RETENTION_DAYS" "$PYTHON" -m app.services.log_retention || exit 1
 
 echo ""
 echo "Cleanup completed at $(date '+%Y-%m-%d %H:%M:%S')"
@@ -0,0 +1,19 @@
+"""
+테스트 공통 설정
+
+app 모듈은 import 시점에 settings 로 singleton을 만들기 때문에 import 전에 환경 변수를 지정합니다.
+(로그 / rollup 디렉토리는 임시 디렉토리, 외부 MediaMTX polling은 끔)
+"""
+
+import os
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="tmoney-tests-")
+
+os.environ.setdefault("ENV", "test")
+os.environ.setdefault("APP_ENV", "test")
+os.environ.setdefault("DEV_AUTH_TOKEN", "test-token")
+os.environ.setdefault("ERROR_LOG_DIR", os.path.join(_TMP, "mediamtx_errors"))
+os.environ.setdefault("ERROR_LOG_ROLLUP_DIR", os.path.join(_TMP, "mediamtx_rollups"))
+os.environ.setdefault("STREAM_HEALTH_ENABLED", "false")
+os.environ.setdefault("PLAY_TICKET_SECRET", "test-secret")
@@ -0,0 +1,100 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.config import settings
+from app.main import app
+from app.middlewares.auth import ApiV1AuthMiddleware, PathMatcher
+
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+def test_path_matcher():
+    is_public = PathMatcher(["/api/v1/ping", "/api/v1/public/*"])
+    assert is_public("/api/v1/ping")
+    assert not is_public("/api/v1/ping/")
+    assert is_public("/api/v1/public/")
+    assert is_public("/api/v1/public/a/b")
+    assert not is_public("/api/v1/publicx")
+    assert not PathMatcher(["/api/v1/ping"])("/api/v1/pin")
+
+
+def _app() -> TestClient:
+    test_app = FastAPI()
+
+    @test_app.get("/api/v1/{path:path}")
+    def api(path: str, request: Request):
+        return {"path": path, "user": getattr(request.state, "user", None)}
+
+    @test_app.get("/health")
+    def health():
+        return {"ok": True}
+
+    test_app.add_middleware(
+        ApiV1AuthMiddleware,
+        public_paths=["/api/v1/ping", "/api/v1/public/*"],
+        query_token_paths=["/api/v1/events"],
+    )
+    return TestClient(test_app)
+
+
+def test_public_and_protected_paths():
+    client = _app()
+    # 공개 경로 / prefix 공개 경로 / /api/v1 밖의 경로는 토큰 없이 통과
+    assert client.get("/api/v1/ping").json()["user"] is None
+    assert client.get("/api/v1/public/x/y").status_code == 200
+    assert client.get("/health").status_code == 200
+
+    response = client.get("/api/v1/private")
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Missing Authorization Bearer token"}
+    assert client.get("/api/v1/private", headers={"Authorization": "Bearer wrong"}).json() == {"detail": "Invalid token"}
+    assert client.get("/api/v1/private", headers={"Authorization": "Basic test-token"}).status_code == 401
+
+    response = client.get("/api/v1/private", headers=AUTH)
+    assert response.status_code == 200
+    assert response.json()["user"] == {"sub": "dev-user", "role": "ADMIN"}
+
+
+def test_query_token_only_on_listed_paths():
+    client = _app()
+    # EventSource용 경로만 ?token= 허용
+    assert client.get("/api/v1/events?token=test-token").status_code == 200
+    assert client.get("/api/v1/events?token=wrong").status_code == 401
+    assert client.get("/api/v1/events").status_code == 401
+    assert client.get("/api/v1/private?token=test-token").status_code == 401
+
+
+def test_app_routes():
+    client = TestClient(app)
+    assert client.get("/api/v1/ping").status_code == 200
+    assert client.get("/api/v1/topology/status").status_code == 401
+    assert client.get("/api/v1/topology/status", headers=AUTH).status_code == 200
+
+
+def test_websocket_auth():
+    client = TestClient(app)
+    # 미들웨어는 WebSocket을 통과시키고 endpoint에서 확인 (없거나 틀린 토큰은 1008)
+    for path in ("/api/v1/streams/status/ws", "/api/v1/error-logs/mediamtx/ws"):
+        for url in (path, f"{path}?token=wrong"):
+            with pytest.raises(WebSocketDisconnect) as exc:
+                with client.websocket_connect(url) as ws:
+                    ws.receive_text()
+            assert exc.value.code == 1008
+
+        with client.websocket_connect(f"{path}?token=test-token"):
+            pass
+        with client.websocket_connect(path, headers=AUTH):
+            pass
+
+
+def test_dev_token_only_in_local_and_test(monkeypatch):
+    client = TestClient(app)
+    assert client.get("/api/v1/auth/stats", headers=AUTH).json()["mode"] == "dev"
+    assert client.post("/api/v1/token").json() == {"token": "test-token"}
+
+    # 운영 환경에서는 DEV 토큰으로 인증 / 발급 불가
+    monkeypatch.setattr(settings, "APP_ENV", "prod")
+    assert client.get("/api/v1/auth/stats", headers=AUTH).status_code == 401
+    assert client.post("/api/v1/token").status_code == 404
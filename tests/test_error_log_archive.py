@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.error_log_archive import ArchivedLogSource, archive_log_file, blocks_path_for
+
+
+def _archive(tmp_path, n=200, block_size=512):
+    lines = [f'{{"i":{i},"pad":"{"x" * (i % 17)}"}}\n'.encode() for i in range(n)]
+    log_path = tmp_path / "2026-03-10.jsonl"
+    log_path.write_bytes(b"".join(lines))
+    archived = archive_log_file(log_path, block_size=block_size)
+    return archived, lines
+
+
+def test_block_reads_match_original(tmp_path):
+    archived, lines = _archive(tmp_path)
+    raw = b"".join(lines)
+    assert blocks_path_for(archived).exists()
+
+    source = ArchivedLogSource(archived)
+    assert len(source._blocks) > 1
+    assert source.size() == len(raw)
+    # 블록 경계를 넘는 구간
+    assert source.read_range(500, 100) == raw[500:600]
+    assert source.read_ranges([(0, 10), (1000, 37)]) == [raw[:10], raw[1000:1037]]
+
+    offsets = [offset for offset, _ in source.iter_lines(start=len(lines[0]))]
+    assert len(offsets) == len(lines) - 1
+    assert list(source.iter_lines_reversed()) == [line.rstrip(b"\n") for line in reversed(lines)]
+
+
+def test_concurrent_block_reads(tmp_path):
+    archived, lines = _archive(tmp_path, n=2000, block_size=256)
+    raw = b"".join(lines)
+    source = ArchivedLogSource(archived)
+    # 여러 thread가 같은 source를 공유 (cache 크기보다 많은 블록을 번갈아 읽음)
+    ranges = [((i * 997) % (len(raw) - 300), 300) for i in range(400)]
+
+    def read(r):
+        offset, length = r
+        return source.read_range(offset, length) == raw[offset:offset + length]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert all(pool.map(read, ranges))
+    assert len(source._cache) <= source._BLOCK_CACHE_SIZE
@@ -0,0 +1,66 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services.error_log_writer import error_log_writer
+
+URL = "/api/v1/error-logs/mediamtx/bulk"
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+def _record(i: int) -> dict:
+    return {
+        "streamId": f"bulk-{i}",
+        "errorType": "connection_failed",
+        "errorMessage": "timeout",
+        "timestamp": "2026-03-10T00:00:00Z",
+    }
+
+
+def test_ndjson_and_array_bodies():
+    client = TestClient(app)
+    body = "\n".join([json.dumps(_record(0)), "{not json", json.dumps({"streamId": "x"})])
+    response = client.post(URL, content=body, headers={**AUTH, "Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["accepted"], data["rejected"]) == (1, 2)
+    assert [r["accepted"] for r in data["results"]] == [True, False, False]
+
+    response = client.post(URL, json=[_record(1), _record(2)], headers=AUTH)
+    assert response.json()["accepted"] == 2
+
+
+def test_records_over_limit_are_rejected_not_failed(monkeypatch):
+    monkeypatch.setattr(settings, "ERROR_LOG_BULK_MAX_RECORDS", 3)
+    before = error_log_writer.accepted_total
+
+    response = TestClient(app).post(URL, json=[_record(i) for i in range(5)], headers=AUTH)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["success"], data["accepted"], data["rejected"]) == (False, 3, 2)
+    assert [r["accepted"] for r in data["results"]] == [True, True, True, False, False]
+    assert data["results"][3]["error"].startswith("Too many records")
+    assert error_log_writer.accepted_total - before == 3
+
+
+def test_oversized_content_length_rejected_before_reading(monkeypatch):
+    monkeypatch.setattr(settings, "ERROR_LOG_BULK_MAX_RECORDS", 1)
+    monkeypatch.setattr(settings, "ERROR_LOG_BULK_MAX_RECORD_BYTES", 100)
+    before = error_log_writer.accepted_total
+
+    body = json.dumps([_record(0)] + [{"pad": "x" * 200}])
+    response = TestClient(app).post(URL, content=body, headers={**AUTH, "Content-Type": "application/json"})
+
+    assert response.status_code == 413
+    assert error_log_writer.accepted_total == before
+
+
+def test_non_array_body_is_400():
+    client = TestClient(app)
+    for body in ("{}", "", "  "):
+        response = client.post(URL, content=body, headers={**AUTH, "Content-Type": "application/json"})
+        assert response.status_code == 400, body
+        assert response.json()["detail"] == "Request body must be a JSON array"
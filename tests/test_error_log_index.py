@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.error_log_archive import archive_log_file
+from app.services.error_log_index import StaleCursor, decode_cursor, encode_cursor, get_day_index, query_logs
+from app.services.error_log_reader import PlainLogSource
+from app.services.error_log_shards import compact_day
+from app.services.error_log_writer import ErrorLogWriter, log_filename_for
+
+DAY = datetime(2026, 3, 10, tzinfo=timezone.utc)
+
+
+def _entry(i: int, stream_id: str = "s1") -> dict:
+    ts = (DAY + timedelta(seconds=i)).isoformat().replace("+00:00", "Z")
+    return {"timestamp": ts, "streamId": stream_id, "errorType": "connection_failed", "errorMessage": f"m{i}"}
+
+
+def _write(writer: ErrorLogWriter, entries) -> None:
+    writer._write_batch([(log_filename_for(e["timestamp"]), e) for e in entries])
+
+
+def _all_pages(log_dir, limit, **filters):
+    logs, cursor, pages = [], None, 0
+    while True:
+        page, cursor = query_logs(log_dir, limit=limit, cursor=cursor, **filters)
+        logs += page
+        pages += 1
+        if cursor is None:
+            return logs, pages
+
+
+def test_cursor_paging_and_filters(tmp_path):
+    writer = ErrorLogWriter(tmp_path, fsync_policy="none")
+    _write(writer, [_entry(i, "s1" if i % 2 else "s2") for i in range(10)])
+    writer._close_all()
+
+    logs, pages = _all_pages(tmp_path, 3)
+    assert [log["errorMessage"] for log in logs] == [f"m{i}" for i in range(10)]
+    assert pages == 4
+
+    logs, _ = _all_pages(tmp_path, 2, stream_id="s1")
+    assert [log["errorMessage"] for log in logs] == ["m1", "m3", "m5", "m7", "m9"]
+
+    logs, _ = query_logs(tmp_path, since=DAY + timedelta(seconds=3), until=DAY + timedelta(seconds=5))
+    assert [log["errorMessage"] for log in logs] == ["m3", "m4", "m5"]
+
+
+def test_cursor_format_round_trip():
+    cursor = encode_cursor("2026-03-10", {"2026-03-10.jsonl": (120, 42)})
+    assert decode_cursor(cursor) == ("2026-03-10", {"2026-03-10.jsonl": (120, 42)})
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_cursor_survives_archiving(tmp_path):
+    writer = ErrorLogWriter(tmp_path, fsync_policy="none")
+    _write(writer, [_entry(i) for i in range(10)])
+    writer._close_all()
+
+    first, cursor = query_logs(tmp_path, limit=4)
+    archived = archive_log_file(tmp_path / "2026-03-10.jsonl", block_size=256)
+    assert archived.name == "2026-03-10.jsonl.gz"
+
+    rest, _ = query_logs(tmp_path, limit=100, cursor=cursor)
+    assert [log["errorMessage"] for log in first + rest] == [f"m{i}" for i in range(10)]
+
+
+def test_cursor_rejected_after_compaction(tmp_path):
+    writers = [ErrorLogWriter(tmp_path, fsync_policy="none", write_mode="sharded") for _ in range(2)]
+    for i in range(10):
+        _write(writers[i % 2], [_entry(i)])
+    for writer in writers:
+        writer._close_all()
+    assert len(list(tmp_path.glob("2026-03-10.w*.jsonl"))) == 2
+
+    # shard 들은 timestamp 기준으로 merge
+    logs, _ = _all_pages(tmp_path, 3)
+    assert [log["errorMessage"] for log in logs] == [f"m{i}" for i in range(10)]
+
+    _, cursor = query_logs(tmp_path, limit=3)
+    assert compact_day(tmp_path, "2026-03-10") == tmp_path / "2026-03-10.jsonl"
+    with pytest.raises(StaleCursor):
+        query_logs(tmp_path, limit=3, cursor=cursor)
+
+
+def test_page_reads_each_file_once(tmp_path, monkeypatch):
+    writer = ErrorLogWriter(tmp_path, fsync_policy="none")
+    _write(writer, [_entry(i) for i in range(5)])
+    writer._close_all()
+
+    calls = []
+    original = PlainLogSource.read_ranges
+    monkeypatch.setattr(PlainLogSource, "read_range", lambda *args: pytest.fail("read_range per record"))
+    monkeypatch.setattr(PlainLogSource, "read_ranges", lambda self, ranges: calls.append(1) or original(self, ranges))
+
+    logs, _ = query_logs(tmp_path, limit=5)
+    assert len(logs) == 5
+    assert len(calls) == 1
+
+
+def test_match_starts_after_cursor(tmp_path):
+    writer = ErrorLogWriter(tmp_path, fsync_policy="none")
+    _write(writer, [_entry(i, "s1" if i % 3 else "s2") for i in range(30)])
+    writer._close_all()
+    day_index = get_day_index(tmp_path / "2026-03-10.jsonl")
+    assert day_index.ts_sorted
+
+    after = day_index.entries[9][0]
+    assert [e[0] for e in day_index.match(after_offset=after)] == [e[0] for e in day_index.entries[10:]]
+    assert [e[0] for e in day_index.match("s2", after_offset=after)] == [e[0] for e in day_index.entries[12::3]]
+    since_ms = int((DAY + timedelta(seconds=20)).timestamp() * 1000)
+    until_ms = int((DAY + timedelta(seconds=24)).timestamp() * 1000)
+    assert len(list(day_index.match(since_ms=since_ms, until_ms=until_ms))) == 5
+
+
+def test_unsorted_timestamps(tmp_path):
+    writer = ErrorLogWriter(tmp_path, fsync_policy="none")
+    # 클라이언트 timestamp는 기록 순서와 다를 수 있음
+    _write(writer, [_entry(i) for i in (5, 1, 7, 3, 9, 0)])
+    writer._close_all()
+    assert not get_day_index(tmp_path / "2026-03-10.jsonl").ts_sorted
+
+    logs, _ = _all_pages(tmp_path, 2)
+    assert [log["errorMessage"] for log in logs] == ["m5", "m1", "m7", "m3", "m9", "m0"]
+    logs, _ = query_logs(tmp_path, since=DAY + timedelta(seconds=3), until=DAY + timedelta(seconds=7))
+    assert [log["errorMessage"] for log in logs] == ["m5", "m7", "m3"]
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from app.services.error_log_reader import iter_lines_reversed, read_latest, read_latest_raw
+
+
+def _line(i: int, day: str = "2026-03-10") -> bytes:
+    return (json.dumps({"timestamp": f"{day}T00:00:{i:02d}Z", "n": i}) + "\n").encode()
+
+
+@pytest.mark.parametrize("block_size", [7, 64, 64 * 1024])
+def test_reversed_skips_partial_trailing_line(tmp_path, block_size):
+    path = tmp_path / "2026-03-10.jsonl"
+    # 마지막 라인은 writer가 아직 기록 중인 조각 (개행 없음), 중간의 빈 라인은 건너뜀
+    path.write_bytes(b"".join(_line(i) for i in range(20)) + b"\n" + b'{"timestamp": "2026-03-10T00:')
+    lines = list(iter_lines_reversed(path, block_size=block_size))
+    assert [json.loads(line)["n"] for line in lines] == list(range(19, -1, -1))
+
+
+def test_read_latest_across_days(tmp_path):
+    (tmp_path / "2026-03-09.jsonl").write_bytes(b"".join(_line(i, "2026-03-09") for i in range(5)))
+    # 손상된 라인은 건너뜀
+    (tmp_path / "2026-03-10.jsonl").write_bytes(_line(0) + b"not json\n" + _line(1) + b'{"n": ')
+
+    logs = read_latest(tmp_path, 4)
+    assert [(log["timestamp"][:10], log["n"]) for log in logs] == [
+        ("2026-03-10", 1), ("2026-03-10", 0), ("2026-03-09", 4), ("2026-03-09", 3),
+    ]
+    assert [json.loads(line) for line in read_latest_raw(tmp_path, 4)] == logs
+    assert read_latest(tmp_path, 0) == []
+    assert len(read_latest(tmp_path, 100)) == 7
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+from app.services.error_log_rollup import ErrorLogRollup
+
+DAY = datetime(2026, 3, 10, tzinfo=timezone.utc)
+
+
+def _ms(dt: datetime) -> int:
+    return int(dt.timestamp() * 1000)
+
+
+def _entry(dt: datetime, stream_id: str = "s1", error_type: str = "connection_failed", count: int = 1):
+    return (0, 0, _ms(dt), count, stream_id, error_type, None)
+
+
+def _rollup(tmp_path) -> ErrorLogRollup:
+    return ErrorLogRollup(tmp_path / "logs", tmp_path / "rollups")
+
+
+def test_query_window_and_filters(tmp_path):
+    rollup = _rollup(tmp_path)
+    rollup.on_written("2026-03-10.jsonl", [
+        _entry(DAY + timedelta(minutes=1)),
+        _entry(DAY + timedelta(minutes=1, seconds=30), count=3),
+        _entry(DAY + timedelta(minutes=2), stream_id="s2"),
+        _entry(DAY + timedelta(minutes=5), error_type="whep_post_failed"),
+    ], end_offset=100)
+
+    minute = _ms(DAY + timedelta(minutes=1)) // 60000
+    result = rollup.query(_ms(DAY + timedelta(minutes=1)), _ms(DAY + timedelta(minutes=2, seconds=59)))
+    assert result == {(minute, "s1", "connection_failed"): 4, (minute + 1, "s2", "connection_failed"): 1}
+
+    assert rollup.query(_ms(DAY), _ms(DAY + timedelta(hours=1)), stream_ids={"s2"}) == {
+        (minute + 1, "s2", "connection_failed"): 1,
+    }
+    assert rollup.query(_ms(DAY), _ms(DAY + timedelta(hours=1)), error_type="whep_post_failed") == {
+        (minute + 4, "s1", "whep_post_failed"): 1,
+    }
+    # until 은 그 분 전체를 포함
+    assert rollup.query(_ms(DAY + timedelta(minutes=5)), _ms(DAY + timedelta(minutes=5))) != {}
+    assert rollup.query(_ms(DAY + timedelta(minutes=6)), _ms(DAY + timedelta(minutes=10))) == {}
+
+
+def test_query_only_reads_days_near_window(tmp_path):
+    rollup = _rollup(tmp_path)
+    for days_ago in range(30):
+        dt = DAY - timedelta(days=days_ago)
+        rollup.on_written(f"{dt.date().isoformat()}.jsonl", [_entry(dt + timedelta(hours=12))], end_offset=10)
+    # 파일명 날짜는 클라이언트 timezone 기준이라 이웃 날짜 파일에 든 레코드도 집계
+    rollup.on_written("2026-03-11.jsonl", [_entry(DAY + timedelta(hours=23, minutes=30))], end_offset=10)
+
+    result = rollup.query(_ms(DAY), _ms(DAY + timedelta(days=1)) - 1)
+    assert sum(result.values()) == 2
+
+    # 창 밖의 날짜는 counts를 보지 않음
+    old = rollup._days["2026-02-15.jsonl"]
+    old.counts = None
+    assert sum(rollup.query(_ms(DAY - timedelta(days=2)), _ms(DAY)).values()) == 2
+
+
+def test_rename_and_drop(tmp_path):
+    rollup = _rollup(tmp_path)
+    rollup.on_written("2026-03-10.jsonl", [_entry(DAY)], end_offset=10)
+    rollup.rename("2026-03-10.jsonl", "2026-03-10.jsonl.gz")
+    assert sum(rollup.query(_ms(DAY), _ms(DAY)).values()) == 1
+    rollup.drop("2026-03-10.jsonl.gz")
+    assert rollup.query(_ms(DAY), _ms(DAY)) == {}
+
+
+def test_open_ended_window(tmp_path):
+    rollup = _rollup(tmp_path)
+    rollup.on_written("2026-03-10.jsonl", [_entry(DAY)], end_offset=10)
+    assert sum(rollup.query(-(2 ** 62), 2 ** 62).values()) == 1
@@ -0,0 +1,72 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from app.services.error_log_index import index_path_for, query_logs
+from app.services.error_log_shards import closed_shard_days, compact_day
+from app.services.error_log_writer import ErrorLogWriter, log_filename_for
+
+DAY = datetime(2026, 3, 10, tzinfo=timezone.utc)
+
+
+def _entry(i: int) -> dict:
+    ts = (DAY + timedelta(seconds=i)).isoformat().replace("+00:00", "Z")
+    return {"timestamp": ts, "streamId": "s1", "errorType": "connection_failed", "errorMessage": f"m{i}"}
+
+
+def _sharded_day(tmp_path, n=12):
+    writers = [ErrorLogWriter(tmp_path, fsync_policy="none", write_mode="sharded") for _ in range(3)]
+    # 레코드마다 다른 shard에 기록 (worker 3개)
+    for i in range(n):
+        entry = _entry(i)
+        writers[i % 3]._write_batch([(log_filename_for(entry["timestamp"]), entry)])
+    for writer in writers:
+        writer._close_all()
+    return writers
+
+
+def test_sharded_writers_use_own_files(tmp_path):
+    writers = _sharded_day(tmp_path)
+    assert sorted(w._shard.number for w in writers) == [0, 1, 2]
+    assert sorted(p.name for p in tmp_path.glob("2026-03-10.w*.jsonl")) == [
+        "2026-03-10.w0.jsonl", "2026-03-10.w1.jsonl", "2026-03-10.w2.jsonl",
+    ]
+    for writer in writers:
+        writer._shard.release()
+
+
+def test_compaction_merges_shards_in_timestamp_order(tmp_path):
+    writers = _sharded_day(tmp_path)
+    for writer in writers:
+        writer._shard.release()
+    # 이미 합쳐진 파일이 있으면 같이 merge
+    (tmp_path / "2026-03-10.jsonl").write_text(json.dumps(_entry(100)) + "\n", encoding="utf-8")
+
+    target = compact_day(tmp_path, "2026-03-10")
+    assert target == tmp_path / "2026-03-10.jsonl"
+    assert list(tmp_path.glob("2026-03-10.w*")) == []
+
+    lines = target.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["errorMessage"] for line in lines] == [f"m{i}" for i in list(range(12)) + [100]]
+    # index도 합친 파일 기준으로 새로 만듦
+    assert index_path_for(target).read_bytes().count(b"\n") == 13
+    logs, _ = query_logs(tmp_path, limit=100)
+    assert len(logs) == 13
+
+    # 합칠 shard가 없으면 아무것도 하지 않음
+    assert compact_day(tmp_path, "2026-03-10") is None
+
+
+def test_closed_shard_days(tmp_path):
+    writers = _sharded_day(tmp_path, n=3)
+    for writer in writers:
+        writer._shard.release()
+    now = (DAY + timedelta(days=1, hours=12)).timestamp()
+
+    # 최근에 수정된 shard가 있으면 아직 대상이 아님
+    assert closed_shard_days(tmp_path, now=now) == []
+    for shard in tmp_path.glob("2026-03-10.w*.jsonl"):
+        os.utime(shard, (now - 7200, now - 7200))
+    assert closed_shard_days(tmp_path, now=now) == ["2026-03-10"]
+    # 오늘 날짜는 대상이 아님
+    assert closed_shard_days(tmp_path, now=DAY.timestamp() + 7200 * 2) == []
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+
+from app.services.error_log_index import index_path_for
+from app.services.error_log_writer import ErrorLogWriter
+
+LOG = "2026-03-10.jsonl"
+
+
+def _entry(i: int, stream_id: str = "s1") -> dict:
+    return {"timestamp": f"2026-03-10T00:00:{i % 60:02d}Z", "streamId": stream_id, "errorType": "connection_failed", "n": i}
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_group_commit_by_batch_size(tmp_path):
+    writer = ErrorLogWriter(tmp_path, batch_size=100, flush_interval=5.0, fsync_policy="none")
+
+    async def run():
+        await writer.start()
+        # 이미 queue에 쌓인 레코드는 flush interval을 기다리지 않고 batch_size 단위로 기록
+        for i in range(250):
+            await writer.submit(LOG, _entry(i))
+        await writer.stop()
+
+    asyncio.run(run())
+    assert [log["n"] for log in _lines(tmp_path / LOG)] == list(range(250))
+    assert writer.batches_total == 3
+    assert writer.written_total == 250
+    assert index_path_for(tmp_path / LOG).read_bytes().count(b"\n") == 250
+
+
+def test_flush_interval_without_stop(tmp_path):
+    writer = ErrorLogWriter(tmp_path, batch_size=100, flush_interval=0.05, fsync_policy="none")
+
+    async def run():
+        await writer.start()
+        await writer.submit(LOG, _entry(0))
+        await writer.submit(LOG, _entry(1))
+        await asyncio.sleep(0.3)
+        # batch_size에 못 미쳐도 flush interval이 지나면 기록
+        written = _lines(tmp_path / LOG)
+        await writer.stop()
+        return written
+
+    assert [log["n"] for log in asyncio.run(run())] == [0, 1]
+    assert writer.batches_total == 1
+
+
+def test_dedup_window(tmp_path):
+    writer = ErrorLogWriter(tmp_path, flush_interval=0.01, fsync_policy="none", dedup_window=0.2)
+
+    async def run():
+        await writer.start()
+        for i in range(5):
+            await writer.submit(LOG, _entry(i))
+        await writer.submit(LOG, _entry(5, stream_id="s2"))
+        await asyncio.sleep(0.05)
+        # 첫 레코드는 window를 기다리지 않고 바로 기록
+        before = _lines(tmp_path / LOG)
+        await asyncio.sleep(0.4)
+        after_window = _lines(tmp_path / LOG)
+        # 새 window
+        await writer.submit(LOG, _entry(6))
+        await writer.submit(LOG, _entry(7))
+        await writer.stop()
+        return before, after_window
+
+    before, after_window = asyncio.run(run())
+    assert [(log["streamId"], log["n"]) for log in before] == [("s1", 0), ("s2", 5)]
+    assert "count" not in before[0]
+
+    # window가 끝나면 반복된 레코드만 합쳐서 기록 (반복이 없던 s2는 추가 기록 없음)
+    assert len(after_window) == 3
+    repeat = after_window[-1]
+    assert repeat["streamId"] == "s1" and repeat["count"] == 4
+    assert repeat["firstSeen"] == "2026-03-10T00:00:01Z"
+    assert repeat["lastSeen"] == "2026-03-10T00:00:04Z"
+
+    # 종료 시 열려 있던 window의 반복도 기록
+    logs = _lines(tmp_path / LOG)
+    assert [(log["n"], log.get("count")) for log in logs[3:]] == [(6, None), (7, 1)]
+    assert writer.stats()["dedup"]["coalescedTotal"] == 5
+
+
+def test_submit_without_running_writer(tmp_path):
+    writer = ErrorLogWriter(tmp_path, fsync_policy="none")
+    # 기동 전에는 worker thread에서 바로 기록
+    assert asyncio.run(writer.submit(LOG, _entry(0))) == tmp_path / LOG
+    writer._close_all()
+    assert [log["n"] for log in _lines(tmp_path / LOG)] == [0]
+
+
+def test_failed_write_is_retried(tmp_path, monkeypatch):
+    writer = ErrorLogWriter(tmp_path, flush_interval=0.01, fsync_policy="batch")
+    real_fsync = os.fsync
+    failures = [2]
+
+    def flaky_fsync(fd):
+        # 디스크 오류: 데이터는 파일에 들어갔지만 fsync 실패
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError(28, "No space left on device")
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", flaky_fsync)
+    monkeypatch.setattr("app.services.error_log_writer.WRITE_RETRY_INTERVAL", 0.2)
+
+    async def run():
+        await writer.start()
+        for i in range(3):
+            await writer.submit(LOG, _entry(i))
+        await asyncio.sleep(0.1)
+        stats = writer.stats()
+        await asyncio.sleep(0.6)
+        await writer.stop()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats["writeFailedTotal"] >= 3 and stats["retryPending"] == 3
+    # 실패한 시도에서 들어간 내용은 잘라내므로 중복 / 잘린 라인 없이 한 번씩
+    assert [log["n"] for log in _lines(tmp_path / LOG)] == [0, 1, 2]
+    assert index_path_for(tmp_path / LOG).read_bytes().count(b"\n") == 3
+    assert writer.stats()["writeFailedTotal"] == 6
+    assert writer.written_total == 3 and writer.dropped_total == 0
+
+
+def test_retry_buffer_is_bounded(tmp_path):
+    writer = ErrorLogWriter(tmp_path, queue_size=2)
+    writer._requeue([(LOG, _entry(i)) for i in range(3)], retry_at=0.0)
+    assert [entry["n"] for _, entry in writer._retry] == [1, 2]
+    assert writer.stats()["droppedTotal"] == 1
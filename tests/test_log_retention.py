@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.services.log_retention import LogRetention
+
+NOW = datetime(2026, 3, 10, 12, tzinfo=timezone.utc).timestamp()
+
+
+def _log(tmp_path, name: str, size: int = 100) -> Path:
+    path = tmp_path / name
+    path.write_bytes(b"x" * (size - 1) + b"\n")
+    return path
+
+
+def test_today_is_kept_despite_future_dated_file(tmp_path):
+    _log(tmp_path, "2026-03-08.jsonl")
+    today = _log(tmp_path, "2026-03-10.jsonl")
+    # 클라이언트 timestamp가 미래인 레코드로 생긴 파일
+    _log(tmp_path, "2026-04-01.jsonl")
+
+    retention = LogRetention(tmp_path, retention_days=30, max_bytes=50)
+    retention.run_once(now=NOW)
+    assert retention.last_evicted == ["2026-03-08.jsonl", "2026-04-01.jsonl"]
+    assert today.exists()
+    assert retention.over_budget
+
+
+def test_retention_days(tmp_path):
+    _log(tmp_path, "2026-01-01.jsonl")
+    _log(tmp_path, "2026-03-01.jsonl")
+    retention = LogRetention(tmp_path, retention_days=30, max_bytes=10 ** 6)
+    assert retention.run_once(now=NOW) == 100
+    assert retention.last_evicted == ["2026-01-01.jsonl"]
+    assert retention.total_bytes == 100
+
+
+class _Vanished:
+    """목록을 만든 뒤 압축 보관 / compaction 이 지운 임시 파일"""
+
+    def is_file(self):
+        return True
+
+    def stat(self):
+        raise FileNotFoundError(self)
+
+
+def test_files_removed_during_run(tmp_path, monkeypatch):
+    _log(tmp_path, "2026-03-09.jsonl")
+    original = Path.iterdir
+    monkeypatch.setattr(Path, "iterdir", lambda self: iter(list(original(self)) + [_Vanished()]))
+    assert LogRetention._dir_size(tmp_path) == 100
+    assert LogRetention(tmp_path, max_bytes=10 ** 6).run_once(now=NOW) == 0
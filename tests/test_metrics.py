@@ -0,0 +1,24 @@
+from app.services.metrics import MetricsRegistry
+
+
+def test_collector_error_is_counted():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests").inc()
+
+    def broken():
+        raise RuntimeError("stats unavailable")
+
+    def working():
+        return [("queue_depth", "gauge", "Queue depth", [({}, 3)])]
+
+    registry.add_collector(broken)
+    registry.add_collector(working)
+
+    # 실패한 collector는 건너뛰고 나머지는 그대로, 실패는 같은 scrape에서 바로 집계
+    text = registry.render()
+    assert "requests_total 1" in text
+    assert "queue_depth 3" in text
+    assert 'metrics_collector_errors_total{collector="test_collector_error_is_counted.<locals>.broken"} 1' in text
+
+    registry.render()
+    assert registry.collector_errors_total.value("test_collector_error_is_counted.<locals>.broken") == 2
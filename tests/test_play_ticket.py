@@ -0,0 +1,94 @@
+from app.services.play_ticket import (
+    MediaMTXAuthorizer,
+    PlayTicketSigner,
+    SharedRevocationLog,
+    TicketRevocations,
+    mediamtx_authorizer,
+)
+
+NOW = 1_800_000_000
+
+
+def _authorizer(**kwargs) -> MediaMTXAuthorizer:
+    return MediaMTXAuthorizer(PlayTicketSigner(b"secret"), TicketRevocations(), path_prefix="stitched", **kwargs)
+
+
+def test_publish_requires_opt_in():
+    # 기본 설정에서는 티켓 없는 publish를 허용하지 않음
+    assert mediamtx_authorizer.open_actions == frozenset()
+    request = {"action": "publish", "path": "stitched/s1"}
+    assert _authorizer().authorize(request, now=NOW) == "missing"
+    assert _authorizer(open_actions=("publish",)).authorize(request, now=NOW) is None
+
+
+def test_sign_and_verify():
+    signer = PlayTicketSigner(b"secret", ttl=60)
+    ticket, claims = signer.issue("s1", now=NOW)
+    decoded = signer.decode(ticket)
+    assert decoded.to_dict() == claims.to_dict()
+    assert decoded.exp == NOW + 60 and decoded.scope == "read"
+
+    # 다른 키 / 변조된 payload / 형식 오류
+    assert PlayTicketSigner(b"other").decode(ticket) is None
+    payload, signature = ticket.split(".")
+    assert signer.decode(payload[:-2] + "AA." + signature) is None
+    assert signer.decode("no-signature") is None
+    assert signer.decode("é." + signature) is None
+
+
+def test_authorize_ticket():
+    authorizer = _authorizer()
+    ticket, claims = authorizer.signer.issue("s1", ttl=60, now=NOW)
+    request = {"action": "read", "path": "stitched/s1", "token": ticket}
+
+    assert authorizer.authorize(request, now=NOW) is None
+    # password / query 로 전달한 티켓
+    assert authorizer.authorize({"action": "read", "path": "stitched/s1", "password": ticket}, now=NOW) is None
+    assert authorizer.authorize({"action": "read", "path": "stitched/s1", "query": f"a=1&ticket={ticket}"}, now=NOW) is None
+
+    assert authorizer.authorize(request, now=NOW + 61) == "expired"
+    assert authorizer.authorize({**request, "path": "stitched/s2"}, now=NOW) == "path"
+    assert authorizer.authorize({**request, "action": "publish"}, now=NOW) == "scope"
+    assert authorizer.authorize({**request, "action": "api"}, now=NOW) == "action"
+    assert authorizer.authorize({**request, "token": ticket + "x"}, now=NOW) == "signature"
+
+    authorizer.revocations.revoke(claims.jti, claims.exp, now=NOW)
+    assert authorizer.authorize(request, now=NOW) == "revoked"
+    assert authorizer.stats()["allowedTotal"] == 3
+    assert authorizer.stats()["denied"] == {"expired": 1, "path": 1, "scope": 1, "action": 1, "signature": 1, "revoked": 1}
+
+
+def test_revocations_are_bounded():
+    revocations = TicketRevocations(max_entries=2)
+    revocations.revoke("a", NOW + 10, now=NOW)
+    revocations.revoke("b", NOW + 30, now=NOW)
+    revocations.revoke("c", NOW + 20, now=NOW)
+    # 가장 먼저 만료되는 것부터 버림
+    assert "a" not in revocations and {"b", "c"} <= set(revocations._until)
+    assert revocations.evicted_total == 1
+    # 만료 시각이 지난 jti는 정리
+    revocations.evict(NOW + 25)
+    assert len(revocations) == 1 and "b" in revocations
+
+
+def test_revocations_shared_between_workers(tmp_path):
+    # worker 두 개 (같은 디렉토리, 각자 메모리의 폐기 목록)
+    workers = [SharedRevocationLog(tmp_path, TicketRevocations()) for _ in range(2)]
+    workers[0].publish("jti-1", NOW + 600, now=NOW)
+    workers[0].publish("expired", NOW - 1, now=NOW)
+    assert workers[1].sync(now=NOW) == 1
+    assert "jti-1" in workers[1].revocations
+    # 이미 반영한 줄은 다시 읽지 않음
+    assert workers[1].sync(now=NOW) == 0
+    workers[0].publish("jti-2", NOW + 600, now=NOW)
+    assert workers[1].sync(now=NOW) == 1
+
+    # 안의 티켓이 모두 만료된 시간대 파일은 지움
+    assert workers[1].sync(now=NOW + 7200) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_revocation_log_disabled_without_dir():
+    log = SharedRevocationLog(None, TicketRevocations())
+    log.publish("jti-1", NOW + 600, now=NOW)
+    assert not log.enabled and log.sync(now=NOW) == 0
@@ -0,0 +1,49 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middlewares.profiling import ProfilingMiddleware
+from app.services.profiling import ProfileStore, instrument_routes
+
+TOKEN = "test-profile"
+
+
+def _client(store: ProfileStore) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_endpoint():
+        return {"total": sum(range(1000))}
+
+    @app.get("/async")
+    async def async_endpoint():
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, store=store, token=TOKEN, sample_rate=0.0)
+    instrument_routes(app)
+    return TestClient(app)
+
+
+def test_sync_endpoint_with_call_profile():
+    # 요청 profiler가 켜진 상태에서 threadpool 스레드의 profiler를 또 켜면 3.12+ 에서 ValueError
+    store = ProfileStore()
+    response = _client(store).get("/sync", headers={"X-Profile": TOKEN})
+
+    assert response.status_code == 200
+    assert response.json() == {"total": 499500}
+    assert "handler;dur=" in response.headers["server-timing"]
+    profile = store.get(response.headers["x-profile-id"])
+    assert profile["status"] == 200
+    assert profile["route"] == "/sync"
+    assert "handler" in profile["phasesMs"]
+    assert profile["calls"]
+
+
+def test_async_endpoint_and_unselected_request():
+    store = ProfileStore()
+    client = _client(store)
+
+    assert "server-timing" not in client.get("/async").headers
+    response = client.get("/async", headers={"X-Profile": TOKEN})
+    assert response.status_code == 200
+    assert "handler" in store.get(response.headers["x-profile-id"])["phasesMs"]
+    assert store.stats()["profiled"] == 1
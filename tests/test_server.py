@@ -0,0 +1,10 @@
+import pytest
+
+from app.server import check_uvicorn_version
+
+
+def test_uvicorn_version_is_pinned():
+    # Supervisor는 uvicorn 내부 구현을 확장하므로 확인한 버전에서만 기동
+    check_uvicorn_version()
+    with pytest.raises(SystemExit):
+        check_uvicorn_version("0.41.0")
@@ -0,0 +1,74 @@
+"""스트림 상태 poller - benchmarks.fake_mediamtx 를 ASGI transport로 붙여서 확인 (네트워크 없음)"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.mock_data import topology_store
+from app.services.stream_health import STATUS_ACTIVE, STATUS_INACTIVE, STATUS_UNREACHABLE, StreamHealthPoller
+from app.services.topology import TopologyRegistry
+from benchmarks.bench_topology import build_network
+from benchmarks.fake_mediamtx import FakeMediaMTX
+
+GATES, STREAMS_PER_GATE = 10, 10
+
+
+@pytest.fixture
+def topology(monkeypatch):
+    registry = TopologyRegistry(*build_network(1, GATES, STREAMS_PER_GATE))
+    monkeypatch.setattr(topology_store, "current", registry)
+    return registry
+
+
+def _expected(fake: FakeMediaMTX, stream_id: str) -> str:
+    state = fake.state(f"stitched/{stream_id}")
+    return STATUS_ACTIVE if state is not None and state["ready"] else STATUS_INACTIVE
+
+
+def _poll(poller: StreamHealthPoller, transport: httpx.AsyncBaseTransport, cycles: int = 1):
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://mediamtx") as client:
+            return [await poller.poll_once(client) for _ in range(cycles)]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("mode", ["list", "path"])
+def test_poll_against_fake_mediamtx(topology, mode):
+    fake = FakeMediaMTX(prefix="stitched", streams=GATES * STREAMS_PER_GATE, ready_ratio=0.7, missing_ratio=0.1)
+    poller = StreamHealthPoller(api_url="http://mediamtx", path_prefix="stitched", mode=mode, page_size=30)
+
+    assert _poll(poller, httpx.ASGITransport(app=fake.app())) == [len(topology.streams)]
+    statuses = {s.stream_id: poller.table.get(s.stream_id).status for s in topology.streams}
+    assert statuses == {s.stream_id: _expected(fake, s.stream_id) for s in topology.streams}
+    # fake의 비율대로 섞여 있어야 의미 있는 확인
+    assert set(statuses.values()) == {STATUS_ACTIVE, STATUS_INACTIVE}
+    # list 모드는 페이지 단위 요청 (100 path / 30 = 4 페이지), path 모드는 스트림마다 요청
+    assert fake.requests_total == (4 if mode == "list" else len(topology.streams))
+    assert poller.table.version == len(topology.streams)
+
+
+def test_unreachable_backs_off(topology):
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    poller = StreamHealthPoller(api_url="http://mediamtx", mode="list", interval=5.0, max_backoff=60.0)
+    # 두 번째 cycle은 backoff 중이므로 요청하지 않음
+    assert _poll(poller, httpx.MockTransport(refuse), cycles=2) == [len(topology.streams), 0]
+    entry = poller.table.get(topology.streams[0].stream_id)
+    assert entry.status == STATUS_UNREACHABLE
+    assert entry.error.startswith("ConnectError")
+    assert poller.errors_total == 1
+    assert poller.table.counts() == {STATUS_UNREACHABLE: len(topology.streams)}
+
+
+def test_listener_registered_once():
+    poller = StreamHealthPoller(api_url="http://mediamtx")
+    events = []
+    listener = lambda *args: events.append(args)
+    # lifespan이 여러 번 시작되어도 같은 listener는 한 번만 호출
+    poller.table.add_listener(listener)
+    poller.table.add_listener(listener)
+    poller.table.record("s1", STATUS_ACTIVE, 1.0)
+    assert len(events) == 1
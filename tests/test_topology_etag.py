@@ -0,0 +1,32 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def test_etag_round_trip(client):
+    response = client.get("/api/v1/stations", headers=AUTH)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    assert client.get("/api/v1/stations", headers={**AUTH, "If-None-Match": etag}).status_code == 304
+    assert client.get("/api/v1/stations", headers={**AUTH, "If-None-Match": f'W/{etag}'}).status_code == 304
+    assert client.get("/api/v1/stations", headers={**AUTH, "If-None-Match": '"other"'}).status_code == 200
+
+
+def test_if_none_match_star_requires_existing_resource(client):
+    star = {**AUTH, "If-None-Match": "*"}
+    assert client.get("/api/v1/stations/no-such-station/gates", headers=star).status_code == 404
+    assert client.get("/api/v1/gates/no-such-gate/streams", headers=star).status_code == 404
+
+    station_id = client.get("/api/v1/stations", headers=AUTH).json()["stations"][0]["stationId"]
+    assert client.get(f"/api/v1/stations/{station_id}/gates", headers=star).status_code == 304
+    gate_id = client.get(f"/api/v1/stations/{station_id}/gates", headers=AUTH).json()["gates"][0]["gateId"]
+    assert client.get(f"/api/v1/gates/{gate_id}/streams", headers=star).status_code == 304
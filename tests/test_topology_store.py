@@ -0,0 +1,38 @@
+import pickle
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import topology
+from app.services.topology import TopologyRegistry, TopologyStore
+
+DOCUMENT = """
+stations:
+  - stationId: station-001
+    name: 서울역
+    gates:
+      - gateId: gate-001
+        name: 1번 게이트
+        streams:
+          - streamId: stream-001
+            name: 1번 게이트 카메라
+"""
+
+
+@pytest.mark.parametrize("error", [BrokenProcessPool("worker died"), pickle.UnpicklingError("truncated"), KeyError("stations")])
+def test_reload_keeps_snapshot_on_unexpected_error(tmp_path, monkeypatch, error):
+    path = tmp_path / "topology.yaml"
+    path.write_text(DOCUMENT, encoding="utf-8")
+    store = TopologyStore(TopologyRegistry([], [], []), path=path, isolate_reload=True)
+    loaded = store.current
+
+    def broken(path, version):
+        raise error
+
+    # 파싱 프로세스 쪽 오류도 watcher를 끝내지 않고 기존 snapshot 유지
+    monkeypatch.setattr(topology, "load_topology_file_isolated", broken)
+    path.write_text(DOCUMENT.replace("서울역", "시청역"), encoding="utf-8")
+    assert store.reload() is False
+    assert store.current is loaded
+    assert store.failed_reloads_total == 1
+    assert store.last_error.startswith(type(error).__name__)
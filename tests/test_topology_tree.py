@@ -0,0 +1,36 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints.streams import _accepts_gzip
+from app.main import app
+
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("gzip", True),
+    ("br, gzip;q=0.5", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.000", False),
+    ("gzip;q=abc", False),
+    ("gzip;q=2", False),
+    ("*", True),
+    ("*;q=0, gzip", True),
+    ("gzip;q=0, *", False),
+    ("identity", False),
+])
+def test_accepts_gzip(header, expected):
+    assert _accepts_gzip(header) is expected
+
+
+def test_tree_with_malformed_accept_encoding():
+    client = TestClient(app)
+    plain = client.get("/api/v1/topology/tree", headers={**AUTH, "Accept-Encoding": "gzip;q=abc"})
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+
+    compressed = client.get("/api/v1/topology/tree", headers={**AUTH, "Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    # httpx가 gzip을 풀어줌
+    assert compressed.json() == plain.json()